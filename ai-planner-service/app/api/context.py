@@ -0,0 +1,227 @@
+"""
+Single-pass context extraction for planner questions.
+
+The vocabulary (event types, services, cities) is compiled into one regex:
+the phrases are folded into a character trie, so the engine walks the
+question once in C and only stops at known terms and numbers. Guest counts
+and budgets are read from the same pass, a number together with the word
+after it or a budget word ("budget", "under", "rs") right before it. Event
+types and services come from the rule YAML files, the plannable services and
+the category index, and the remaining terms (cities, event types without a
+rule file) from app/rules/vocabulary.yaml; the extractor is rebuilt lazily
+when the category index refreshes or the rules are reloaded.
+"""
+import re
+import threading
+from pathlib import Path
+
+import yaml
+
+from app.catalog.categories import category_index, simplify_name
+from app.rules.registry import rule_registry, RuleRegistry
+from app.rules.services import PLANNABLE_SERVICES
+
+
+VOCABULARY_PATH = Path(__file__).resolve().parents[1] / "rules" / "vocabulary.yaml"
+
+UNIT_MULTIPLIERS = {
+    "lakh": 100000, "lakhs": 100000, "lac": 100000, "lacs": 100000, "l": 100000,
+    "k": 1000, "thousand": 1000,
+    "crore": 10000000, "crores": 10000000, "cr": 10000000,
+}
+# A number without a unit is a budget when a budget word sits next to it
+# ("budget 5000", "under 8000", "₹5000", "5000 budget") and it is at least
+# MIN_BARE_BUDGET, or on its own when it is at least MIN_UNCUED_BUDGET; so
+# "100 guests", "2 days" or "in 2027" never become the budget
+MIN_BARE_BUDGET = 1000
+MIN_UNCUED_BUDGET = 10000
+BUDGET_WORDS = ["budget", "under", "below", "within", "upto", "rs", "inr"]
+# "₹" is read as "rs" so it matches like the other budget words
+CURRENCY_CUES = {"rs", "inr"}
+# Four-digit years read as dates unless a currency marks them as money
+YEAR = re.compile(r"(?:19|20)\d\d")
+
+GUEST_WORDS = {"guest", "guests", "people", "pax", "person", "persons", "attendee", "attendees", "head", "heads"}
+# Numbers, words and "&" (kept so multi-word category names still line up)
+TOKEN = re.compile(r"\d+(?:,\d+)*(?:\.\d+)?|[a-z]+|&")
+NUMBER = r"\d+(?:,\d+)*(?:\.\d+)?"
+# Between the words of a phrase; "&" may touch its neighbours ("sound&music")
+WORD_GAP = "[^a-z0-9&]+"
+AMPERSAND_GAP = "[^a-z0-9&]*"
+
+
+def budget_key_for_amount(budget_val: int | None) -> str | None:
+    if budget_val:
+        if budget_val <= 300000:
+            return "under_3_lakhs"
+        elif budget_val <= 500000:
+            return "under_5_lakhs"
+    return None
+
+
+def load_rule_vocabulary(rules_path: Path | None = None) -> tuple[list[str], list[str]]:
+    """Event types and services named in the rule YAML files."""
+    registry = rule_registry if rules_path is None else RuleRegistry(rules_path)
+    return registry.event_types(), registry.services()
+
+
+def load_vocabulary(path: Path = VOCABULARY_PATH) -> dict[str, list[str]]:
+    """event_types / services / cities from the vocabulary YAML file."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    return {kind: [str(term) for term in raw.get(kind) or []] for kind in ("event_types", "services", "cities")}
+
+
+def is_bare_budget(number: str, amount: float, cue: str) -> bool:
+    if YEAR.fullmatch(number) and cue not in CURRENCY_CUES:
+        return False
+    return amount >= MIN_UNCUED_BUDGET or (bool(cue) and amount >= MIN_BARE_BUDGET)
+
+
+def phrase_key(text: str) -> str:
+    return " ".join(TOKEN.findall(text))
+
+
+def trie_pattern(phrases: list[tuple[str, ...]]) -> str:
+    """
+    One regex alternative per phrase, folded into a character trie so the
+    engine never retries a shared prefix; longer phrases win at a position.
+    """
+    trie: dict = {}
+    for tokens in phrases:
+        node = trie
+        for index, token in enumerate(tokens):
+            if index:
+                gap = AMPERSAND_GAP if "&" in (tokens[index - 1], token) else WORD_GAP
+                node = node.setdefault(gap, {})
+            for char in token:
+                node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [
+            (key if key in (WORD_GAP, AMPERSAND_GAP) else re.escape(key)) + render(child)
+            for key, child in sorted(node.items())
+            if key
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: a phrase that ends here still loses to a longer one
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+class ContextExtractor:
+    """
+    Compiled matcher for event type, service, city, guest count and budget.
+
+    Every term (with plural forms of its last word), every budget word and
+    every number, with an optional unit, guest or budget word after it, is an
+    alternative of a single regex;
+    the question is scanned once by `findall` and Python only sees the matches,
+    so the cost barely depends on the vocabulary size.
+    """
+
+    def __init__(self, event_types: list[str], services: list[str], cities: list[str], category_names: list[str] = ()):
+        self.terms: dict[str, tuple[str, str]] = {}
+        for kind, canonicals in (("event_type", event_types), ("service", services), ("city", cities)):
+            for term in canonicals:
+                self.terms.setdefault(term.lower(), (kind, term.lower()))
+
+        # Catalog category names resolve to their simple name, e.g. "sound & music" -> "sound"
+        for name in category_names:
+            name = name.lower()
+            self.terms.setdefault(name, ("service", simplify_name(name)))
+
+        # Budget words only mark the number right after them
+        for word in BUDGET_WORDS:
+            self.terms.setdefault(word, ("cue", word))
+
+        self.phrases: dict[str, tuple[str, str]] = {}
+        for term, (kind, canonical) in self.terms.items():
+            tokens = tuple(TOKEN.findall(term))
+            if not tokens:
+                continue
+            # Plurals of the last word match too ("weddings", "live bands")
+            for suffix in ("", "s", "es"):
+                phrase = tokens[:-1] + (tokens[-1] + suffix,)
+                self.phrases.setdefault(" ".join(phrase), (kind, canonical))
+
+        number_words = sorted(GUEST_WORDS | set(UNIT_MULTIPLIERS) | {"budget"}, key=len, reverse=True)
+        terms = trie_pattern([tuple(phrase.split(" ")) for phrase in self.phrases])
+        self.pattern = re.compile(
+            rf"(?<![a-z0-9])(?P<term>{terms or '(?!)'})(?![a-z0-9])"
+            rf"|(?P<number>{NUMBER})(?:[^a-z0-9]*(?P<word>{'|'.join(number_words)})(?![a-z0-9]))?"
+        )
+
+    def extract(self, question: str) -> dict:
+        found = {"event_type": None, "service": None, "city": None}
+        guests = None
+        unit_budget = None
+        bare_budget = None
+        cue = ""
+
+        phrases = self.phrases
+        # One C-level scan; each hit is (term, number, word) with the unused parts empty
+        for term, number, word in self.pattern.findall(question.lower().replace("₹", " rs ")):
+            if term:
+                kind, canonical = phrases.get(term) or phrases[phrase_key(term)]
+                if kind == "cue":
+                    cue = canonical
+                    continue
+                if found[kind] is None:
+                    found[kind] = canonical
+            elif word in GUEST_WORDS:
+                if guests is None:
+                    guests = int(float(number.replace(",", "")))
+            elif word in UNIT_MULTIPLIERS:
+                if unit_budget is None:
+                    unit_budget = int(float(number.replace(",", "")) * UNIT_MULTIPLIERS[word])
+            elif bare_budget is None:
+                amount = float(number.replace(",", ""))
+                if is_bare_budget(number, amount, cue or word):
+                    bare_budget = int(amount)
+            cue = ""
+
+        budget_val = unit_budget if unit_budget is not None else bare_budget
+        return {
+            "event_type": found["event_type"],
+            "budget": budget_key_for_amount(budget_val),
+            "budget_val": budget_val,
+            "service": found["service"],
+            "city": found["city"].capitalize() if found["city"] else None,
+            "guests": guests,
+        }
+
+
+def build_extractor() -> ContextExtractor:
+    rule_event_types, rule_services = load_rule_vocabulary()
+    vocabulary = load_vocabulary()
+    return ContextExtractor(
+        event_types=rule_event_types + vocabulary["event_types"],
+        services=list(PLANNABLE_SERVICES) + rule_services + vocabulary["services"],
+        cities=vocabulary["cities"],
+        category_names=list(category_index.by_name),
+    )
+
+
+def vocabulary_version() -> tuple:
+    return (category_index.built_at, rule_registry.version)
+
+
+_extractor = build_extractor()
+_extractor_version = vocabulary_version()
+_extractor_lock = threading.Lock()
+
+
+def get_extractor() -> ContextExtractor:
+    """The compiled extractor, rebuilt once after each category index refresh or rules reload."""
+    global _extractor, _extractor_version
+    if _extractor_version != vocabulary_version():
+        with _extractor_lock:
+            if _extractor_version != vocabulary_version():
+                _extractor = build_extractor()
+                _extractor_version = vocabulary_version()
+    return _extractor
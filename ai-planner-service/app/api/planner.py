@@ -1,21 +1,25 @@
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import re
-
-from app.rag.retriever import get_retriever
-from app.rules.loader import load_rules
-from app.rules.engine import evaluate_rules
-from app.catalog.client import fetch_products
-from app.rules.budget_policy import BUDGET_POLICIES
-from app.catalog.filter import filter_products_by_budget
+import asyncio
+import json
+import os
+import time
+from typing import Literal
+
+from app.api.context import get_extractor
+from app.observability import span, request_span, debug_enabled
+from app.rag.retriever import hybrid_search
+from app.rules.registry import rule_registry, CompiledRuleSet
+from app.catalog.client import afetch_products
 from app.rules.services import PLANNABLE_SERVICES
 from app.rules.budget_amounts import BUDGET_TOTALS
 from app.rules.budget_distribution import BUDGET_DISTRIBUTION
-from app.rules.budget_calculator import calculate_budget_breakdown
 from app.llm.explainer import explain_service
 from app.catalog.ranker import rank_products
 from app.explanations.templates import RULE_BASED_EXPLANATIONS
-from app.llm.planner_llm import get_budget_distribution, select_best_product
+from app.llm.planner_llm import get_budget_distribution, select_best_product, select_best_products
+from app.llm.gateway import LLMUnavailableError
 
 router = APIRouter()
 
@@ -39,61 +43,11 @@ class PlanRequest(BaseModel):
 
 
 def extract_service_from_question(question: str) -> str | None:
-    q = question.lower()
-    services = ["dj", "catering", "photography", "decoration", "venue", "live band", "lighting"]
-
-    for s in services:
-        if s in q:
-            return s
-    return None
+    return get_extractor().extract(question)["service"]
 
 
 def extract_context(question: str):
-    q = question.lower()
-
-    event_type = None
-    event_types = ["wedding", "birthday", "corporate", "conference", "party", "launch", "executive", "retreat", "award", "ceremony", "meeting", "summit", "festival"]
-    for et in event_types:
-        if et in q:
-            event_type = et
-            break
-
-    budget_val = None
-    # Look for numbers (e.g., 50000, 3 lakh)
-    match = re.search(r'(\d+)\s*(lakh|k|thousand)?', q)
-    if match:
-        val = int(match.group(1))
-        unit = match.group(2)
-        if unit == "lakh":
-            budget_val = val * 100000
-        elif unit == "k":
-            budget_val = val * 1000
-        else:
-            budget_val = val
-
-    budget_key = None
-    if budget_val:
-        if budget_val <= 300000:
-            budget_key = "under_3_lakhs"
-        elif budget_val <= 500000:
-            budget_key = "under_5_lakhs"
-
-    service = extract_service_from_question(q)
-
-    city = None
-    cities = ["mumbai", "delhi", "bangalore", "pune", "hyderabad", "chennai", "kolkata"]
-    for c in cities:
-        if c in q:
-            city = c.capitalize()
-            break
-
-    return {
-        "event_type": event_type,
-        "budget": budget_key,
-        "budget_val": budget_val,
-        "service": service,
-        "city": city
-    }
+    return get_extractor().extract(question)
 
 def extract_plan_context(question: str):
     return extract_context(question)
@@ -103,8 +57,8 @@ def extract_plan_context(question: str):
 def ask(payload: PlanRequest):
     # FULLY RESTORED RAG LOGIC FOR CHATBOT
     try:
-        retriever = get_retriever()
-        docs = retriever.invoke(payload.question)
+        with request_span("ask"), span("retrieval"):
+            docs = hybrid_search(payload.question)
         if docs:
             return {
                 "answer": docs[0].page_content,
@@ -119,137 +73,458 @@ def ask(payload: PlanRequest):
     }
 
 
-@router.post("/plan")
-def plan(payload: PlanRequest, explain: bool = False):
+CATEGORY_TO_SERVICE = {
+    "venue": "venue",
+    "catering & food": "catering",
+    "catering": "catering",
+    "decoration & styling": "decoration",
+    "decoration": "decoration",
+    "photography & video": "photography",
+    "photography": "photography",
+    "sound & music": "dj",
+    "sound": "dj",
+    "lighting & effects": "lighting",
+    "lighting": "lighting",
+}
+
+# Concurrency limits for the per-category pipeline (fetch -> filter -> LLM pick)
+PLAN_DEADLINE_SECONDS = float(os.getenv("PLANNER_PLAN_DEADLINE", "45"))
+CATEGORY_TIMEOUT_SECONDS = float(os.getenv("PLANNER_CATEGORY_TIMEOUT", "20"))
+MAX_PARALLEL_CATEGORIES = int(os.getenv("PLANNER_MAX_PARALLEL_CATEGORIES", "6"))
+# Pick products for every category in one LLM prompt instead of one call per category
+BATCH_SELECTION = os.getenv("PLANNER_BATCH_SELECTION", "true").lower() == "true"
+# How long hybrid mode waits for LLM-written reasons before keeping the rule reasons
+HYBRID_REASON_DEADLINE_SECONDS = float(os.getenv("PLANNER_HYBRID_REASON_DEADLINE", "8"))
+
+SUGGESTIONS = ["Add Photography", "Change Venue", "Review Plan"]
+
+
+def resolve_service(raw_category: str) -> str:
+    """Map a frontend display name to a backend service key."""
+    service = CATEGORY_TO_SERVICE.get(raw_category.lower().strip())
+    if not service:
+        # Try to extract first word as service
+        service = raw_category.lower().split('&')[0].split(' ')[0].strip()
+    return service
+
+
+def normalize_image(product: dict) -> dict:
+    """Robust image path handling - ensure it starts with /media/ if it's relative."""
+    if product.get("image") and not product["image"].startswith("http"):
+        if not product["image"].startswith("/"):
+            product["image"] = "/media/" + product["image"]
+        elif not product["image"].startswith("/media/"):
+            product["image"] = "/media" + product["image"]
+    return product
+
+
+def build_plan_item(service: str, product: dict, reason: str, candidates: list, ai_pick: bool) -> dict:
+    return {
+        "service": service,
+        "recommended": True,
+        "reason": reason,
+        "recommended_product": normalize_image(product),
+        "alternatives": [p for p in candidates if p['id'] != product['id']][:2],
+        "ai_pick": ai_pick
+    }
+
+
+def fallback_plan_item(service: str, candidates: list, category_budget: float, priority: str) -> dict | None:
+    """Deterministic pick used when the LLM step for a category is too slow or fails."""
+    if not candidates:
+        return None
+
+    ranked = rank_products(candidates, budget_limit=category_budget, priority=priority, top_k=1)
+    best = next(p for p in candidates if p['id'] == ranked[0]['id'])
+    return build_plan_item(
+        service,
+        best,
+        "Best value pick within your budget for this category.",
+        candidates,
+        ai_pick=False,
+    )
+
+
+def filter_candidates(service: str, products: list, category_budget: float) -> list:
+    """Available products within the relaxed category budget, or every available one if none fit."""
+    # Filter by availability
+    products = [p for p in products if p.get("is_available", True)]
+
+    # Filter by category budget (relaxed limit - 2.5x budget)
+    filtered_products = [p for p in products if float(p.get("price", 0)) <= category_budget * 2.5]
+    if debug_enabled():
+        print(f"[PLANNER] Service '{service}': {len(products)} available, {len(filtered_products)} within budget limit", flush=True)
+
+    # If no products within budget, use ALL available products but tell LLM to be budget conscious
+    return filtered_products if filtered_products else products
+
+
+async def gather_candidates(job: dict, semaphore: asyncio.Semaphore) -> list:
+    """
+    Fetch and availability/budget-filter one category's products.
+    Candidates are stored on the job as soon as they are known so that a later
+    timeout can still fall back to a deterministic pick.
+    """
+    service = job["service"]
+    category_budget = job["category_budget"]
+
+    async with semaphore:
+        with span("fetch", category=service):
+            products = await afetch_products(service)
+
+    with span("filter", category=service):
+        target_products = filter_candidates(service, products, category_budget)
+    job["candidates"] = target_products
+
+    if not target_products:
+        print(f"[PLANNER] No suitable products found for '{service}'", flush=True)
+    return target_products
+
+
+async def select_for_category(job: dict, event_type: str, total_budget: float, guests: int, semaphore: asyncio.Semaphore) -> dict | None:
+    """Single-category LLM pick over the job's candidates."""
+    service = job["service"]
+    target_products = job.get("candidates", [])
+    if not target_products:
+        return None
+
+    async with semaphore:
+        with span("selection_llm", category=service):
+            selection = await asyncio.to_thread(
+                select_best_product,
+                event_type=event_type,
+                total_budget=total_budget,
+                guests=guests,
+                category=service,
+                category_budget=job["category_budget"],
+                products=target_products
+            )
+
+    if not selection:
+        return None
+
+    return build_plan_item(service, selection["product"], selection["reason"], target_products, ai_pick=True)
+
+
+async def plan_category(job: dict, event_type: str, total_budget: float, guests: int, semaphore: asyncio.Semaphore) -> dict | None:
+    """Run the fetch -> availability/budget filter -> LLM pick pipeline for one category."""
+    await gather_candidates(job, semaphore)
+    return await select_for_category(job, event_type, total_budget, guests, semaphore)
+
+
+async def run_with_deadline(coros: list, deadline: float) -> list[tuple[bool, object]]:
+    """
+    Run coroutines concurrently, each under the per-category timeout and all under
+    the shared deadline. Returns (ok, result-or-error) per coroutine, in order.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.create_task(asyncio.wait_for(c, timeout=CATEGORY_TIMEOUT_SECONDS)) for c in coros]
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=max(0.0, deadline - loop.time()))
+        for task in pending:
+            task.cancel()
+
+    outcomes = []
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception() is None:
+            outcomes.append((True, task.result()))
+        else:
+            outcomes.append((False, "deadline exceeded" if not task.done() or task.cancelled() else task.exception()))
+    return outcomes
+
+
+async def batch_select(jobs: list[dict], event_type: str, total_budget: float, guests: int, deadline: float) -> dict:
+    """One LLM call for every category; returns {} if the call fails or runs out of time."""
+    remaining = deadline - asyncio.get_running_loop().time()
+    if not jobs or remaining <= 0:
+        return {}
+
+    categories = {job["service"]: {"category_budget": job["category_budget"], "products": job["candidates"]} for job in jobs}
     try:
-        print(f"[PLANNER] Starting plan generation for: {payload.question}", flush=True)
+        with span("selection_llm", categories=len(categories), batched=True):
+            return await asyncio.wait_for(
+                asyncio.to_thread(select_best_products, event_type, total_budget, guests, categories),
+                timeout=remaining,
+            )
+    except Exception as e:
+        print(f"[PLANNER] Batched selection failed: {e!r}", flush=True)
+        return {}
+
+
+async def run_category_pipelines(jobs: list[dict], event_type: str, total_budget: float, guests: int, priority: str) -> list[dict]:
+    """
+    Fan the per-category pipeline out concurrently and join the results in category order.
+
+    With batched selection, candidates for every category are fetched first and
+    picked in one LLM prompt; categories whose pick is missing or invalid go
+    through the single-category call. Anything that misses its own timeout or
+    the plan deadline falls back to rank_products.
+    """
+    deadline = asyncio.get_running_loop().time() + PLAN_DEADLINE_SECONDS
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_CATEGORIES)
+
+    if BATCH_SELECTION and len(jobs) > 1:
+        await run_with_deadline([gather_candidates(job, semaphore) for job in jobs], deadline)
+        ready = [job for job in jobs if job.get("candidates")]
+
+        picks = await batch_select(ready, event_type, total_budget, guests, deadline)
+        retry = []
+        for job in ready:
+            pick = picks.get(job["service"])
+            if pick:
+                job["item"] = build_plan_item(job["service"], pick["product"], pick["reason"], job["candidates"], ai_pick=True)
+            else:
+                retry.append(job)
+
+        outcomes = await run_with_deadline(
+            [select_for_category(job, event_type, total_budget, guests, semaphore) for job in retry],
+            deadline,
+        )
+        retried = retry
+    else:
+        outcomes = await run_with_deadline(
+            [plan_category(job, event_type, total_budget, guests, semaphore) for job in jobs],
+            deadline,
+        )
+        retried = jobs
+
+    for job, (ok, result) in zip(retried, outcomes):
+        if ok:
+            job["item"] = result
+        else:
+            print(f"[PLANNER] Category '{job['service']}' fell back to ranker: {result!r}", flush=True)
+
+    plan_items = []
+    for job in jobs:
+        if "item" in job:
+            item = job["item"]
+        else:
+            item = fallback_plan_item(job["service"], job.get("candidates", []), job["category_budget"], priority)
+
+        if item:
+            plan_items.append(item)
+
+    return plan_items
+
+
+def budget_key_for(total_budget: float) -> str:
+    """Bucket a budget into the keys used by the rule and distribution tables."""
+    if total_budget <= BUDGET_TOTALS["under_3_lakhs"]:
+        return "under_3_lakhs"
+    # Larger budgets reuse the widest bucket; its percentages still apply
+    return "under_5_lakhs"
+
+
+def rule_distribution(event_type: str, budget_key: str) -> dict:
+    """Budget split from the static tables, defaulting to an equal split."""
+    table = BUDGET_DISTRIBUTION.get(event_type.lower(), {}).get(budget_key)
+    if table:
+        return dict(table)
+    return {s: 100 / len(PLANNABLE_SERVICES) for s in PLANNABLE_SERVICES}
+
+
+def rule_reason(service: str, decision: dict | None) -> str:
+    if decision:
+        return decision["reason"]
+    template = RULE_BASED_EXPLANATIONS.get(service, {}).get(True)
+    return template or "Best value pick within your budget for this category."
+
+
+def resolve_plan_params(payload: PlanRequest) -> dict:
+    """Event type, budget, guests, priority and categories from the question and preferences."""
+    with span("context"):
         context = extract_plan_context(payload.question)
+    if debug_enabled():
         print(f"[PLANNER] Extracted context: {context}", flush=True)
+    
+    event_type = context["event_type"] or (payload.preferences.event_type if payload.preferences else "Wedding")
+    
+    # Try to get budget from question, then preferences
+    total_budget = context["budget_val"]
+    if not total_budget and payload.preferences and payload.preferences.budget:
+        try:
+            total_budget = float(payload.preferences.budget)
+        except ValueError:
+            total_budget = BUDGET_TOTALS.get(payload.preferences.budget, 300000)
+    
+    if not total_budget:
+        total_budget = 300000
+
+    # Explicit preferences win, then a count from the question, then the default
+    if payload.preferences and "guests" in payload.preferences.model_fields_set and payload.preferences.guests:
+        guests = payload.preferences.guests
+    else:
+        guests = context.get("guests") or 100
+    priority = payload.preferences.priority if payload.preferences else "balanced"
+    user_categories = payload.preferences.categories if payload.preferences and payload.preferences.categories else []
+    if debug_enabled():
+        print(f"[PLANNER] Params: type={event_type}, budget={total_budget}, guests={guests}", flush=True)
+
+    return {
+        "event_type": event_type,
+        "total_budget": total_budget,
+        "budget_key": context["budget"] or budget_key_for(total_budget),
+        "guests": guests,
+        "priority": priority,
+        "user_categories": user_categories,
+    }
+
+
+def build_jobs(user_categories: list, distribution: dict, total_budget: float,
+               skip_misc: bool = False) -> tuple[list[dict], dict]:
+    """Per-category jobs plus the canonical percent distribution for the final output."""
+    # If no categories selected, we still process the ones from the distribution
+    categories_to_process = user_categories if user_categories else list(distribution.keys())
+    if skip_misc and not user_categories:
+        # The rule tables reserve a "misc" slice that has no catalog category behind it
+        categories_to_process = [c for c in categories_to_process if c != "misc"]
+    
+    if debug_enabled():
+        print(f"[PLANNER] Processing categories: {categories_to_process}", flush=True)
+    
+    final_distribution = {}
+    jobs = []
+    
+    for raw_category in categories_to_process:
+        service = resolve_service(raw_category)
         
-        event_type = context["event_type"] or (payload.preferences.event_type if payload.preferences else "Wedding")
+        # Get budget percent from distribution (default to equal distribution if 0 or missing)
+        percent = distribution.get(service, distribution.get(service.capitalize(), 0))
+        if percent <= 0:
+            percent = 100 / (len(categories_to_process) or 1)
         
-        # Try to get budget from question, then preferences
-        total_budget = context["budget_val"]
-        if not total_budget and payload.preferences and payload.preferences.budget:
-            try:
-                total_budget = float(payload.preferences.budget)
-            except ValueError:
-                total_budget = BUDGET_TOTALS.get(payload.preferences.budget, 300000)
+        final_distribution[service] = percent
         
-        if not total_budget:
-            total_budget = 300000
+        category_budget = (percent / 100) * total_budget
+        if debug_enabled():
+            print(f"[PLANNER] Category '{raw_category}' -> service '{service}': budget={category_budget} ({percent}%)", flush=True)
 
-        guests = payload.preferences.guests if payload.preferences and payload.preferences.guests else 100
-        print(f"[PLANNER] Params: type={event_type}, budget={total_budget}, guests={guests}", flush=True)
-        
-        # 1️⃣ GET AI BUDGET CATEGORIZATION (PROMPTING PHASE)
-        distribution = get_budget_distribution(event_type, total_budget)
-        print(f"[PLANNER] AI raw distribution: {distribution}", flush=True)
-        
-        plan_items = []
-        recommended_services = []
-
-        # Mapping from frontend display names to backend service keys
-        CATEGORY_TO_SERVICE = {
-            "venue": "venue",
-            "catering & food": "catering",
-            "catering": "catering",
-            "decoration & styling": "decoration",
-            "decoration": "decoration",
-            "photography & video": "photography",
-            "photography": "photography",
-            "sound & music": "dj",
-            "sound": "dj",
-            "lighting & effects": "lighting",
-            "lighting": "lighting",
+        jobs.append({"service": service, "category_budget": category_budget})
+
+    return jobs, final_distribution
+
+
+def build_budget_breakdown(final_distribution: dict, total_budget: float) -> dict:
+    budget_breakdown = {}
+    # Ensure we return at least the categories we processed
+    for service, percent in final_distribution.items():
+        budget_breakdown[service] = {
+            "percent": round(percent, 2),
+            "amount": int((percent / 100) * total_budget)
         }
+    return budget_breakdown
 
-        # 2️⃣ FETCH AND SELECT PRODUCTS - Iterate over USER's selected categories
-        user_categories = payload.preferences.categories if payload.preferences and payload.preferences.categories else []
-        
-        # If no categories selected, we still process the ones from the distribution
-        categories_to_process = user_categories if user_categories else list(distribution.keys())
-        
-        print(f"[PLANNER] Processing categories: {categories_to_process}", flush=True)
-        
-        # Canonical distribution for final output
-        final_distribution = {}
-        
-        for raw_category in categories_to_process:
-            # Map the display name to a service key
-            service = CATEGORY_TO_SERVICE.get(raw_category.lower().strip())
-            if not service:
-                # Try to extract first word as service
-                service = raw_category.lower().split('&')[0].split(' ')[0].strip()
-            
-            print(f"[PLANNER] Processing category '{raw_category}' -> service '{service}'", flush=True)
-            
-            # Get budget percent from distribution (default to equal distribution if 0 or missing)
-            percent = distribution.get(service, distribution.get(service.capitalize(), 0))
-            if percent <= 0:
-                percent = 100 / (len(categories_to_process) or 1)
-            
-            final_distribution[service] = percent
-            
-            category_budget = (percent / 100) * total_budget
-            print(f"[PLANNER] Service '{service}': budget={category_budget} ({percent}%)", flush=True)
-            
-            products = fetch_products(service)
-            
-            # Filter by availability
-            products = [p for p in products if p.get("is_available", True)]
-            print(f"[PLANNER] Service '{service}': fetched {len(products)} products", flush=True)
-            
-            # Filter by category budget (relaxed limit - 2x budget)
-            filtered_products = [p for p in products if float(p.get("price", 0)) <= category_budget * 2.5]
-            print(f"[PLANNER] Service '{service}': {len(filtered_products)} products within budget limit", flush=True)
-
-            # If no products within budget, use ALL available products but tell LLM to be budget conscious
-            target_products = filtered_products if filtered_products else products
-
-            if target_products:
-                # Use LLM to pick the best one
-                print(f"[PLANNER] Requesting LLM selection for '{service}'...", flush=True)
-                selection = select_best_product(
-                    event_type=event_type,
-                    total_budget=total_budget,
-                    guests=guests,
-                    category=service,
-                    category_budget=category_budget,
-                    products=target_products
-                )
-                
-                if selection:
-                    # Robust image path handling - ensure it starts with /media/ if it's relative
-                    rec_prod = selection["product"]
-                    if rec_prod.get("image") and not rec_prod["image"].startswith("http"):
-                        if not rec_prod["image"].startswith("/"):
-                            rec_prod["image"] = "/media/" + rec_prod["image"]
-                        elif not rec_prod["image"].startswith("/media/"):
-                            rec_prod["image"] = "/media" + rec_prod["image"]
-
-                    recommended_services.append(service)
-                    plan_items.append({
-                        "service": service,
-                        "recommended": True,
-                        "reason": selection["reason"],
-                        "recommended_product": rec_prod,
-                        "alternatives": [p for p in target_products if p['id'] != selection['product']['id']][:2],
-                        "ai_pick": True
-                    })
-            else:
-                print(f"[PLANNER] No suitable products found for '{service}'", flush=True)
-
-        # 3️⃣ CALCULATE FINAL BUDGET BREAKDOWN
-        budget_breakdown = {}
-        # Ensure we return at least the categories we processed
-        for service, percent in final_distribution.items():
-            budget_breakdown[service] = {
-                "percent": round(percent, 2),
-                "amount": int((percent / 100) * total_budget)
-            }
 
-        print(f"[PLANNER] Final budget breakdown: {budget_breakdown}", flush=True)
+def fast_plan_item(job: dict, rules: CompiledRuleSet | None, budget_key: str, priority: str) -> dict | None:
+    """Rule decision plus value-ranker pick for one category, no LLM involved."""
+    decision = rules.evaluate({"budget": budget_key, "service": job["service"]}) if rules else None
+    if decision and not decision["recommended"]:
+        print(f"[PLANNER] Rules exclude '{job['service']}': {decision['reason']}", flush=True)
+        return None
+
+    item = fallback_plan_item(job["service"], job.get("candidates", []), job["category_budget"], priority)
+    if item:
+        item["reason"] = rule_reason(job["service"], decision)
+    return item
+
+
+async def run_fast_pipelines(jobs: list[dict], event_type: str, budget_key: str, priority: str) -> list[dict]:
+    """Deterministic plan: concurrent fetch, then YAML rules and rank_products per category."""
+    deadline = asyncio.get_running_loop().time() + PLAN_DEADLINE_SECONDS
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_CATEGORIES)
+    await run_with_deadline([gather_candidates(job, semaphore) for job in jobs], deadline)
+
+    with span("selection_rules", categories=len(jobs)):
+        rules = rule_registry.get(event_type)
+        plan_items = []
+        for job in jobs:
+            item = fast_plan_item(job, rules, budget_key, priority)
+            if item:
+                plan_items.append(item)
+    return plan_items
+
+
+async def write_llm_reason(item: dict, category_budget: float) -> dict:
+    with span("reason_llm", category=item["service"]):
+        reason = await asyncio.to_thread(
+            explain_service,
+            item["service"],
+            item["recommended"],
+            item["reason"],
+            f"{int(category_budget)} INR",
+        )
+    if reason:
+        item["reason"] = reason
+    return item
+
+
+async def write_llm_reasons(plan_items: list[dict], jobs: list[dict]):
+    """Hybrid mode: let the LLM reword each reason concurrently, keeping the rule reason on timeout."""
+    budgets = {job["service"]: job["category_budget"] for job in jobs}
+    deadline = asyncio.get_running_loop().time() + HYBRID_REASON_DEADLINE_SECONDS
+    await run_with_deadline(
+        [write_llm_reason(item, budgets.get(item["service"], 0)) for item in plan_items],
+        deadline,
+    )
+
+
+async def resolve_distribution(params: dict, mode: str) -> dict:
+    if mode == "llm":
+        try:
+            with span("distribution_llm"):
+                distribution = await asyncio.to_thread(get_budget_distribution, params["event_type"], params["total_budget"])
+        except LLMUnavailableError as e:
+            print(f"[PLANNER] LLM unavailable for the budget split, using rule tables: {e}", flush=True)
+            with span("distribution_rules"):
+                return rule_distribution(params["event_type"], params["budget_key"])
+        if debug_enabled():
+            print(f"[PLANNER] AI raw distribution: {distribution}", flush=True)
+        return distribution
+    with span("distribution_rules"):
+        return rule_distribution(params["event_type"], params["budget_key"])
+
+
+@router.post("/plan")
+async def plan(payload: PlanRequest, explain: bool = False, mode: Literal["fast", "hybrid", "llm"] = "llm"):
+    try:
+        with request_span("plan", mode=mode):
+            return await generate_plan(payload, mode)
+    except Exception as e:
+        import traceback
+        print(f"[PLANNER ERROR] Exception in plan endpoint: {e}", flush=True)
+        traceback.print_exc()
+        return {"error": "Internal server error during plan generation", "details": str(e)}
+
+
+async def generate_plan(payload: PlanRequest, mode: str) -> dict:
+    if debug_enabled():
+        print(f"[PLANNER] Starting {mode} plan generation for: {payload.question}", flush=True)
+    params = resolve_plan_params(payload)
+    event_type = params["event_type"]
+    total_budget = params["total_budget"]
+    guests = params["guests"]
+    
+    # 1️⃣ GET BUDGET CATEGORIZATION (LLM PROMPT OR RULE TABLES)
+    distribution = await resolve_distribution(params, mode)
+
+    # 2️⃣ FETCH AND SELECT PRODUCTS - Iterate over USER's selected categories
+    jobs, final_distribution = build_jobs(
+        params["user_categories"], distribution, total_budget, skip_misc=mode != "llm"
+    )
+
+    if mode == "llm":
+        plan_items = await run_category_pipelines(jobs, event_type, total_budget, guests, params["priority"])
+    else:
+        plan_items = await run_fast_pipelines(jobs, event_type, params["budget_key"], params["priority"])
+        if mode == "hybrid":
+            await write_llm_reasons(plan_items, jobs)
+
+    # 3️⃣ CALCULATE FINAL BUDGET BREAKDOWN
+    with span("response_build"):
+        budget_breakdown = build_budget_breakdown(final_distribution, total_budget)
+        if debug_enabled():
+            print(f"[PLANNER] Final budget breakdown: {budget_breakdown}", flush=True)
         print(f"[PLANNER] Plan generation complete. Items: {len(plan_items)}", flush=True)
         
         return {
@@ -258,10 +533,127 @@ def plan(payload: PlanRequest, explain: bool = False):
             "guests": guests,
             "budget_breakdown": budget_breakdown,
             "plan": plan_items,
-            "suggestions": ["Add Photography", "Change Venue", "Review Plan"]
+            "suggestions": SUGGESTIONS
         }
-    except Exception as e:
-        import traceback
-        print(f"[PLANNER ERROR] Exception in plan endpoint: {e}", flush=True)
-        traceback.print_exc()
-        return {"error": "Internal server error during plan generation", "details": str(e)}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def plan_category_item(job: dict, params: dict, mode: str, rules: CompiledRuleSet | None, semaphore: asyncio.Semaphore) -> dict | None:
+    """One category end to end for the streaming endpoint, in the requested mode."""
+    if mode == "llm":
+        return await plan_category(job, params["event_type"], params["total_budget"], params["guests"], semaphore)
+
+    await gather_candidates(job, semaphore)
+    item = fast_plan_item(job, rules, params["budget_key"], params["priority"])
+    if item and mode == "hybrid":
+        try:
+            await asyncio.wait_for(write_llm_reason(item, job["category_budget"]), timeout=HYBRID_REASON_DEADLINE_SECONDS)
+        except Exception as e:
+            print(f"[PLANNER] Keeping rule reason for '{job['service']}': {e!r}", flush=True)
+    return item
+
+
+def fallback_category_item(job: dict, params: dict, mode: str, rules: CompiledRuleSet | None) -> dict | None:
+    if mode == "llm":
+        return fallback_plan_item(job["service"], job.get("candidates", []), job["category_budget"], params["priority"])
+    return fast_plan_item(job, rules, params["budget_key"], params["priority"])
+
+
+async def iter_category_items(jobs: list[dict], params: dict, mode: str):
+    """
+    Yield (index, item) for each category in completion order.
+
+    Every category runs its own single-call pipeline so the first finished pick
+    can be sent without waiting for the others; timeouts and the plan deadline
+    fall back the same way /plan does.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + PLAN_DEADLINE_SECONDS
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_CATEGORIES)
+    rules = rule_registry.get(params["event_type"]) if mode != "llm" else None
+
+    tasks = {
+        asyncio.create_task(
+            asyncio.wait_for(plan_category_item(job, params, mode, rules, semaphore), timeout=CATEGORY_TIMEOUT_SECONDS)
+        ): index
+        for index, job in enumerate(jobs)
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=max(0.0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                index = tasks[task]
+                job = jobs[index]
+                if task.cancelled() or task.exception() is not None:
+                    error = "cancelled" if task.cancelled() else task.exception()
+                    print(f"[PLANNER] Category '{job['service']}' fell back to ranker: {error!r}", flush=True)
+                    item = fallback_category_item(job, params, mode, rules)
+                else:
+                    item = task.result()
+                yield index, item
+    finally:
+        for task in pending:
+            task.cancel()
+
+    for task in pending:
+        index = tasks[task]
+        print(f"[PLANNER] Category '{jobs[index]['service']}' fell back to ranker: deadline exceeded", flush=True)
+        yield index, fallback_category_item(jobs[index], params, mode, rules)
+
+
+async def stream_plan_events(payload: PlanRequest, mode: str):
+    """SSE body: budget breakdown first, then one item per finished category, then a summary."""
+    # Spans the whole stream so streamed plans get the request histogram and debug sampling too
+    with request_span("plan_stream", mode=mode):
+        started = time.perf_counter()
+        try:
+            params = resolve_plan_params(payload)
+            distribution = await resolve_distribution(params, mode)
+            jobs, final_distribution = build_jobs(
+                params["user_categories"], distribution, params["total_budget"], skip_misc=mode != "llm"
+            )
+
+            yield sse_event("budget", {
+                "event_type": params["event_type"],
+                "budget_val": params["total_budget"],
+                "guests": params["guests"],
+                "budget_breakdown": build_budget_breakdown(final_distribution, params["total_budget"]),
+                "categories": [job["service"] for job in jobs],
+            })
+
+            items = {}
+            async for index, item in iter_category_items(jobs, params, mode):
+                items[index] = item
+                yield sse_event("item", {"index": index, "service": jobs[index]["service"], "item": item})
+
+            plan_items = [items[i] for i in sorted(items) if items[i]]
+            print(f"[PLANNER] Streamed plan complete. Items: {len(plan_items)}", flush=True)
+            yield sse_event("summary", {
+                "items": len(plan_items),
+                "services": [item["service"] for item in plan_items],
+                "elapsed_ms": int((time.perf_counter() - started) * 1000),
+                "suggestions": SUGGESTIONS,
+            })
+        except Exception as e:
+            import traceback
+            print(f"[PLANNER ERROR] Exception in plan stream: {e}", flush=True)
+            traceback.print_exc()
+            yield sse_event("error", {"error": "Internal server error during plan generation", "details": str(e)})
+
+
+@router.post("/plan/stream")
+async def plan_stream(payload: PlanRequest, mode: Literal["fast", "hybrid", "llm"] = "llm"):
+    return StreamingResponse(
+        stream_plan_events(payload, mode),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream into one late response
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,140 @@
+"""
+Pooled async HTTP client for catalog-service.
+
+One httpx.AsyncClient lives for the whole app lifespan so requests reuse
+keepalive connections instead of opening a fresh TCP connection per call.
+"""
+import asyncio
+import os
+import random
+
+import httpx
+
+
+CATALOG_BASE = os.getenv("CATALOG_BASE_URL", "http://catalog-service:8000/api/catalog")
+
+MAX_CONNECTIONS = int(os.getenv("CATALOG_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("CATALOG_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("CATALOG_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("CATALOG_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("CATALOG_MAX_RETRIES", "3"))
+BACKOFF_BASE_SECONDS = float(os.getenv("CATALOG_BACKOFF_BASE", "0.2"))
+BACKOFF_MAX_SECONDS = float(os.getenv("CATALOG_BACKOFF_MAX", "2"))
+MAX_PAGES = int(os.getenv("CATALOG_MAX_PAGES", "100"))
+# Rows per listing page; catalog-service caps this at its PRODUCT_MAX_PAGE_SIZE
+PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", "500"))
+# Sent as X-Internal-Token; without it catalog-service serves public-sized pages
+INTERNAL_TOKEN = os.getenv("CATALOG_INTERNAL_TOKEN")
+
+# HTTP/2 is negotiated over TLS (ALPN) and needs the optional `h2` package
+HTTP2_ENABLED = os.getenv("CATALOG_HTTP2", "true").lower() == "true"
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+class AsyncCatalogClient:
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=_http2_available() and self._transport is None,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                headers={"X-Internal-Token": INTERNAL_TOKEN} if INTERNAL_TOKEN else None,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with retries on transport errors and retryable status codes."""
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = await self.client.get(url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS or attempt == MAX_RETRIES:
+                    return response
+                print(f"[CATALOG] {url} returned {response.status_code}, retrying", flush=True)
+            except httpx.TransportError as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                print(f"[CATALOG] {url} failed ({e!r}), retrying", flush=True)
+
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def get_json(self, url: str, **kwargs):
+        response = await self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def iter_pages(self, url: str, **kwargs):
+        """
+        Yield each page's results as soon as it arrives, following `next` links.
+        Unpaginated list responses are yielded as a single page; a 404 yields nothing.
+        """
+        for _ in range(MAX_PAGES):
+            response = await self.get(url, **kwargs)
+            if response.status_code == 404:
+                return
+            response.raise_for_status()
+
+            data = response.json()
+            if isinstance(data, list):
+                yield data
+                return
+            if not isinstance(data, dict) or "results" not in data:
+                print(f"[CATALOG] Unexpected response structure from {url}", flush=True)
+                return
+
+            yield data["results"]
+
+            url = data.get("next")
+            if not url:
+                return
+            # Query params are already encoded into the `next` link
+            kwargs.pop("params", None)
+
+        print(f"[CATALOG] Stopped after {MAX_PAGES} pages", flush=True)
+
+
+_client: AsyncCatalogClient | None = None
+
+
+def get_async_client() -> AsyncCatalogClient:
+    global _client
+    if _client is None:
+        _client = AsyncCatalogClient()
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
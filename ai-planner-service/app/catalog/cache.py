@@ -0,0 +1,112 @@
+"""
+In-process product cache keyed by category slug.
+
+Entries are fresh for PRODUCT_CACHE_TTL seconds, then served stale for up to
+PRODUCT_CACHE_STALE more seconds while a background refresh runs. The cache is
+LRU-bounded and evicted early by catalog events (see app.catalog.events).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", "300"))
+PRODUCT_CACHE_STALE = float(os.getenv("PRODUCT_CACHE_STALE", "600"))
+PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "256"))
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class ProductCache:
+    def __init__(self, ttl: float = PRODUCT_CACHE_TTL, stale: float = PRODUCT_CACHE_STALE,
+                 max_entries: int = PRODUCT_CACHE_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        # product_id -> slugs whose cached listing contains it
+        self._product_slugs: dict[int, set[str]] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, slug: str) -> tuple[list | None, str]:
+        """Return (products, state); products are copies safe for callers to mutate."""
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, MISS
+
+            stored_at, products = entry
+            age = self._clock() - stored_at
+            if age > self.ttl + self.stale:
+                self._drop(slug)
+                self._stats["misses"] += 1
+                return None, MISS
+
+            self._entries.move_to_end(slug)
+            if age > self.ttl:
+                self._stats["stale_hits"] += 1
+                state = STALE
+            else:
+                self._stats["hits"] += 1
+                state = FRESH
+
+        return [dict(p) for p in products], state
+
+    def set(self, slug: str, products: list):
+        with self._lock:
+            if slug in self._entries:
+                self._drop(slug)
+
+            self._entries[slug] = (self._clock(), [dict(p) for p in products])
+            for p in products:
+                self._product_slugs.setdefault(p.get("id"), set()).add(slug)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, slug: str) -> bool:
+        with self._lock:
+            if slug not in self._entries:
+                return False
+            self._drop(slug)
+            self._stats["invalidations"] += 1
+            return True
+
+    def invalidate_product(self, product_id: int) -> int:
+        """Evict every cached listing that contains the product."""
+        with self._lock:
+            slugs = list(self._product_slugs.get(product_id, ()))
+            for slug in slugs:
+                self._drop(slug)
+            self._stats["invalidations"] += len(slugs)
+            return len(slugs)
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._product_slugs.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _drop(self, slug: str):
+        _, products = self._entries.pop(slug)
+        for p in products:
+            slugs = self._product_slugs.get(p.get("id"))
+            if slugs:
+                slugs.discard(slug)
+                if not slugs:
+                    del self._product_slugs[p.get("id")]
+
+
+product_cache = ProductCache()
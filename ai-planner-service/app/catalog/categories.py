@@ -0,0 +1,149 @@
+"""
+Category index for resolving service names to catalog category slugs.
+
+Warmed at startup and refreshed on a schedule by a background task. Lookups
+are plain dict reads against tables precomputed at build time; names that
+still miss are remembered for a short time so they don't trigger a catalog
+refresh on every request.
+"""
+import asyncio
+import os
+import time
+
+import requests
+
+from app.catalog.async_client import get_async_client, CATALOG_BASE
+
+
+CATEGORY_REFRESH_INTERVAL = float(os.getenv("CATEGORY_REFRESH_INTERVAL", "300"))
+CATEGORY_NEGATIVE_TTL = float(os.getenv("CATEGORY_NEGATIVE_TTL", "60"))
+
+
+def simplify_name(name: str) -> str:
+    """e.g. "Decoration & Styling" -> "decoration"."""
+    return name.lower().split('&')[0].split(' ')[0].strip()
+
+
+class CategoryIndex:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.by_slug: dict[str, dict] = {}
+        self.by_name: dict[str, str] = {}
+        self.by_simple_name: dict[str, str] = {}
+        self.parent_of: dict[str, str | None] = {}
+        self.children_of: dict[str, list[str]] = {}
+        self.built_at: float | None = None
+        self._negative: dict[str, float] = {}
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def build(self, data):
+        """Rebuild every lookup table from a /categories/ response and swap them in."""
+        by_slug, by_name, by_simple_name, parent_of, children_of = {}, {}, {}, {}, {}
+
+        def visit(cat, parent_slug):
+            name = cat.get('name', '')
+            slug = cat.get('slug', '')
+            if name and slug:
+                by_slug[slug.lower()] = {"id": cat.get("id"), "name": name, "slug": slug}
+                by_name[name.lower()] = slug
+                simple_name = simplify_name(name)
+                if simple_name:
+                    by_simple_name[simple_name] = slug
+                parent_of[slug] = parent_slug
+                children_of.setdefault(slug, [])
+                if parent_slug:
+                    children_of.setdefault(parent_slug, []).append(slug)
+
+            for child in cat.get('children', []):
+                visit(child, slug or parent_slug)
+
+        roots = data.get('results', []) if isinstance(data, dict) else data
+        for cat in roots or []:
+            visit(cat, None)
+
+        # Rebinding the attributes keeps concurrent readers on a consistent snapshot
+        self.by_slug, self.by_name, self.by_simple_name = by_slug, by_name, by_simple_name
+        self.parent_of, self.children_of = parent_of, children_of
+        self._negative = {}
+        self.built_at = self._clock()
+        print(f"[PLANNER] Category index built: {len(by_slug)} categories", flush=True)
+
+    def resolve(self, name: str) -> str | None:
+        key = name.lower().strip()
+        entry = self.by_slug.get(key)
+        if entry:
+            return entry["slug"]
+        return self.by_name.get(key) or self.by_simple_name.get(key)
+
+    def is_known_miss(self, name: str) -> bool:
+        expires = self._negative.get(name.lower().strip())
+        return expires is not None and expires > self._clock()
+
+    def record_miss(self, name: str):
+        self._negative[name.lower().strip()] = self._clock() + CATEGORY_NEGATIVE_TTL
+
+    def children(self, slug: str) -> list[str]:
+        return self.children_of.get(slug, [])
+
+    def parent(self, slug: str) -> str | None:
+        return self.parent_of.get(slug)
+
+    def descendants(self, slug: str) -> list[str]:
+        result, stack = [], list(self.children(slug))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            stack.extend(self.children(child))
+        return result
+
+    def as_mapping(self) -> dict:
+        """Flat name/slug -> slug mapping in the shape fetch_categories always returned."""
+        mapping = {slug: entry["slug"] for slug, entry in self.by_slug.items()}
+        mapping.update(self.by_name)
+        mapping.update(self.by_simple_name)
+        return mapping
+
+    async def refresh(self) -> bool:
+        async with self._refresh_lock:
+            try:
+                self.build(await get_async_client().get_json(f"{CATALOG_BASE}/categories/"))
+                return True
+            except Exception as e:
+                print(f"[PLANNER] Failed to refresh categories: {e}", flush=True)
+                return False
+
+    def refresh_sync(self) -> bool:
+        try:
+            res = requests.get(f"{CATALOG_BASE}/categories/", timeout=10)
+            res.raise_for_status()
+            self.build(res.json())
+            return True
+        except Exception as e:
+            print(f"[PLANNER] Failed to refresh categories: {e}", flush=True)
+            return False
+
+    async def resolve_or_refresh(self, name: str) -> str | None:
+        """Resolve a name, refreshing once from the catalog on an unrecorded miss."""
+        slug = self.resolve(name)
+        if slug or self.is_known_miss(name):
+            return slug
+
+        if await self.refresh():
+            slug = self.resolve(name)
+        if not slug:
+            self.record_miss(name)
+        return slug
+
+    async def run_refresher(self, interval: float = CATEGORY_REFRESH_INTERVAL):
+        """Keep the (already warmed) index fresh until cancelled."""
+        while True:
+            # Retry a failed warm-up sooner than the regular schedule
+            await asyncio.sleep(interval if self.ready else min(interval, CATEGORY_NEGATIVE_TTL))
+            await self.refresh()
+
+
+category_index = CategoryIndex()
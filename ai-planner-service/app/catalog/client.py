@@ -1,7 +1,12 @@
+import asyncio
 import requests
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, Any
 from app.catalog.service_map import SERVICE_TO_CATEGORY
+from app.catalog.async_client import get_async_client, CATALOG_BASE, PAGE_SIZE
+from app.catalog.categories import category_index
+from app.catalog.cache import product_cache, STALE
+from app.observability import debug_enabled
 
 class ProductDTO(BaseModel):
     model_config = ConfigDict(extra='ignore')  # Ignore extra fields from API
@@ -16,67 +21,42 @@ class ProductDTO(BaseModel):
     stock: int = 1
     image: Optional[Any] = None  # Can be string URL or complex object
 
-CATALOG_BASE = "http://catalog-service:8000/api/catalog"
+# Only the columns ProductDTO reads; skips descriptions and feature lists on the wire
+PRODUCT_LISTING_PARAMS = {"page_size": PAGE_SIZE, "fields": ",".join(ProductDTO.model_fields)}
+
+# In-flight stale-while-revalidate refreshes, keyed by category slug
+_refreshing: dict[str, asyncio.Task] = {}
+
+def parse_products(results: list) -> list:
+    """Validate raw catalog products into plain dicts, skipping malformed ones."""
+    products = []
+    for p in results:
+        try:
+            products.append(ProductDTO(**p).model_dump())
+        except Exception as e:
+            print(f"[PLANNER] Failed to parse product: {e}", flush=True)
+    return products
 
-# Cache for categories
-_category_cache = None
 
 def fetch_categories() -> dict:
-    """Fetch all categories from catalog and build a name/slug mapping."""
-    global _category_cache
-    if _category_cache is not None:
-        return _category_cache
-    
-    try:
-        print("[PLANNER] Fetching categories from catalog...", flush=True)
-        res = requests.get(f"{CATALOG_BASE}/categories/", timeout=10)
-        res.raise_for_status()
-        data = res.json()
-        
-        # Build a mapping from various name forms to slugs
-        category_map = {}
-        
-        def process_category(cat):
-            name = cat.get('name', '')
-            slug = cat.get('slug', '')
-            if name and slug:
-                # Add multiple variations for matching
-                category_map[name.lower()] = slug
-                category_map[slug.lower()] = slug
-                # Add simplified versions (e.g., "Decoration & Styling" -> "decoration")
-                simple_name = name.lower().split('&')[0].split(' ')[0].strip()
-                if simple_name:
-                    category_map[simple_name] = slug
-            
-            # Process children recursively
-            for child in cat.get('children', []):
-                process_category(child)
-        
-        if isinstance(data, list):
-            for cat in data:
-                process_category(cat)
-        elif isinstance(data, dict) and 'results' in data:
-            for cat in data['results']:
-                process_category(cat)
-        
-        print(f"[PLANNER] Built category map: {category_map}", flush=True)
-        _category_cache = category_map
-        return category_map
-    except Exception as e:
-        print(f"[PLANNER] Failed to fetch categories: {e}", flush=True)
-        return {}
+    """Return the name/slug mapping from the category index, warming it on first use."""
+    if not category_index.ready:
+        category_index.refresh_sync()
+    return category_index.as_mapping()
 
 def get_category_slug(service: str) -> str | None:
     """Get category slug for a service name using dynamic or static mapping."""
     # First try the hardcoded map
     slug = SERVICE_TO_CATEGORY.get(service)
     
-    # Then try dynamic category map
+    # Then try dynamic category index
     if not slug:
-        category_map = fetch_categories()
-        slug = category_map.get(service.lower())
+        if not category_index.ready and not category_index.is_known_miss(service):
+            category_index.refresh_sync()
+        slug = category_index.resolve(service)
+        if not slug:
+            category_index.record_miss(service)
     
-    print(f"[PLANNER] Resolved service '{service}' to slug '{slug}'", flush=True)
     return slug
 
 def fetch_products(service: str) -> list:
@@ -89,9 +69,7 @@ def fetch_products(service: str) -> list:
     url = f"{CATALOG_BASE}/categories/{category_slug}/products/"
 
     try:
-        print(f"[PLANNER] Fetching products from: {url}", flush=True)
         res = requests.get(url, timeout=10)
-        print(f"[PLANNER] Status: {res.status_code}", flush=True)
         
         if res.status_code == 404:
             print(f"[PLANNER] Category '{category_slug}' not found in catalog", flush=True)
@@ -100,24 +78,15 @@ def fetch_products(service: str) -> list:
         res.raise_for_status()
 
         data = res.json()
-        print(f"[PLANNER] Raw Response Data: {data}", flush=True)
+        if debug_enabled():
+            print(f"[PLANNER] Raw Response Data: {data}", flush=True)
 
         products = []
         if isinstance(data, dict) and "results" in data:
             results = data["results"]
-            print(f"[PLANNER] Extracted {len(results)} products from pagination", flush=True)
-            for p in results:
-                try:
-                    products.append(ProductDTO(**p).model_dump())
-                except Exception as e:
-                    print(f"[PLANNER] Failed to parse product: {e}", flush=True)
+            products = parse_products(results)
         elif isinstance(data, list):
-            print(f"[PLANNER] Extracted {len(data)} products from list", flush=True)
-            for p in data:
-                try:
-                    products.append(ProductDTO(**p).model_dump())
-                except Exception as e:
-                    print(f"[PLANNER] Failed to parse product: {e}", flush=True)
+            products = parse_products(data)
         else:
             print("[PLANNER] Unexpected response structure", flush=True)
         
@@ -128,3 +97,55 @@ def fetch_products(service: str) -> list:
         import traceback
         traceback.print_exc()
         return []
+
+
+async def aget_category_slug(service: str) -> str | None:
+    slug = SERVICE_TO_CATEGORY.get(service)
+    if not slug:
+        slug = await category_index.resolve_or_refresh(service)
+    return slug
+
+
+async def download_products(category_slug: str) -> list:
+    """Walk every page of a category listing; raises on catalog errors."""
+    url = f"{CATALOG_BASE}/categories/{category_slug}/products/"
+    products = []
+    async for page in get_async_client().iter_pages(url, params=PRODUCT_LISTING_PARAMS):
+        products.extend(parse_products(page))
+    return products
+
+
+async def _refresh_products(category_slug: str):
+    try:
+        product_cache.set(category_slug, await download_products(category_slug))
+    except Exception as e:
+        print(f"[PLANNER] Background refresh failed for '{category_slug}': {e}", flush=True)
+    finally:
+        _refreshing.pop(category_slug, None)
+
+
+async def afetch_products(service: str) -> list:
+    """
+    Async variant of fetch_products; follows paginated `next` links.
+    Served from the product cache, with stale entries refreshed in the background.
+    """
+    category_slug = await aget_category_slug(service)
+
+    if not category_slug:
+        print(f"[PLANNER] No category slug found for service '{service}'", flush=True)
+        return []
+
+    products, state = product_cache.get(category_slug)
+    if state == STALE and category_slug not in _refreshing:
+        _refreshing[category_slug] = asyncio.create_task(_refresh_products(category_slug))
+    if products is not None:
+        return products
+
+    try:
+        products = await download_products(category_slug)
+    except Exception as e:
+        print(f"[PLANNER] Catalog fetch failed: {e}", flush=True)
+        return []
+
+    product_cache.set(category_slug, products)
+    return [dict(p) for p in products]
@@ -1,3 +1,7 @@
+import os
+
+import numpy as np
+
 from app.catalog.vendor_scores import get_vendor_score
 
 
@@ -7,6 +11,11 @@ WEIGHT_PRESETS = {
     "quality": {"price": 0.2, "quality": 0.8},
 }
 
+TAGS = np.array(["Budget Friendly", "Best Value", "Premium"], dtype=object)
+
+# Above this many products rank_products switches to the vectorized path
+BATCH_RANK_THRESHOLD = int(os.getenv("RANKER_BATCH_THRESHOLD", "256"))
+
 
 def calculate_value_score(
     price: float,
@@ -36,7 +45,67 @@ def calculate_value_score(
     return (weights["price"] * price_score) + (weights["quality"] * reputation_score)
 
 
-def rank_products(products: list, budget_limit: int, priority: str = "balanced") -> list:
+def parse_price(product: dict) -> float:
+    try:
+        return float(product.get("price", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rank_products_batch(products: list, budget_limit: int, priority: str = "balanced", top_k: int | None = None) -> list:
+    """
+    Vectorized rank_products: same scores, order, ranks and tags.
+
+    Prices and vendor reputations are packed into arrays and scored in one
+    pass; get_vendor_score runs once per distinct vendor. With top_k only the
+    best k products are selected (argpartition) and turned back into dicts.
+    Ties keep input order, as the stable sort in rank_products does.
+    """
+    if not products:
+        return []
+
+    weights = WEIGHT_PRESETS.get(priority, WEIGHT_PRESETS["balanced"])
+    budget = float(budget_limit)
+    count = len(products)
+
+    prices = np.fromiter((parse_price(p) for p in products), dtype=np.float64, count=count)
+    vendor_ids = [p.get("vendor_id", 0) for p in products]
+    vendor_score = {vendor_id: get_vendor_score(vendor_id) for vendor_id in set(vendor_ids)}
+    reputations = np.fromiter((vendor_score[v] for v in vendor_ids), dtype=np.float64, count=count)
+
+    if budget > 0:
+        price_scores = np.clip(1.0 - prices / budget, 0.0, 1.0)
+    else:
+        price_scores = np.full(count, 0.5)
+    scores = weights["price"] * price_scores + weights["quality"] * reputations
+
+    # Negated so ascending stable sorts give "highest score first, then input order"
+    keys = -scores
+    if top_k is not None and top_k < count:
+        if top_k <= 0:
+            return []
+        kth = np.partition(keys, top_k - 1)[top_k - 1]
+        # Everything tied with the k-th score is a candidate; input order breaks the tie
+        candidates = np.flatnonzero(keys <= kth)
+        order = candidates[np.argsort(keys[candidates], kind="stable")][:top_k]
+    else:
+        order = np.argsort(keys, kind="stable")
+
+    tag_index = np.where(prices <= budget_limit * 0.7, 0, np.where(prices <= budget_limit, 1, 2))
+    tags = TAGS[tag_index[order]]
+
+    return [
+        {
+            **products[i],
+            "rank": rank,
+            "tag": tag,
+            "value_score": round(float(scores[i]), 3),
+        }
+        for rank, (i, tag) in enumerate(zip(order.tolist(), tags), start=1)
+    ]
+
+
+def rank_products(products: list, budget_limit: int, priority: str = "balanced", top_k: int | None = None) -> list:
     """
     Deterministic ranking by VALUE, not just price.
     - Products with best value (price efficiency + reputation) rank higher
@@ -47,12 +116,12 @@ def rank_products(products: list, budget_limit: int, priority: str = "balanced")
     if not products:
         return []
 
+    if top_k is not None or len(products) >= BATCH_RANK_THRESHOLD:
+        return rank_products_batch(products, budget_limit, priority, top_k)
+
     scored = []
     for product in products:
-        try:
-            price = float(product.get("price", 0))
-        except (TypeError, ValueError):
-            price = 0.0
+        price = parse_price(product)
         
         vendor_id = product.get("vendor_id", 0)
         value_score = calculate_value_score(price, float(budget_limit), vendor_id, priority)
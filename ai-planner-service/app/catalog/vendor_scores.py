@@ -1,15 +1,193 @@
 """
 Vendor reputation scores for product ranking.
-Until real ratings are available, this provides mock/default scores.
+
+Scores come from outcome counts already recorded elsewhere in the system:
+booking approvals/rejections and confirmations and paid orders (core-service),
+and product approval history (catalog-service). The counts are seeded from
+both services at startup, kept current from BOOKING_* / SUBORDER_PAID /
+PRODUCT_* events and periodically re-synced. Counts and scores live in NumPy
+arrays with one row per vendor seen; a dict maps vendor_id to its row, so a
+lookup is a dict read plus an array read and memory follows the number of
+vendors rather than the largest id.
+
+VENDOR_SCORES holds manual overrides and wins over the computed score.
 """
+import asyncio
+import os
+import threading
+
+import numpy as np
+
+from app.catalog.async_client import get_async_client, CATALOG_BASE
+
+
+CORE_BASE = os.getenv("CORE_BASE_URL", "http://core-service:8000")
+VENDOR_REPUTATION_REFRESH_INTERVAL = float(os.getenv("VENDOR_REPUTATION_REFRESH_INTERVAL", "900"))
+# Pseudo-count of neutral outcomes every vendor starts with; a vendor needs
+# real history before their score moves far from 0.5
+VENDOR_SCORE_PRIOR = float(os.getenv("VENDOR_SCORE_PRIOR", "5"))
+
+DEFAULT_SCORE = 0.5
+
+SIGNALS = (
+    "bookings_approved",
+    "bookings_rejected",
+    "bookings_confirmed",
+    "orders_paid",
+    "products_approved",
+    "products_rejected",
+)
+CORE_SIGNALS = SIGNALS[:4]
+CATALOG_SIGNALS = SIGNALS[4:]
+
+POSITIVE_WEIGHTS = np.array([1.0, 0.0, 1.0, 1.0, 0.5, 0.0])
+NEGATIVE_WEIGHTS = np.array([0.0, 1.0, 0.0, 0.0, 0.0, 0.5])
+
+EVENT_SIGNALS = {
+    "BOOKING_APPROVED": "bookings_approved",
+    "BOOKING_REJECTED": "bookings_rejected",
+    "BOOKING_CONFIRMED": "bookings_confirmed",
+    "SUBORDER_PAID": "orders_paid",
+    "PRODUCT_APPROVED": "products_approved",
+    "PRODUCT_REJECTED": "products_rejected",
+}
+
 
 VENDOR_SCORES: dict[int, float] = {
 }
 
 
+def vendor_index(vendor_id) -> int | None:
+    """core-service stores vendor ids as strings, catalog-service as ints."""
+    try:
+        return int(vendor_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_scores(counts: np.ndarray) -> np.ndarray:
+    positive = counts @ POSITIVE_WEIGHTS
+    negative = counts @ NEGATIVE_WEIGHTS
+    return (positive + VENDOR_SCORE_PRIOR * DEFAULT_SCORE) / (positive + negative + VENDOR_SCORE_PRIOR)
+
+
+class VendorReputationStore:
+    def __init__(self):
+        # vendor id -> row in counts/scores; rows are only ever appended, so a
+        # reader holding an older dict still finds the right row
+        self.rows: dict[int, int] = {}
+        self.counts = np.zeros((0, len(SIGNALS)))
+        self.scores = np.zeros(0)
+        self.loaded_sources: set[str] = set()
+        self._lock = threading.Lock()
+
+    def score(self, vendor_id) -> float:
+        row = self.rows.get(vendor_index(vendor_id))
+        scores = self.scores
+        if row is None or row >= len(scores):
+            return DEFAULT_SCORE
+        return float(scores[row])
+
+    def vendor_counts(self, vendor_id) -> dict[str, float]:
+        row = self.rows.get(vendor_index(vendor_id))
+        if row is None:
+            return {signal: 0.0 for signal in SIGNALS}
+        return dict(zip(SIGNALS, self.counts[row].tolist()))
+
+    def _grown(self, counts: np.ndarray, size: int) -> np.ndarray:
+        if size <= len(counts):
+            return counts
+        capacity = max(size, 2 * len(counts), 64)
+        grown = np.zeros((capacity, len(SIGNALS)))
+        grown[:len(counts)] = counts
+        return grown
+
+    def load(self, rows: list[dict], signals: tuple[str, ...], source: str):
+        """Replace one source's columns with a fresh snapshot; other columns are kept."""
+        columns = [SIGNALS.index(signal) for signal in signals]
+        entries = [(vendor_index(row.get("vendor_id")), row) for row in rows]
+        entries = [(index, row) for index, row in entries if index is not None]
+
+        with self._lock:
+            vendor_rows = dict(self.rows)
+            for index, _ in entries:
+                vendor_rows.setdefault(index, len(vendor_rows))
+
+            counts = self._grown(self.counts.copy(), len(vendor_rows))
+            counts[:, columns] = 0.0
+            for index, row in entries:
+                counts[vendor_rows[index], columns] += [float(row.get(signal) or 0) for signal in signals]
+
+            # Arrays first: a reader on the old row map still lands on the same rows
+            self.counts, self.scores = counts, compute_scores(counts)
+            self.rows = vendor_rows
+            self.loaded_sources.add(source)
+
+        print(f"[REPUTATION] Loaded {len(entries)} vendors from {source}", flush=True)
+
+    def record(self, vendor_id, signal: str, amount: float = 1.0):
+        index = vendor_index(vendor_id)
+        if index is None:
+            return
+
+        with self._lock:
+            row = self.rows.get(index)
+            if row is None:
+                row = len(self.rows)
+                if row >= len(self.counts):
+                    counts = self._grown(self.counts, row + 1)
+                    scores = np.full(len(counts), DEFAULT_SCORE)
+                    scores[:len(self.scores)] = self.scores
+                    self.counts, self.scores = counts, scores
+                self.rows[index] = row
+            self.counts[row, SIGNALS.index(signal)] += amount
+            self.scores[row] = compute_scores(self.counts[row:row + 1])[0]
+
+    def apply_event(self, event: dict):
+        """catalog/core event handler: bump the vendor's matching counter."""
+        signal = EVENT_SIGNALS.get(event.get("event_type"))
+        if signal:
+            self.record(event.get("vendor_id"), signal)
+
+    async def refresh(self) -> bool:
+        client = get_async_client()
+        sources = (
+            ("core-service", f"{CORE_BASE}/internal/vendors/reputation/", CORE_SIGNALS),
+            ("catalog-service", f"{CATALOG_BASE}/vendors/stats/", CATALOG_SIGNALS),
+        )
+        results = await asyncio.gather(
+            *(client.get_json(url) for _, url, _ in sources), return_exceptions=True
+        )
+
+        ok = True
+        for (source, _, signals), data in zip(sources, results):
+            if isinstance(data, Exception):
+                # Keep the last snapshot (plus events since) for this source
+                print(f"[REPUTATION] Failed to load {source} stats: {data!r}", flush=True)
+                ok = False
+                continue
+            self.load(data.get("results", []), signals, source)
+        return ok
+
+    async def run_refresher(self, interval: float = VENDOR_REPUTATION_REFRESH_INTERVAL):
+        """Re-sync from the services until cancelled; corrects any events missed while disconnected."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh()
+
+    def stats(self) -> dict:
+        known = int(np.count_nonzero(self.counts.any(axis=1))) if len(self.counts) else 0
+        return {"vendors": known, "sources": sorted(self.loaded_sources), "capacity": len(self.scores)}
+
+
+reputation_store = VendorReputationStore()
+
+
 def get_vendor_score(vendor_id: int) -> float:
     """
     Get vendor reputation score.
-    Returns default 0.5 (neutral) for unknown vendors.
+    Manual overrides first, then the live store; 0.5 (neutral) for unknown vendors.
     """
-    return VENDOR_SCORES.get(vendor_id, 0.5)
+    if vendor_id in VENDOR_SCORES:
+        return VENDOR_SCORES[vendor_id]
+    return reputation_store.score(vendor_id)
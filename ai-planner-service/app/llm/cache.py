@@ -0,0 +1,110 @@
+"""
+Response cache for planner LLM calls.
+
+Exact mode keys on the whitespace-normalized prompt plus model and temperature.
+Similarity mode additionally lets a budget-distribution request reuse the
+answer cached for the same event type at a nearby budget, since the LLM only
+returns percentages.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_SIMILARITY = os.getenv("LLM_CACHE_SIMILARITY", "false").lower() == "true"
+# Max relative budget distance for similarity hits, e.g. 0.1 = within 10%
+LLM_CACHE_BUDGET_TOLERANCE = float(os.getenv("LLM_CACHE_BUDGET_TOLERANCE", "0.1"))
+
+
+def normalize_prompt(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def cache_key(prompt: str, model: str, temperature: float) -> str:
+    raw = f"{model}\x00{temperature}\x00{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 similarity: bool = LLM_CACHE_SIMILARITY, budget_tolerance: float = LLM_CACHE_BUDGET_TOLERANCE,
+                 clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.budget_tolerance = budget_tolerance
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        # (model, event_type) -> {budget: (expires_at, distribution)}
+        self._distributions: dict[tuple[str, str], dict[float, tuple[float, dict]]] = {}
+        self._stats = {"hits": 0, "similar_hits": 0, "misses": 0}
+
+    def get(self, prompt: str, model: str, temperature: float):
+        key = cache_key(prompt, model, temperature)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def set(self, prompt: str, model: str, temperature: float, value):
+        key = cache_key(prompt, model, temperature)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_similar_distribution(self, model: str, event_type: str, budget: float) -> dict | None:
+        """Nearest cached distribution for the event type within the budget tolerance."""
+        if not self.similarity or budget <= 0:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            candidates = self._distributions.get((model, event_type.lower().strip()), {})
+            best = None
+            for cached_budget, (expires_at, distribution) in candidates.items():
+                distance = abs(cached_budget - budget) / budget
+                if expires_at > now and distance <= self.budget_tolerance:
+                    if best is None or distance < best[0]:
+                        best = (distance, distribution)
+
+            if best is None:
+                return None
+            self._stats["similar_hits"] += 1
+            return dict(best[1])
+
+    def set_distribution(self, model: str, event_type: str, budget: float, distribution: dict):
+        if not self.similarity:
+            return
+
+        with self._lock:
+            bucket = self._distributions.setdefault((model, event_type.lower().strip()), {})
+            bucket[float(budget)] = (self._clock() + self.ttl, dict(distribution))
+            if len(bucket) > self.max_entries:
+                del bucket[min(bucket, key=lambda b: bucket[b][0])]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._distributions.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+response_cache = ResponseCache()
@@ -1,11 +1,7 @@
-from langchain_ollama import ChatOllama
+from app.llm.gateway import gateway, chat_model
 
 
-llm = ChatOllama(
-    model="qwen:0.5b",
-    base_url="http://host.docker.internal:11434",
-    temperature=0.1,
-)
+llm = chat_model
 
 
 def explain_service(service: str, recommended: bool, reason: str, budget: str) -> str:
@@ -25,5 +21,6 @@ Reason = {reason}
 Budget = {budget}
 """
 
-    response = llm.invoke(prompt)
+    # Explanations are nice-to-have; they queue behind user-facing calls
+    response = gateway.invoke(prompt, lane="background", llm=llm)
     return response.content.strip()
@@ -0,0 +1,177 @@
+"""
+Shared gateway for every Ollama chat call in the planner process.
+
+One ChatOllama client, a concurrency limit, a bounded wait queue served by
+priority lane and per-call timeouts. Callers that cannot get a slot get a
+LLMUnavailableError quickly and fall back (ranker picks, rule reasons,
+default distribution) instead of piling more load onto the Ollama host.
+
+Limits are per worker process; size LLM_MAX_CONCURRENCY with the worker
+count in mind.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+from langchain_ollama import ChatOllama
+
+
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen:0.5b")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT", "60"))
+
+# Lower value is served first when a slot frees up
+LANES = {
+    "planning": 0,      # /plan budget split and product picks
+    "background": 1,    # explanations, reason rewriting, warm-up
+}
+
+SAMPLE_WINDOW = 512
+
+
+class LLMUnavailableError(RuntimeError):
+    """No LLM slot could be had in time; the caller should fall back."""
+
+
+class LLMBusyError(LLMUnavailableError):
+    """The wait queue is full."""
+
+
+class LLMQueueTimeoutError(LLMUnavailableError):
+    """Waited in the queue longer than the lane allows."""
+
+
+def percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LaneMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.queue_timeouts = 0
+        self.queue_wait_ms = deque(maxlen=SAMPLE_WINDOW)
+        self.inference_ms = deque(maxlen=SAMPLE_WINDOW)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "queue_timeouts": self.queue_timeouts,
+            "queue_wait_ms": {
+                "p50": round(percentile(self.queue_wait_ms, 0.5), 1),
+                "p95": round(percentile(self.queue_wait_ms, 0.95), 1),
+            },
+            "inference_ms": {
+                "p50": round(percentile(self.inference_ms, 0.5), 1),
+                "p95": round(percentile(self.inference_ms, 0.95), 1),
+            },
+        }
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        llm=None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_queue: int = LLM_MAX_QUEUE,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self.metrics = {lane: LaneMetrics() for lane in LANES}
+
+    def _acquire(self, lane: str) -> float:
+        """Take a slot, waiting behind higher-priority (then earlier) callers. Returns seconds waited."""
+        metrics = self.metrics[lane]
+        started = self._clock()
+        with self._cond:
+            if self._active < self.max_concurrency and not self._waiting:
+                self._active += 1
+                return 0.0
+
+            if len(self._waiting) >= self.max_queue:
+                metrics.rejected += 1
+                raise LLMBusyError(f"LLM queue full ({self.max_queue} waiting)")
+
+            entry = (LANES[lane], next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            deadline = started + self.queue_timeout
+            while True:
+                if self._active < self.max_concurrency and self._waiting[0] == entry:
+                    heapq.heappop(self._waiting)
+                    self._active += 1
+                    # Another slot may still be free for the next waiter
+                    self._cond.notify_all()
+                    return self._clock() - started
+
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    metrics.queue_timeouts += 1
+                    raise LLMQueueTimeoutError(f"Waited {self.queue_timeout}s for an LLM slot")
+                self._cond.wait(remaining)
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def invoke(self, prompt: str, lane: str = "planning", llm=None):
+        """Blocking call through the gateway; run it in a worker thread from async code."""
+        metrics = self.metrics[lane]
+        waited = self._acquire(lane)
+        metrics.queue_wait_ms.append(waited * 1000)
+        started = time.perf_counter()
+        try:
+            metrics.calls += 1
+            return (llm or self.llm).invoke(prompt)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            metrics.inference_ms.append((time.perf_counter() - started) * 1000)
+            self._release()
+
+    def stats(self) -> dict:
+        with self._cond:
+            active, queued = self._active, len(self._waiting)
+        return {
+            "active": active,
+            "queued": queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "lanes": {lane: metrics.snapshot() for lane, metrics in self.metrics.items()},
+        }
+
+
+chat_model = ChatOllama(
+    model=OLLAMA_MODEL,
+    base_url=OLLAMA_BASE_URL,
+    temperature=0.1,
+    # httpx timeout for the whole call to Ollama
+    client_kwargs={"timeout": LLM_CALL_TIMEOUT_SECONDS},
+)
+
+gateway = LLMGateway(chat_model)
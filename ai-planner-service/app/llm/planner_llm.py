@@ -1,13 +1,38 @@
 import json
 import re
-from langchain_ollama import ChatOllama
+from pydantic import BaseModel, ValidationError
 from app.rules.services import PLANNABLE_SERVICES
+from app.llm.cache import response_cache
+from app.llm.gateway import gateway, chat_model, LLMUnavailableError
+from app.observability import debug_enabled
+
+llm = chat_model
+
+
+def warm_llm():
+    """One tiny uncached call so Ollama loads the model and the HTTP session is open."""
+    gateway.invoke("Reply with OK.", lane="background", llm=llm)
+
+
+def invoke_cached(prompt: str) -> tuple[str, bool]:
+    """Return (content, from_cache); callers cache content only once it parses."""
+    cached = response_cache.get(prompt, llm.model, llm.temperature)
+    if cached is not None:
+        return cached, True
+    return gateway.invoke(prompt, lane="planning", llm=llm).content.strip(), False
+
+class ProductPick(BaseModel):
+    product_id: int
+    reason: str = "Highly recommended for your event."
+
+
+def summarize_products(products: list) -> list:
+    # Limit product info sent to LLM to avoid token overflow
+    return [
+        {"id": p['id'], "name": p['name'], "price": p['price'], "city": p.get('city', 'N/A')}
+        for p in products[:5]  # Top 5 only
+    ]
 
-llm = ChatOllama(
-    model="qwen:0.5b",
-    base_url="http://host.docker.internal:11434",
-    temperature=0.1,
-)
 
 def extract_json(text: str) -> dict:
     """
@@ -39,21 +64,33 @@ def get_budget_distribution(event_type: str, total_budget: float) -> dict:
     Example: {{"catering": 40, "venue": 30, ...}}
     """
     
+    similar = response_cache.get_similar_distribution(llm.model, event_type, total_budget)
+    if similar:
+        print(f"[LLM] Reusing cached distribution for a similar {event_type} budget", flush=True)
+        return similar
+
     try:
-        print(f"[LLM] Requesting budget distribution for {event_type}...", flush=True)
-        response = llm.invoke(prompt)
-        content = response.content.strip()
-        print(f"[LLM] Raw distribution response: {content}", flush=True)
+        content, from_cache = invoke_cached(prompt)
+        if debug_enabled():
+            print(f"[LLM] Raw distribution response: {content}", flush=True)
         
         distribution = extract_json(content)
         if not distribution:
              raise ValueError("Could not parse JSON from LLM response")
 
+        if not from_cache:
+            response_cache.set(prompt, llm.model, llm.temperature, content)
+
         # Ensure all services are present
         for s in PLANNABLE_SERVICES:
             if s not in distribution:
                 distribution[s] = 0
+
+        response_cache.set_distribution(llm.model, event_type, total_budget, distribution)
         return distribution
+    except LLMUnavailableError:
+        # Shed by the gateway; the caller falls back to the rule tables
+        raise
     except Exception as e:
         print(f"[LLM ERROR] Budget distribution failed: {e}", flush=True)
         # Fallback to empty/default if LLM fails
@@ -67,11 +104,7 @@ def select_best_product(event_type: str, total_budget: float, guests: int, categ
         print(f"[LLM] No products to select from for {category}", flush=True)
         return None
         
-    # Limit product info sent to LLM to avoid token overflow
-    product_summaries = [
-        {"id": p['id'], "name": p['name'], "price": p['price'], "city": p.get('city', 'N/A')}
-        for p in products[:5]  # Top 5 only
-    ]
+    product_summaries = summarize_products(products)
     
     prompt = f"""
     You are an expert event planner for a {event_type} with {guests} guests and a total budget of {total_budget} INR.
@@ -89,15 +122,17 @@ def select_best_product(event_type: str, total_budget: float, guests: int, categ
     """
     
     try:
-        print(f"[LLM] Requesting product selection for {category}...", flush=True)
-        response = llm.invoke(prompt)
-        content = response.content.strip()
-        print(f"[LLM] Raw selection response for {category}: {content}", flush=True)
+        content, from_cache = invoke_cached(prompt)
+        if debug_enabled():
+            print(f"[LLM] Raw selection response for {category}: {content}", flush=True)
         
         result = extract_json(content)
         if not result:
              raise ValueError("Could not parse JSON from LLM response")
 
+        if not from_cache:
+            response_cache.set(prompt, llm.model, llm.temperature, content)
+
         selected_id = result.get("product_id")
         reason = result.get("reason", "Highly recommended for your event.")
         
@@ -110,6 +145,76 @@ def select_best_product(event_type: str, total_budget: float, guests: int, categ
         print(f"[LLM] Selected ID {selected_id} not found in product list, falling back to first", flush=True)
         # Fallback to first if LLM returned invalid ID
         return {"product": products[0], "reason": reason}
+    except LLMUnavailableError:
+        # No LLM slot: let the pipeline fall back to the ranker rather than
+        # present products[0] as an AI pick
+        raise
     except Exception as e:
         print(f"[LLM ERROR] Product selection failed for {category}: {e}", flush=True)
         return {"product": products[0], "reason": "Recommended based on budget and availability."}
+
+
+def select_best_products(event_type: str, total_budget: float, guests: int, categories: dict) -> dict:
+    """
+    Asks the LLM to pick one product for every category in a single prompt.
+
+    `categories` maps category -> {"category_budget": float, "products": list}.
+    Returns category -> {"product", "reason"} for the categories whose pick
+    validated; callers fall back per category for anything missing.
+    Raises if the LLM call itself fails or returns no JSON.
+    """
+    candidates = {
+        category: {
+            "budget": round(entry["category_budget"], 2),
+            "products": summarize_products(entry["products"]),
+        }
+        for category, entry in categories.items()
+        if entry["products"]
+    }
+    if not candidates:
+        return {}
+
+    prompt = f"""
+    You are an expert event planner for a {event_type} with {guests} guests and a total budget of {total_budget} INR.
+    For EACH category below, select the SINGLE BEST product that fits within that category's budget.
+    
+    Categories:
+    {json.dumps(candidates)}
+    
+    Instructions:
+    1. Pick exactly one product per category, using only the product ids listed under that category.
+    2. Provide a short reason (max 15 words) for each pick (e.g. style, value, or fit).
+    3. Respond ONLY with a JSON object mapping each category to {{"product_id": <id>, "reason": "<reason>"}}
+    
+    If none fit in a category, pick its most affordable product.
+    """
+
+    content, from_cache = invoke_cached(prompt)
+    if debug_enabled():
+        print(f"[LLM] Raw batched selection response: {content}", flush=True)
+
+    result = extract_json(content)
+    if not isinstance(result, dict):
+        raise ValueError("Could not parse JSON from LLM response")
+
+    selections = {}
+    for category, entry in candidates.items():
+        try:
+            pick = ProductPick.model_validate(result.get(category))
+        except ValidationError:
+            print(f"[LLM] Invalid batched pick for {category}: {result.get(category)}", flush=True)
+            continue
+
+        offered = {p["id"] for p in entry["products"]}
+        if pick.product_id not in offered:
+            print(f"[LLM] Batched pick {pick.product_id} for {category} was not offered", flush=True)
+            continue
+
+        product = next(p for p in categories[category]["products"] if p['id'] == pick.product_id)
+        selections[category] = {"product": product, "reason": pick.reason}
+
+    # Only reuse the response if every category came back valid
+    if not from_cache and len(selections) == len(candidates):
+        response_cache.set(prompt, llm.model, llm.temperature, content)
+
+    return selections
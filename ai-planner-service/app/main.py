@@ -1,15 +1,76 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api.planner import router
-from app.rules.loader import load_rules
+from app.rules.registry import rule_registry
+from app.catalog.async_client import get_async_client, close_async_client
+from app.catalog.cache import product_cache
+from app.catalog.categories import category_index
+from app.llm.cache import response_cache
+from app.llm.gateway import gateway
+from app.catalog.events import consumer, register_handler, CATALOG_EVENTS_ENABLED
+from app.catalog.vendor_scores import reputation_store
+from app.rag.index_store import claim_writer
+from app.rag.retriever import sync_vectorstore, handle_category_event
+from app.warmup import readiness, warm_up, install_drain_handler, begin_drain
+from app.observability import configure_tracing, render_metrics
 
 
 from fastapi.middleware.cors import CORSMiddleware
 
-for event in ["wedding"]:
-    load_rules(event)
+# How long shutdown waits for background work (index sync) before exiting
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("PLANNER_SHUTDOWN_GRACE", "20"))
+
+# Fail fast on invalid rule files, as the per-event startup loop used to
+rule_registry.load_all(strict=True)
+
+
+def sync_rag_index():
+    try:
+        sync_vectorstore()
+    except Exception:
+        # Already logged; the persisted index keeps serving until the next sync
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_async_client()
+    install_drain_handler()
+    warmup = asyncio.create_task(warm_up())
+    category_refresher = asyncio.create_task(category_index.run_refresher())
+    reputation_refresher = asyncio.create_task(reputation_store.run_refresher())
+    # One worker owns the persisted index; the others reload it when it changes on disk
+    index_writer = claim_writer()
+    rag_sync = None
+    if index_writer:
+        # Re-embed whatever changed since the index was built without holding up startup
+        rag_sync = asyncio.create_task(asyncio.to_thread(sync_rag_index))
+    rules_watcher = asyncio.create_task(rule_registry.watch())
+    if CATALOG_EVENTS_ENABLED:
+        register_handler(reputation_store.apply_event)
+        if index_writer:
+            register_handler(handle_category_event)
+        consumer.start()
+    yield
+    # SIGTERM already flipped /ready to draining (install_drain_handler); this
+    # covers shutdowns that didn't start with one
+    begin_drain()
+    consumer.stop()
+    for task in (warmup, category_refresher, reputation_refresher, rules_watcher):
+        task.cancel()
+    # Let an in-progress index sync finish writing rather than leave a half-swapped index
+    if rag_sync is not None:
+        await asyncio.wait([rag_sync], timeout=SHUTDOWN_GRACE_SECONDS)
+    await close_async_client()
 
 
-app = FastAPI(title="AIVENT AI Planner Service")
+configure_tracing()
+
+app = FastAPI(title="AIVENT AI Planner Service", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,4 +85,23 @@ app.include_router(router, prefix="/api")
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "product_cache": product_cache.stats(),
+        "llm_cache": response_cache.stats(),
+        "llm_gateway": gateway.stats(),
+        "vendor_reputation": reputation_store.stats(),
+        "rules": {"event_types": rule_registry.event_types(), "version": rule_registry.version},
+    }
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 only once warm-up has finished and until shutdown starts."""
+    return JSONResponse(readiness.snapshot(), status_code=200 if readiness.ready and not readiness.draining else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus exposition of per-stage and per-request latency histograms."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
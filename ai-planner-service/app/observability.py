@@ -0,0 +1,170 @@
+"""
+Stage timing, tracing and sampled debug logging for the planner pipeline.
+
+`span(stage)` wraps one pipeline stage: it records the duration in a
+Prometheus histogram (served at /metrics) and, when the OpenTelemetry API is
+installed, opens a span so each /plan request becomes one trace. Spans are
+exported when the OpenTelemetry SDK and OTLP exporter are installed and
+OTEL_EXPORTER_OTLP_ENDPOINT is set; otherwise the API's no-op tracer is used.
+
+Payload dumps (raw catalog and LLM responses, extracted context) go through
+`debug_enabled()`, which is decided once per request from
+PLANNER_DEBUG_SAMPLE_RATE and is off by default.
+
+Histograms are per worker process; under gunicorn a scrape reads whichever
+worker answers it.
+"""
+import bisect
+import contextvars
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ai-planner-service")
+DEBUG_SAMPLE_RATE = float(os.getenv("PLANNER_DEBUG_SAMPLE_RATE", "0"))
+
+# Seconds; wide enough for multi-second LLM calls
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_debug_sampled = contextvars.ContextVar("planner_debug_sampled", default=False)
+
+
+class Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (plus +Inf), sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self, **labels) -> tuple[int, float]:
+        """(count, sum) for one label set."""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._series.get(key, ([0], 0.0))
+            return sum(counts), total
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        for key, (counts, total) in sorted(series.items()):
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+stage_duration = Histogram(
+    "planner_stage_duration_seconds",
+    "Time spent in each planner pipeline stage.",
+    ("stage", "outcome"),
+)
+request_duration = Histogram(
+    "planner_request_duration_seconds",
+    "End-to-end planner request time.",
+    ("endpoint", "mode", "outcome"),
+)
+
+tracer = trace.get_tracer(SERVICE_NAME) if trace else None
+
+
+def configure_tracing() -> bool:
+    """Install an OTLP exporting tracer provider when the SDK is present and an endpoint is configured."""
+    if trace is None or not (os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")):
+        return False
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        print("[TRACING] OTLP endpoint set but opentelemetry-sdk / exporter not installed", flush=True)
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    print("[TRACING] Exporting spans over OTLP", flush=True)
+    return True
+
+
+@contextmanager
+def _traced(name: str, observe, attributes: dict):
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        if tracer is None:
+            yield None
+        else:
+            attributes = {key: value for key, value in attributes.items() if value is not None}
+            with tracer.start_as_current_span(name, attributes=attributes) as current:
+                yield current
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        observe(time.perf_counter() - started, outcome)
+
+
+def span(stage: str, **attributes):
+    """Time one pipeline stage and trace it as a child of the current span."""
+    return _traced(
+        stage,
+        lambda seconds, outcome: stage_duration.observe(seconds, stage=stage, outcome=outcome),
+        attributes,
+    )
+
+
+def request_span(endpoint: str, mode: str = "", **attributes):
+    """Root span for one request; also decides debug sampling for everything under it."""
+    sample_debug()
+    return _traced(
+        endpoint,
+        lambda seconds, outcome: request_duration.observe(seconds, endpoint=endpoint, mode=mode, outcome=outcome),
+        {"planner.mode": mode, **attributes},
+    )
+
+
+def sample_debug() -> bool:
+    sampled = DEBUG_SAMPLE_RATE > 0 and random.random() < DEBUG_SAMPLE_RATE
+    _debug_sampled.set(sampled)
+    return sampled
+
+
+def debug_enabled() -> bool:
+    """Whether payload-level debug output should be written for the current request."""
+    return _debug_sampled.get()
+
+
+def render_metrics() -> str:
+    lines = stage_duration.render() + request_duration.render()
+    return "\n".join(lines) + "\n"
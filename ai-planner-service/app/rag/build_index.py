@@ -0,0 +1,26 @@
+"""
+Offline FAISS index build.
+
+    python -m app.rag.build_index [--rebuild]
+
+Embeds the knowledge base and catalog categories and saves the index, docstore
+and manifest under RAG_INDEX_DIR for the service to memory-map at startup.
+Without --rebuild only documents whose content changed are re-embedded.
+"""
+import argparse
+
+from app.rag.index_store import RAG_INDEX_DIR, sync_index
+from app.rag.retriever import get_embeddings, load_documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the RAG FAISS index")
+    parser.add_argument("--rebuild", action="store_true", help="re-embed every document")
+    args = parser.parse_args()
+
+    _, changed = sync_index(load_documents(strict=True), get_embeddings(), rebuild=args.rebuild)
+    print(f"[RAG] Index at {RAG_INDEX_DIR} {'updated' if changed else 'already up to date'}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from langchain_core.documents import Document
 
 CATALOG_SERVICE_URL = "http://catalog-service:8000/api/catalog/categories/"
 
-def load_catalog_documents():
+def load_catalog_documents(raise_on_error: bool = False):
     documents = []
 
     try:
@@ -18,15 +18,36 @@ def load_catalog_documents():
         categories = response.json()
     except Exception as e:
         print(f"[AI PLANNER] Catalog unavailable: {e}")
+        if raise_on_error:
+            raise
         return documents
 
+    # The endpoint returns the tree; only its roots are indexed
     for cat in categories:
-        name = cat.get("name")
-        if not name:
+        if not is_indexed_category(cat):
             continue
+        doc = category_document(cat)
+        if doc is not None:
+            documents.append(doc)
 
-        documents.append(
-    Document(
+    return documents
+
+
+def is_indexed_category(cat: dict) -> bool:
+    """
+    Active top-level categories get a RAG document. Shared by the full sync and
+    category events so an event never adds what the next sync would drop.
+    """
+    return bool(cat.get("is_active", True)) and not cat.get("parent") and not cat.get("parent_slug")
+
+
+def category_document(cat: dict):
+    """The RAG document for one catalog category, keyed `category:<slug>`; None without a name."""
+    name = cat.get("name")
+    if not name:
+        return None
+
+    return Document(
         page_content=f"""
 SERVICE CATEGORY: {name}
 
@@ -38,8 +59,10 @@ related to {name.lower()} services.
 USAGE CONTEXT:
 This category can be selected based on event type, guest count,
 and available budget.
-"""
+""",
+        metadata={"doc_id": category_doc_id(cat.get("slug"), name)},
     )
-)
 
-    return documents
+
+def category_doc_id(slug: str | None, name: str | None = None) -> str:
+    return f"category:{slug or (name or '').lower()}"
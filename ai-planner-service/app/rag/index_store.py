@@ -0,0 +1,221 @@
+"""
+On-disk FAISS index for the RAG retriever.
+
+The index directory holds the FAISS files written by `FAISS.save_local` plus a
+manifest mapping each document key to the hash of its content. Comparing the
+manifest with the current documents tells us exactly which ones need
+re-embedding, so a knowledge-base or category change never costs a full pass.
+
+Several processes share the directory (gunicorn workers). One of them claims
+the writer role (`claim_writer`) and is the only one that syncs or updates
+the index; the rest reload it when `index_version` changes. The swap into
+place and every load hold a flock on a sibling lock file, so a reader never
+opens the directory between the two renames.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import faiss
+from langchain_community.vectorstores import FAISS
+
+
+RAG_INDEX_DIR = Path(os.getenv("RAG_INDEX_DIR", Path(__file__).resolve().parents[2] / "data" / "rag_index"))
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:11434")
+
+MANIFEST_NAME = "manifest.json"
+
+# Held for the life of the writer process; the kernel drops it if the process dies
+_writer_lock_file = None
+
+
+def content_hash(doc) -> str:
+    return hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+
+
+def document_key(doc) -> str:
+    """Stable docstore id: the loader's `doc_id` if it set one, otherwise the content hash."""
+    return doc.metadata.get("doc_id") or f"sha:{content_hash(doc)[:32]}"
+
+
+def unique_documents(docs: list) -> dict:
+    """Key -> document, dropping exact duplicates."""
+    return {document_key(doc): doc for doc in docs}
+
+
+def read_manifest(path: Path = RAG_INDEX_DIR) -> dict | None:
+    try:
+        with open(path / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+@contextmanager
+def index_lock(path: Path = RAG_INDEX_DIR, exclusive: bool = False):
+    """flock on `<path>.lock`: shared while loading, exclusive while swapping a new index in."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def claim_writer(path: Path = RAG_INDEX_DIR) -> bool:
+    """
+    Try to become the one process that syncs and updates the index.
+    Non-blocking; returns True for the process holding the claim.
+    """
+    global _writer_lock_file
+    if _writer_lock_file is not None:
+        return True
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(path.with_name(path.name + ".writer"), "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _writer_lock_file = lock_file
+    return True
+
+
+def index_version(path: Path = RAG_INDEX_DIR):
+    """Identity of the index currently in place; changes whenever save_index swaps one in."""
+    try:
+        stat = (path / MANIFEST_NAME).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def load_index(embeddings, path: Path = RAG_INDEX_DIR, mmap: bool = True):
+    """Load (vectorstore, manifest); the vectors are memory-mapped unless mmap=False."""
+    with index_lock(path):
+        manifest = read_manifest(path)
+        if manifest is None or not (path / "index.faiss").exists():
+            return None, None
+
+        vectorstore = FAISS.load_local(
+            str(path),
+            embeddings,
+            # The pickle is only ever written by save_index below
+            allow_dangerous_deserialization=True,
+            io_flags=faiss.IO_FLAG_MMAP if mmap else 0,
+        )
+    return vectorstore, manifest
+
+
+def save_index(vectorstore, manifest: dict, path: Path = RAG_INDEX_DIR):
+    """Write to a fresh sibling directory and swap it in so readers never see a partial index."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(prefix=f"{path.name}.tmp-", dir=path.parent))
+    try:
+        vectorstore.save_local(str(tmp_path))
+        with open(tmp_path / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        with index_lock(path, exclusive=True):
+            old_path = None
+            if path.exists():
+                old_path = Path(tempfile.mkdtemp(prefix=f"{path.name}.old-", dir=path.parent))
+                # rename() onto an empty directory replaces it
+                path.rename(old_path)
+            tmp_path.rename(path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    # Memory-mapped readers of the old files keep working after the unlink
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+
+def plan_changes(manifest: dict | None, docs: dict) -> tuple[dict, list[str]]:
+    """Return (documents to embed, keys to delete) to bring the manifest in line with docs."""
+    indexed = (manifest or {}).get("documents", {})
+    current = {key: content_hash(doc) for key, doc in docs.items()}
+
+    to_add = {key: docs[key] for key, digest in current.items() if indexed.get(key) != digest}
+    to_remove = [key for key, digest in indexed.items() if current.get(key) != digest]
+    return to_add, to_remove
+
+
+def sync_index(docs: list, embeddings, path: Path = RAG_INDEX_DIR, rebuild: bool = False):
+    """
+    Bring the persisted index up to date with `docs`, embedding only what changed.
+    Returns (vectorstore, changed).
+    """
+    docs = unique_documents(docs)
+    if not docs:
+        raise RuntimeError("No documents available for retrieval")
+
+    vectorstore, manifest = (None, None) if rebuild else load_index(embeddings, path, mmap=False)
+    if manifest and manifest.get("embedding_model") != EMBEDDING_MODEL:
+        print(f"[RAG] Embedding model changed to {EMBEDDING_MODEL}, rebuilding index", flush=True)
+        vectorstore, manifest = None, None
+
+    if vectorstore is None:
+        to_add, to_remove = docs, []
+    else:
+        to_add, to_remove = plan_changes(manifest, docs)
+        if not to_add and not to_remove:
+            return vectorstore, False
+
+    print(f"[RAG] Index sync: embedding {len(to_add)}, removing {len(to_remove)}", flush=True)
+
+    if vectorstore is None:
+        vectorstore = FAISS.from_documents(list(to_add.values()), embeddings, ids=list(to_add))
+    else:
+        if to_remove:
+            vectorstore.delete(ids=to_remove)
+        if to_add:
+            vectorstore.add_documents(list(to_add.values()), ids=list(to_add))
+
+    save_index(vectorstore, {
+        "embedding_model": EMBEDDING_MODEL,
+        "documents": {key: content_hash(doc) for key, doc in docs.items()},
+    }, path)
+    return vectorstore, True
+
+
+def update_index(upserts: list, removals: list[str], embeddings, path: Path = RAG_INDEX_DIR):
+    """
+    Apply a handful of document changes to the persisted index without a full sync.
+    Returns (vectorstore, changed); vectorstore is None when there is no usable index yet.
+    """
+    vectorstore, manifest = load_index(embeddings, path, mmap=False)
+    if vectorstore is None or manifest.get("embedding_model") != EMBEDDING_MODEL:
+        return None, False
+
+    indexed = dict(manifest.get("documents", {}))
+    upserts = {
+        key: doc for key, doc in unique_documents(upserts).items()
+        if indexed.get(key) != content_hash(doc)
+    }
+    # Replaced documents are deleted first; the docstore refuses duplicate ids
+    to_remove = [key for key in dict.fromkeys(list(removals) + list(upserts)) if key in indexed]
+    if not upserts and not to_remove:
+        return vectorstore, False
+
+    print(f"[RAG] Index update: embedding {len(upserts)}, removing {len(to_remove)}", flush=True)
+
+    if to_remove:
+        vectorstore.delete(ids=to_remove)
+        for key in to_remove:
+            indexed.pop(key, None)
+    if upserts:
+        vectorstore.add_documents(list(upserts.values()), ids=list(upserts))
+        indexed.update({key: content_hash(doc) for key, doc in upserts.items()})
+
+    save_index(vectorstore, {"embedding_model": EMBEDDING_MODEL, "documents": indexed}, path)
+    return vectorstore, True
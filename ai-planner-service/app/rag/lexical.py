@@ -0,0 +1,88 @@
+"""
+In-process BM25 index over the RAG documents, plus reciprocal-rank fusion.
+
+The index is rebuilt from the FAISS docstore whenever the vector index is
+(re)loaded, so both sides always cover the same document ids. Short queries
+made only of indexed terms (and numbers) are answered lexically without an
+embedding round trip; everything else fuses the BM25 and vector rankings.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+
+BM25_K1 = float(os.getenv("RAG_BM25_K1", "1.5"))
+BM25_B = float(os.getenv("RAG_BM25_B", "0.75"))
+# Standard RRF damping constant; higher flattens the contribution of top ranks
+RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+# Queries with at most this many terms, all known to the index, skip the embedding call
+KEYWORD_QUERY_MAX_TERMS = int(os.getenv("RAG_KEYWORD_QUERY_MAX_TERMS", "4"))
+
+TERM = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "how", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "show", "the", "to", "we", "what", "with",
+    "want", "need", "find", "please",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    return [term for term in TERM.findall(text.lower()) if term not in STOPWORDS]
+
+
+class BM25Index:
+    def __init__(self, documents: dict, k1: float = BM25_K1, b: float = BM25_B):
+        """documents: id -> Document, in the order results should tie-break."""
+        self.k1 = k1
+        self.b = b
+        self.ids = list(documents)
+        self.documents = documents
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+
+        lengths = []
+        for position, doc in enumerate(documents.values()):
+            counts = Counter(tokenize(doc.page_content))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((position, tf))
+
+        self.lengths = lengths
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        total = len(self.ids)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def is_keyword_query(self, query: str) -> bool:
+        """Short, and every non-numeric term is in the index vocabulary."""
+        terms = tokenize(query)
+        words = [term for term in terms if not term.isdigit()]
+        return bool(words) and len(terms) <= KEYWORD_QUERY_MAX_TERMS and all(term in self.postings for term in words)
+
+    def search(self, query: str, k: int = 4) -> list[tuple[str, float]]:
+        """Top-k (doc id, score), best first; documents matching no term are left out."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.ids[position], score) for position, score in ranked]
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = RRF_K) -> list[str]:
+    """Merge several best-first id lists; ids ranked well by more lists come first."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
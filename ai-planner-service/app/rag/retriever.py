@@ -1,34 +1,175 @@
-from langchain_community.vectorstores import FAISS
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from langchain_ollama import OllamaEmbeddings
 
 from app.rag.knowledge import get_documents
-from app.rag.catalog_loader import load_catalog_documents
+from app.rag.catalog_loader import load_catalog_documents, category_document, category_doc_id, is_indexed_category
+from app.rag.index_store import (
+    EMBEDDING_MODEL, OLLAMA_BASE_URL, claim_writer, document_key, index_version, load_index, sync_index, update_index,
+)
+from app.rag.embedding_cache import CachedEmbeddings, get_embedding_cache
+from app.rag.lexical import BM25Index, reciprocal_rank_fusion
 
 _vectorstore = None
+_lexical = None
+# index_version() of what _vectorstore was loaded from
+_loaded_version = None
+_sync_lock = threading.Lock()
+# Category events are embedded off the pika consumer thread, one at a time
+_event_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-category-events")
 
-def get_retriever():
-    global _vectorstore
+CATEGORY_EVENTS = {"CATEGORY_CREATED", "CATEGORY_UPDATED", "CATEGORY_DELETED"}
+
+
+def get_embeddings():
+    return CachedEmbeddings(
+        OllamaEmbeddings(
+            model=EMBEDDING_MODEL,
+            base_url=OLLAMA_BASE_URL
+        ),
+        get_embedding_cache(),
+        namespace=EMBEDDING_MODEL,
+    )
 
-    if _vectorstore is not None:
-        return _vectorstore.as_retriever()
 
+def load_documents(strict: bool = False):
+    """Knowledge base plus catalog categories; strict raises if the catalog is unreachable."""
     docs = []
     docs.extend(get_documents())
-    docs.extend(load_catalog_documents())
+    docs.extend(load_catalog_documents(raise_on_error=strict))
+    return docs
 
-    if not docs:
-        raise RuntimeError("No documents available for retrieval")
 
-    try:
-        embeddings = OllamaEmbeddings(
-            model="nomic-embed-text",
-            base_url="http://host.docker.internal:11434"
-        )
+def load_vectorstore() -> bool:
+    """Memory-map the prebuilt index, if one exists. Called at startup."""
+    global _vectorstore, _lexical, _loaded_version
+
+    version = index_version()
+    vectorstore, _ = load_index(get_embeddings())
+    if vectorstore is None:
+        print("[AI PLANNER] No prebuilt RAG index found", flush=True)
+        return False
+
+    lexical = build_lexical_index(vectorstore)
+    _vectorstore, _lexical, _loaded_version = vectorstore, lexical, version
+    return True
+
 
-        _vectorstore = FAISS.from_documents(docs, embeddings)
+def ensure_vectorstore():
+    """
+    Make sure a current index is loaded: pick up one another worker swapped in,
+    or, in the writer process only, build it when there is none yet.
+    """
+    if _vectorstore is not None and index_version() == _loaded_version:
+        return
+    if load_vectorstore():
+        return
+    if not claim_writer():
+        raise RuntimeError("RAG index is not built yet; the index writer process is building it")
+    sync_vectorstore(strict=False)
 
+
+def build_lexical_index(vectorstore) -> BM25Index:
+    """BM25 over exactly the documents in the vector index, keyed by the same ids."""
+    documents = {
+        doc_id: vectorstore.docstore.search(doc_id)
+        for doc_id in vectorstore.index_to_docstore_id.values()
+    }
+    return BM25Index(documents)
+
+
+def sync_vectorstore(strict: bool = True) -> bool:
+    """
+    Re-embed only the documents that changed since the index was built, then swap it in.
+    In strict mode a catalog outage aborts the sync instead of dropping every category.
+    """
+    global _vectorstore
+
+    with _sync_lock:
+        try:
+            _, changed = sync_index(load_documents(strict=strict), get_embeddings())
+        except Exception as e:
+            print("[AI PLANNER ERROR] Vectorstore sync failed:", e, flush=True)
+            raise
+
+        if changed or _vectorstore is None:
+            load_vectorstore()
+        return changed
+
+
+def apply_category_event(event: dict) -> bool:
+    """
+    catalog event handler: embed, replace or drop the one category the event names.
+    Without a persisted index yet this is a no-op; the next full sync includes the change.
+    """
+    global _vectorstore
+
+    event_type = event.get("event_type")
+    if event_type not in CATEGORY_EVENTS:
+        return False
+
+    payload = event.get("payload") or {}
+    doc_id = category_doc_id(payload.get("slug"), payload.get("name"))
+    removals, upserts = [], []
+    if payload.get("previous_slug"):
+        removals.append(category_doc_id(payload["previous_slug"]))
+
+    if event_type == "CATEGORY_DELETED" or not is_indexed_category(payload):
+        # Deactivated or moved under a parent: the full sync wouldn't index it either
+        removals.append(doc_id)
+    else:
+        doc = category_document(payload)
+        if doc is not None:
+            upserts.append(doc)
+
+    with _sync_lock:
+        _, changed = update_index(upserts, removals, get_embeddings())
+        if changed:
+            load_vectorstore()
+
+    print(f"[AI PLANNER] {event_type} {doc_id} applied to RAG index (changed={changed})", flush=True)
+    return changed
+
+
+def handle_category_event(event: dict):
+    """Event consumer hook: queue the index update so the consumer thread keeps acking and heartbeating."""
+    if event.get("event_type") in CATEGORY_EVENTS:
+        _event_executor.submit(_apply_category_event_logged, event)
+
+
+def _apply_category_event_logged(event: dict):
+    try:
+        apply_category_event(event)
     except Exception as e:
-        print("[AI PLANNER ERROR] Vectorstore init failed:", e)
-        raise
+        # The next full sync reconciles whatever this event would have changed
+        print(f"[AI PLANNER ERROR] Applying {event.get('event_type')} to RAG index failed: {e}", flush=True)
+
 
+def get_retriever():
+    ensure_vectorstore()
     return _vectorstore.as_retriever()
+
+
+def hybrid_search(query: str, k: int = 4) -> list:
+    """
+    BM25 and vector results fused by reciprocal rank. Keyword-only queries are
+    served from the lexical index alone, without embedding the query.
+    """
+    ensure_vectorstore()
+    vectorstore, lexical = _vectorstore, _lexical
+
+    lexical_hits = [doc_id for doc_id, _ in lexical.search(query, k=k)]
+    if lexical_hits and lexical.is_keyword_query(query):
+        return [lexical.documents[doc_id] for doc_id in lexical_hits]
+
+    vector_docs = vectorstore.similarity_search(query, k=k)
+    documents = dict(lexical.documents)
+    vector_hits = []
+    for doc in vector_docs:
+        doc_id = doc.id or document_key(doc)
+        documents.setdefault(doc_id, doc)
+        vector_hits.append(doc_id)
+
+    fused = reciprocal_rank_fusion([lexical_hits, vector_hits])
+    return [documents[doc_id] for doc_id in fused[:k]]
@@ -5,20 +5,23 @@ from app.rules.schema import RuleFile
 RULES_PATH = Path(__file__).parent / "data"
 
 
-def load_rules(event_type: str) -> list[dict]:
-    file_path = RULES_PATH / f"{event_type}.yaml"
-
-    if not file_path.exists():
-        raise RuntimeError(f"No rule file found for event_type='{event_type}'")
-
+def read_rule_file(file_path: Path) -> RuleFile:
     with open(file_path, "r", encoding="utf-8") as f:
         raw = yaml.safe_load(f)
 
     try:
-        validated = RuleFile(**raw)
+        return RuleFile(**raw)
     except Exception as e:
         raise RuntimeError(
             f"Invalid rule schema in {file_path.name}: {e}"
         )
 
+
+def load_rules(event_type: str) -> list[dict]:
+    file_path = RULES_PATH / f"{event_type}.yaml"
+
+    if not file_path.exists():
+        raise RuntimeError(f"No rule file found for event_type='{event_type}'")
+
+    validated = read_rule_file(file_path)
     return [rule.model_dump() for rule in validated.rules]
@@ -0,0 +1,144 @@
+"""
+Compiled, hot-reloadable rule sets for every event type.
+
+Each YAML file in app/rules/data/ is validated once and compiled into a
+decision index: rules are grouped by the set of fields their conditions use,
+and each group maps the tuple of condition values to its highest-priority
+decision. Evaluating a context is one dict lookup per group, independent of
+how many rules a file has. The registry polls the directory and swaps in a
+freshly compiled set of files whenever one changes.
+"""
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import yaml
+
+from app.rules.loader import RULES_PATH, read_rule_file
+
+
+RULES_POLL_INTERVAL = float(os.getenv("RULES_POLL_INTERVAL", "5"))
+
+
+class CompiledRuleSet:
+    def __init__(self, event_type: str, rules: list[dict]):
+        self.event_type = event_type
+        self.rules = rules
+        # (condition fields) -> {(condition values): (priority, position, decision)}
+        self.index: dict[tuple[str, ...], dict[tuple, tuple[int, int, dict]]] = {}
+
+        for position, rule in enumerate(rules):
+            fields = tuple(sorted(rule["conditions"]))
+            values = tuple(rule["conditions"][f] for f in fields)
+            entry = (rule.get("priority", 0), position, rule["decision"])
+            table = self.index.setdefault(fields, {})
+            current = table.get(values)
+            # Same ordering as evaluate_rules: highest priority, then file order
+            if current is None or (entry[0], -entry[1]) > (current[0], -current[1]):
+                table[values] = entry
+
+    @property
+    def services(self) -> list[str]:
+        return [r["conditions"]["service"] for r in self.rules if "service" in r["conditions"]]
+
+    def evaluate(self, context: dict) -> dict | None:
+        best = None
+        for fields, table in self.index.items():
+            entry = table.get(tuple(context.get(f) for f in fields))
+            if entry is not None and (best is None or (entry[0], -entry[1]) > (best[0], -best[1])):
+                best = entry
+        return best[2] if best else None
+
+
+def compile_rule_file(file_path: Path) -> CompiledRuleSet:
+    validated = read_rule_file(file_path)
+    return CompiledRuleSet(
+        validated.event_type.lower(),
+        [rule.model_dump() for rule in validated.rules],
+    )
+
+
+class RuleRegistry:
+    def __init__(self, path: Path = RULES_PATH):
+        self.path = Path(path)
+        self.version = 0
+        self._rule_sets: dict[str, CompiledRuleSet] = {}
+        self._fingerprints: dict[Path, tuple[int, int]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        fingerprints = {}
+        for file_path in sorted(self.path.glob("*.yaml")):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            fingerprints[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return fingerprints
+
+    def load_all(self, strict: bool = False) -> bool:
+        """
+        Compile every rule file and swap the whole registry in at once.
+        A file that fails validation keeps its previously compiled rules
+        (or raises with strict=True, which startup uses).
+        """
+        with self._lock:
+            fingerprints = self._scan()
+            rule_sets = {}
+            for file_path in fingerprints:
+                # Rules are looked up by file name, as load_rules always did
+                key = file_path.stem.lower()
+                try:
+                    rule_sets[key] = compile_rule_file(file_path)
+                except (OSError, RuntimeError, yaml.YAMLError, TypeError) as e:
+                    if strict:
+                        raise RuntimeError(f"Failed to load rules from {file_path.name}: {e}")
+                    print(f"[RULES] Keeping previous rules for '{key}': {e}", flush=True)
+                    if key in self._rule_sets:
+                        rule_sets[key] = self._rule_sets[key]
+
+            self._rule_sets = rule_sets
+            self._fingerprints = fingerprints
+            self._loaded = True
+            self.version += 1
+
+        print(f"[RULES] Loaded rule sets: {sorted(rule_sets)}", flush=True)
+        return True
+
+    def reload_if_changed(self) -> bool:
+        if self._loaded and self._scan() == self._fingerprints:
+            return False
+        return self.load_all()
+
+    def get(self, event_type: str) -> CompiledRuleSet | None:
+        if not self._loaded:
+            self.load_all()
+        return self._rule_sets.get((event_type or "").lower())
+
+    def evaluate(self, event_type: str, context: dict) -> dict | None:
+        rule_set = self.get(event_type)
+        return rule_set.evaluate(context) if rule_set else None
+
+    def event_types(self) -> list[str]:
+        if not self._loaded:
+            self.load_all()
+        return sorted({rule_set.event_type for rule_set in self._rule_sets.values()} | set(self._rule_sets))
+
+    def services(self) -> list[str]:
+        if not self._loaded:
+            self.load_all()
+        return [service for rule_set in self._rule_sets.values() for service in rule_set.services]
+
+    async def watch(self, interval: float = RULES_POLL_INTERVAL):
+        """Poll the rules directory until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload_if_changed)
+            except Exception as e:
+                print(f"[RULES] Reload failed: {e}", flush=True)
+
+
+rule_registry = RuleRegistry()
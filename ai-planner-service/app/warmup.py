@@ -0,0 +1,115 @@
+"""
+Startup warm-up and readiness state for the planner.
+
+Warm-up runs in the background after the worker starts serving, so /health
+answers immediately while /ready stays 503 until every step has finished:
+the category index, vendor reputation, the memory-mapped FAISS index and a
+first Ollama round trip (which loads the model and opens the HTTP session).
+"""
+import asyncio
+import os
+import signal
+import threading
+import time
+
+from app.catalog.categories import category_index
+from app.catalog.vendor_scores import reputation_store
+from app.llm.planner_llm import warm_llm
+from app.rag.retriever import load_vectorstore
+
+
+WARMUP_LLM = os.getenv("PLANNER_WARMUP_LLM", "true").lower() == "true"
+WARMUP_STEP_TIMEOUT_SECONDS = float(os.getenv("PLANNER_WARMUP_TIMEOUT", "120"))
+# After SIGTERM, keep serving this long with /ready at 503 so the load balancer stops routing here
+DRAIN_SECONDS = float(os.getenv("PLANNER_DRAIN_SECONDS", "5"))
+
+
+class Readiness:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.ready = False
+        self.draining = False
+        self.started_at = clock()
+        self.checks: dict[str, dict] = {}
+
+    def record(self, name: str, ok: bool, seconds: float, error: str | None = None):
+        self.checks[name] = {"ok": ok, "seconds": round(seconds, 3), **({"error": error} if error else {})}
+
+    def snapshot(self) -> dict:
+        if self.draining:
+            status = "draining"
+        elif self.ready:
+            status = "ready"
+        else:
+            status = "warming_up"
+        return {
+            "status": status,
+            "uptime_seconds": round(self._clock() - self.started_at, 1),
+            "checks": self.checks,
+        }
+
+
+readiness = Readiness()
+
+
+async def run_step(name: str, step, timeout: float = WARMUP_STEP_TIMEOUT_SECONDS):
+    """Run one warm-up step, recording its outcome; failures don't stop the others."""
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(step(), timeout=timeout)
+        ok = result is not False
+        readiness.record(name, ok, time.perf_counter() - started)
+    except Exception as e:
+        readiness.record(name, False, time.perf_counter() - started, repr(e))
+    print(f"[WARMUP] {name}: {readiness.checks[name]}", flush=True)
+
+
+async def warm_up():
+    """
+    Warm every dependency concurrently, then flip readiness.
+    A step that fails still lets the worker become ready; each path has its own
+    lazy fallback and the failure is visible in /ready's checks.
+    """
+    steps = {
+        "categories": category_index.refresh,
+        "vendor_reputation": reputation_store.refresh,
+        "vector_store": lambda: asyncio.to_thread(load_vectorstore),
+    }
+    if WARMUP_LLM:
+        steps["llm"] = lambda: asyncio.to_thread(warm_llm)
+
+    await asyncio.gather(*(run_step(name, step) for name, step in steps.items()))
+    if not readiness.draining:
+        readiness.ready = True
+    print(f"[WARMUP] Ready after {readiness.snapshot()['uptime_seconds']}s", flush=True)
+
+
+def begin_drain():
+    readiness.draining = True
+    readiness.ready = False
+
+
+def install_drain_handler(delay: float = DRAIN_SECONDS) -> bool:
+    """
+    Wrap the server's SIGTERM handler: report draining right away, then hand the
+    signal on after `delay` so graceful shutdown starts only once /ready has been
+    503 for a while. A second SIGTERM is passed on immediately. Call from the
+    lifespan, after the server has installed its own handlers.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    server_handler = signal.getsignal(signal.SIGTERM)
+    if not callable(server_handler):
+        return False
+    loop = asyncio.get_running_loop()
+
+    def on_sigterm(signum, frame):
+        if readiness.draining:
+            server_handler(signum, frame)
+            return
+        begin_drain()
+        print(f"[SHUTDOWN] SIGTERM received, draining for {delay}s before shutdown", flush=True)
+        loop.call_soon_threadsafe(loop.call_later, delay, server_handler, signum, frame)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    return True
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: compiled context extractor vs the old per-list linear scan.
+
+Run from ai-planner-service:
+    python -m benchmarks.bench_context [--repeat 2000]
+"""
+import argparse
+import re
+import timeit
+
+from app.api.context import build_extractor, load_vocabulary, ContextExtractor
+
+
+CORPUS = [
+    "Plan a wedding in Mumbai under 3 lakhs",
+    "Wedding for 100 guests, 5 lakh budget",
+    "I want a DJ in Bangalore under 3 lakhs",
+    "Birthday party with live band in Pune for 50 people, budget 75k",
+    "Corporate conference in Hyderabad, 300 attendees, ₹4,50,000",
+    "Need catering and decoration for a retreat",
+    "Award ceremony lighting in Chennai 2.5 lakh",
+    "Plan a festival in Kolkata",
+    "Product launch with photography, 80000",
+    "Small family meeting, no budget yet",
+]
+
+
+def legacy_extract(question: str) -> dict:
+    """The pre-compiled extractor: one `in` scan per keyword list, first number as budget."""
+    q = question.lower()
+    event_type = next((et for et in ["wedding", "birthday", "corporate", "conference", "party", "launch", "executive",
+                                     "retreat", "award", "ceremony", "meeting", "summit", "festival"] if et in q), None)
+    budget_val = None
+    match = re.search(r'(\d+)\s*(lakh|k|thousand)?', q)
+    if match:
+        val = int(match.group(1))
+        unit = match.group(2)
+        budget_val = val * 100000 if unit == "lakh" else val * 1000 if unit == "k" else val
+    service = next((s for s in ["dj", "catering", "photography", "decoration", "venue", "live band", "lighting"] if s in q), None)
+    city = next((c.capitalize() for c in ["mumbai", "delhi", "bangalore", "pune", "hyderabad", "chennai", "kolkata"] if c in q), None)
+    return {"event_type": event_type, "budget_val": budget_val, "service": service, "city": city}
+
+
+LEGACY_BUDGET = re.compile(r'(\d+)\s*(lakh|k|thousand)?')
+
+
+def linear_scan(terms: list[str]):
+    """The old approach applied to a given vocabulary: one substring test per term plus the budget regex."""
+    def extract(question: str):
+        q = question.lower()
+        return [t for t in terms if t in q], LEGACY_BUDGET.search(q)
+    return extract
+
+
+def report(name: str, fn, repeat: int, rounds: int = 10):
+    # Best of several rounds; a single long run mostly measures scheduler noise
+    number = max(1, repeat // rounds)
+    seconds = min(timeit.repeat(lambda: [fn(q) for q in CORPUS], number=number, repeat=rounds))
+    per_question = seconds / (number * len(CORPUS)) * 1e6
+    print(f"{name:>28}: {per_question:7.2f} us/question")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--categories", type=int, nargs="*", default=[0, 40, 100, 1000],
+                        help="Synthetic catalog category counts to add to the vocabulary")
+    args = parser.parse_args()
+
+    report("legacy (inline lists)", legacy_extract, args.repeat)
+    report("compiled (repo vocabulary)", build_extractor().extract, args.repeat)
+
+    vocabulary = load_vocabulary()
+    for size in args.categories:
+        names = [f"category {i} & services" for i in range(size)]
+        extractor = ContextExtractor(vocabulary["event_types"], vocabulary["services"], vocabulary["cities"], names)
+        print(f"\nVocabulary of {len(extractor.terms)} terms:")
+        report("linear scan", linear_scan(list(extractor.terms)), args.repeat)
+        report("compiled", extractor.extract, args.repeat)
+
+    extractor = build_extractor()
+    print("\nCompiled extraction:")
+    for question in CORPUS:
+        print(f"  {question!r}\n    -> {extractor.extract(question)}")
+
+
+if __name__ == "__main__":
+    main()
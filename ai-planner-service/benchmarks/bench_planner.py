@@ -0,0 +1,368 @@
+"""
+Benchmark: end-to-end /plan and /ask latency and throughput.
+
+Starts the real FastAPI app under uvicorn against two local fakes, a
+catalog-service serving generated products and an Ollama endpoint with a fixed
+response latency, then drives it serially and with concurrent clients.
+Reports p50/p95/p99 latency, requests per second and where the time went
+(context extraction, catalog fetch, filter/rank, LLM, retrieval, serialization).
+Stage figures sum every call, so stages that run concurrently inside one
+request can add up to more than its latency.
+
+Run from ai-planner-service:
+    python -m benchmarks.bench_planner [--products 2000] [--llm-latency 0.3]
+        [--requests 40] [--concurrency 1 8] [--endpoints plan ask] [--mode llm]
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+CATEGORIES = [
+    ("Venue & Infrastructure", "venue-infrastructure"),
+    ("Catering & Food", "catering-food"),
+    ("Decoration & Styling", "decoration-styling"),
+    ("Photography & Video", "photography-video"),
+    ("Sound & Music", "sound-music"),
+    ("Lighting & Effects", "lighting-effects"),
+]
+QUESTIONS = [
+    "Plan a wedding for 150 guests in Mumbai under 3 lakhs",
+    "Birthday party for 40 people with a DJ, budget 80000",
+    "Corporate conference in Pune for 200 attendees, 5 lakhs",
+    "Engagement ceremony with catering and photography under 2 lakhs",
+]
+ASK_QUESTIONS = [
+    "DJ under 50000",
+    "catering buffet",
+    "what should a small budget wedding skip",
+    "who can handle lighting for an evening reception",
+]
+EMBEDDING_DIM = 32
+PAGE_SIZE = 100
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data, status=200, content_type="application/json"):
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+
+def make_catalog_handler(products_per_category: int, base_url: str):
+    rng = random.Random(7)
+    products = {}
+    for category_id, (_, slug) in enumerate(CATEGORIES, start=1):
+        products[slug] = [
+            {
+                "id": category_id * 1_000_000 + i,
+                "name": f"{slug} product {i}",
+                "price": rng.randint(500, 300000),
+                "vendor_id": rng.randint(1, 500),
+                "category": category_id,
+                "city": rng.choice(["Mumbai", "Pune", "Delhi"]),
+            }
+            for i in range(products_per_category)
+        ]
+    categories = [
+        {"id": i, "name": name, "slug": slug, "children": []}
+        for i, (name, slug) in enumerate(CATEGORIES, start=1)
+    ]
+
+    class CatalogHandler(QuietHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            path = url.path
+            if path == "/api/catalog/categories/":
+                return self.send_json(categories)
+            if path in ("/api/catalog/vendors/stats/", "/internal/vendors/reputation/"):
+                return self.send_json({"results": []})
+
+            match = re.fullmatch(r"/api/catalog/categories/([\w-]+)/products/", path)
+            if not match or match.group(1) not in products:
+                return self.send_json({"detail": "Not found"}, status=404)
+
+            page = int(parse_qs(url.query).get("page", ["1"])[0])
+            listing = products[match.group(1)]
+            start = (page - 1) * PAGE_SIZE
+            more = start + PAGE_SIZE < len(listing)
+            self.send_json({
+                "count": len(listing),
+                "next": f"{base_url}{path}?page={page + 1}" if more else None,
+                "results": listing[start:start + PAGE_SIZE],
+            })
+
+    return CatalogHandler
+
+
+def fake_completion(prompt: str) -> str:
+    """Plausible JSON for each planner prompt shape so the happy path is measured."""
+    if "percentages" in prompt:
+        return json.dumps({"venue": 30, "catering": 35, "decoration": 15, "photography": 10, "dj": 5, "lighting": 5})
+
+    match = re.search(r"Categories:\s*(\{.*\})\s*Instructions", prompt, re.S)
+    if match:
+        candidates = json.loads(match.group(1))
+        return json.dumps({
+            category: {"product_id": entry["products"][0]["id"], "reason": "Good value for the budget"}
+            for category, entry in candidates.items() if entry["products"]
+        })
+
+    match = re.search(r"Available Products:\s*(\[.*\])\s*Instructions", prompt, re.S)
+    if match:
+        offered = json.loads(match.group(1))
+        return json.dumps({"product_id": offered[0]["id"], "reason": "Good value for the budget"})
+
+    return "Fits the event and the budget."
+
+
+def embedding(text: str) -> list[float]:
+    digest = hashlib.sha256(text.encode()).digest()
+    return [b / 255 for b in digest[:EMBEDDING_DIM]]
+
+
+def make_ollama_handler(llm_latency: float, embed_latency: float):
+    class OllamaHandler(QuietHandler):
+        def do_POST(self):
+            request = self.read_json()
+            if self.path == "/api/chat":
+                time.sleep(llm_latency)
+                prompt = "\n".join(message.get("content", "") for message in request.get("messages", []))
+                line = {
+                    "model": request.get("model"),
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "message": {"role": "assistant", "content": fake_completion(prompt)},
+                    "done": True,
+                    "done_reason": "stop",
+                }
+                return self.send_json(json.dumps(line).encode() + b"\n", content_type="application/x-ndjson")
+
+            if self.path == "/api/embed":
+                time.sleep(embed_latency)
+                texts = request.get("input")
+                texts = [texts] if isinstance(texts, str) else texts
+                return self.send_json({"model": request.get("model"), "embeddings": [embedding(t) for t in texts]})
+
+            self.send_json({"error": "not found"}, status=404)
+
+    return OllamaHandler
+
+
+def serve(handler_factory, port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler_factory)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class StageTimer:
+    """Wall time per pipeline stage, collected by wrapping the functions each stage calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def reset(self):
+        with self._lock:
+            self.samples = defaultdict(list)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds * 1000)
+
+    def wrap(self, owner, name: str, stage: str):
+        original = getattr(owner, name)
+        if asyncio.iscoroutinefunction(original):
+            async def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - started)
+        else:
+            def timed(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - started)
+        setattr(owner, name, timed)
+
+
+def instrument(timer: StageTimer):
+    import fastapi.routing
+    from fastapi.responses import JSONResponse
+    from app.api import planner
+    from app.llm.gateway import gateway
+
+    timer.wrap(planner, "extract_plan_context", "context")
+    timer.wrap(planner, "afetch_products", "fetch")
+    timer.wrap(planner, "filter_candidates", "filter")
+    timer.wrap(planner, "rank_products", "filter")
+    timer.wrap(gateway, "invoke", "llm")
+    timer.wrap(planner, "hybrid_search", "retrieval")
+    timer.wrap(fastapi.routing, "serialize_response", "serialization")
+    timer.wrap(JSONResponse, "render", "serialization")
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_load(base_url: str, endpoint: str, mode: str, requests: int, concurrency: int, cold: bool):
+    import httpx
+    from app.catalog.cache import product_cache
+    from app.llm.cache import response_cache
+
+    questions = ASK_QUESTIONS if endpoint == "ask" else QUESTIONS
+    params = {"mode": mode} if endpoint == "plan" else None
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                if cold:
+                    product_cache.clear()
+                    response_cache.clear()
+                started = time.perf_counter()
+                response = await client.post(f"/api/{endpoint}", params=params, json={"question": questions[i % len(questions)]})
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+                    print(f"/{endpoint} -> {response.status_code}: {response.text[:200]}", file=sys.stderr)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, errors, elapsed
+
+
+def report(title: str, latencies: list[float], errors: int, elapsed: float, timer: StageTimer):
+    count = len(latencies)
+    print(f"{title}: {count} requests, {errors} errors, {count / elapsed:.1f} req/s")
+    print(
+        f"  latency ms  p50 {percentile(latencies, 0.5):8.1f}  p95 {percentile(latencies, 0.95):8.1f}"
+        f"  p99 {percentile(latencies, 0.99):8.1f}  max {max(latencies, default=0):8.1f}"
+    )
+    for stage in ("context", "fetch", "filter", "llm", "retrieval", "serialization"):
+        samples = timer.samples.get(stage)
+        if not samples:
+            continue
+        print(
+            f"  {stage:>13}: {len(samples):5d} calls  {sum(samples) / count:8.1f} ms/request"
+            f"  p50 {percentile(samples, 0.5):7.1f}  p95 {percentile(samples, 0.95):7.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=2000, help="products per category in the fake catalog")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds per fake Ollama chat call")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="seconds per fake Ollama embed call")
+    parser.add_argument("--requests", type=int, default=40, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8])
+    parser.add_argument("--endpoints", nargs="*", choices=["plan", "ask"], default=["plan", "ask"])
+    parser.add_argument("--mode", choices=["llm", "hybrid", "fast"], default="llm", help="/plan mode")
+    parser.add_argument("--cold", action="store_true", help="clear the product and LLM response caches before every request")
+    parser.add_argument("--verbose", action="store_true", help="keep the service's own log output")
+    args = parser.parse_args()
+
+    catalog_port, ollama_port, app_port = free_port(), free_port(), free_port()
+    catalog_url = f"http://127.0.0.1:{catalog_port}"
+    ollama_url = f"http://127.0.0.1:{ollama_port}"
+    workdir = tempfile.mkdtemp(prefix="bench-planner-")
+
+    # The app reads its configuration at import time
+    os.environ.update({
+        "CATALOG_BASE_URL": f"{catalog_url}/api/catalog",
+        "CORE_BASE_URL": catalog_url,
+        "OLLAMA_BASE_URL": ollama_url,
+        "CATALOG_EVENTS_ENABLED": "false",
+        "CATALOG_HTTP2": "false",
+        "PLANNER_WARMUP_LLM": "false",
+        "RAG_INDEX_DIR": os.path.join(workdir, "rag_index"),
+        "EMBEDDING_CACHE_PATH": os.path.join(workdir, "embedding_cache.sqlite3"),
+    })
+    serve(make_catalog_handler(args.products, catalog_url), catalog_port)
+    serve(make_ollama_handler(args.llm_latency, args.embed_latency), ollama_port)
+
+    import uvicorn
+    from app.main import app
+    from app.rag import catalog_loader
+    from app.warmup import readiness
+
+    catalog_loader.CATALOG_SERVICE_URL = f"{catalog_url}/api/catalog/categories/"
+    timer = StageTimer()
+    instrument(timer)
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=app_port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    results = []
+    with quiet:
+        deadline = time.monotonic() + 60
+        while not (server.started and readiness.ready):
+            if time.monotonic() > deadline:
+                sys.exit("planner did not become ready within 60s")
+            time.sleep(0.05)
+
+        base_url = f"http://127.0.0.1:{app_port}"
+        for endpoint in args.endpoints:
+            # One untimed request so index loads and first-use caches don't skew the serial run
+            asyncio.run(run_load(base_url, endpoint, args.mode, 1, 1, args.cold))
+            for concurrency in args.concurrency:
+                timer.reset()
+                outcome = asyncio.run(run_load(base_url, endpoint, args.mode, args.requests, concurrency, args.cold))
+                samples = timer.samples
+                timer.reset()
+                title = f"/{endpoint}" + (f" mode={args.mode}" if endpoint == "plan" else "") + f", concurrency {concurrency}"
+                results.append((title, *outcome, samples))
+
+    server.should_exit = True
+    print(
+        f"{args.products} products/category, LLM latency {args.llm_latency * 1000:.0f} ms, "
+        f"caches {'cold' if args.cold else 'warm'}"
+    )
+    for title, latencies, errors, elapsed, samples in results:
+        timer.samples = samples
+        report(title, latencies, errors, elapsed, timer)
+
+
+if __name__ == "__main__":
+    main()
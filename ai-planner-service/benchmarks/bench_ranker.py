@@ -0,0 +1,45 @@
+"""
+Benchmark: per-product rank_products loop vs the vectorized batch ranker.
+
+Run from ai-planner-service:
+    python -m benchmarks.bench_ranker [--sizes 10000 100000] [--repeat 5]
+"""
+import argparse
+import random
+import timeit
+
+from app.catalog import ranker
+
+
+def make_products(count: int, vendors: int = 500, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [
+        {"id": i, "name": f"Product {i}", "price": rng.randint(1000, 200000), "vendor_id": rng.randint(1, vendors)}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Force the scalar path for the baseline regardless of input size
+    ranker.BATCH_RANK_THRESHOLD = float("inf")
+
+    for size in args.sizes:
+        products = make_products(size)
+        cases = {
+            "scalar, full ranking": lambda: ranker.rank_products(products, 50000),
+            "batch, full ranking": lambda: ranker.rank_products_batch(products, 50000),
+            "batch, top 3": lambda: ranker.rank_products_batch(products, 50000, top_k=3),
+        }
+        print(f"{size} products:")
+        for name, fn in cases.items():
+            best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+            print(f"  {name:>22}: {best * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
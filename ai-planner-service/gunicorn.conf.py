@@ -0,0 +1,35 @@
+"""
+Production server profile: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Each worker runs the app lifespan on its own (warm-up, refreshers, event
+consumer); the FAISS index is memory-mapped, so workers share its pages.
+Only the worker that claims the index writer lock syncs the index and applies
+category events; the others reload it when it changes on disk.
+"""
+import multiprocessing
+import os
+
+
+bind = os.getenv("PLANNER_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, multiprocessing.cpu_count()))))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# LLM-backed /plan calls can legitimately take tens of seconds
+timeout = int(os.getenv("PLANNER_WORKER_TIMEOUT", "120"))
+# On SIGTERM workers report draining on /ready for PLANNER_DRAIN_SECONDS, then stop
+# accepting, finish in-flight requests and run lifespan shutdown; all within this
+graceful_timeout = int(os.getenv("PLANNER_GRACEFUL_TIMEOUT", "60"))
+keepalive = int(os.getenv("PLANNER_KEEPALIVE", "5"))
+
+# Recycle workers now and then to bound memory growth; jitter avoids restarting together
+max_requests = int(os.getenv("PLANNER_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("PLANNER_MAX_REQUESTS_JITTER", "200"))
+
+# Connection pools, consumer threads and asyncio state must not be shared across forks
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("PLANNER_LOG_LEVEL", "info")
@@ -2,6 +2,35 @@ import pytest
 from httpx import AsyncClient
 from app.main import app
 
+
+PRODUCTS = {
+    "catering": [
+        {"id": 1, "name": "Buffet", "price": 20000, "vendor_id": 1, "category": 1, "is_available": True},
+        {"id": 2, "name": "Feast", "price": 90000, "vendor_id": 2, "category": 1, "is_available": True},
+    ],
+    "dj": [
+        {"id": 3, "name": "Premium DJ", "price": 40000, "vendor_id": 3, "category": 2, "is_available": True},
+        {"id": 4, "name": "Budget DJ", "price": 10000, "vendor_id": 4, "category": 2, "is_available": True},
+    ],
+}
+
+
+@pytest.fixture
+def fake_fetch():
+    """Stand-in for afetch_products over PRODUCTS."""
+    async def fetch(service):
+        return [dict(p) for p in PRODUCTS.get(service, [])]
+    return fetch
+
+
+@pytest.fixture
+def fail_llm():
+    """Stand-in for every LLM call in tests that must not reach one."""
+    def fail(*args, **kwargs):
+        raise AssertionError("Fast mode must not call the LLM")
+    return fail
+
+
 @pytest.fixture
 async def async_client():
     async with AsyncClient(app=app, base_url="http://test") as ac:
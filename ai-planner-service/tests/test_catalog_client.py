@@ -0,0 +1,87 @@
+"""
+Tests for the pooled async catalog client.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.catalog import async_client, client
+from app.catalog.async_client import AsyncCatalogClient
+
+
+BASE = "http://catalog.test/api/catalog/categories/dj/products/"
+
+
+def test_iter_pages_follows_next_links():
+    """All pages are walked by following the `next` link."""
+    def handler(request):
+        page = int(request.url.params.get("page", 1))
+        next_url = f"{BASE}?page={page + 1}" if page < 3 else None
+        return httpx.Response(200, json={"next": next_url, "results": [{"id": page}]})
+
+    async def run():
+        client = AsyncCatalogClient(transport=httpx.MockTransport(handler))
+        pages = [page async for page in client.iter_pages(BASE)]
+        await client.close()
+        return pages
+
+    assert asyncio.run(run()) == [[{"id": 1}], [{"id": 2}], [{"id": 3}]]
+
+
+def test_get_retries_transient_failures(monkeypatch):
+    """503s are retried with backoff until the catalog recovers."""
+    monkeypatch.setattr(async_client, "BACKOFF_BASE_SECONDS", 0)
+    calls = {"count": 0}
+
+    def handler(request):
+        calls["count"] += 1
+        if calls["count"] < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json=[{"id": 1}])
+
+    async def run():
+        client = AsyncCatalogClient(transport=httpx.MockTransport(handler))
+        data = await client.get_json(BASE)
+        await client.close()
+        return data
+
+    assert asyncio.run(run()) == [{"id": 1}]
+    assert calls["count"] == 3
+
+
+def test_iter_pages_missing_category_yields_nothing():
+    async def run():
+        client = AsyncCatalogClient(transport=httpx.MockTransport(lambda r: httpx.Response(404)))
+        pages = [page async for page in client.iter_pages(BASE)]
+        await client.close()
+        return pages
+
+    assert asyncio.run(run()) == []
+
+
+def test_download_products_asks_for_large_sparse_pages(monkeypatch):
+    """Listings are walked in big pages carrying only the fields ProductDTO needs."""
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.url.params))
+        cursor = request.url.params.get("cursor")
+        next_url = None if cursor else f"{BASE}?cursor=abc&page_size=500&fields=id"
+        return httpx.Response(200, json={"next": next_url, "results": [
+            {"id": 1 if not cursor else 2, "name": "DJ", "price": 1000, "vendor_id": 1, "category": 1},
+        ]})
+
+    async def run():
+        monkeypatch.setattr(async_client, "_client", AsyncCatalogClient(transport=httpx.MockTransport(handler)))
+        products = await client.download_products("dj")
+        await async_client.close_async_client()
+        return products
+
+    products = asyncio.run(run())
+    assert [p["id"] for p in products] == [1, 2]
+    assert seen[0]["page_size"] == str(async_client.PAGE_SIZE)
+    assert set(seen[0]["fields"].split(",")) >= {"id", "name", "price", "vendor_id", "category"}
+    assert seen[1]["cursor"] == "abc"
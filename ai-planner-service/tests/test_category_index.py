@@ -0,0 +1,71 @@
+"""
+Tests for the category index lookups and negative caching.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.catalog.categories import CategoryIndex
+
+
+CATEGORIES = [
+    {
+        "id": 1, "name": "Sound & Music", "slug": "sound-music",
+        "children": [
+            {"id": 2, "name": "DJ Services", "slug": "dj-services", "children": [
+                {"id": 3, "name": "Wedding DJ", "slug": "wedding-dj", "children": []},
+            ]},
+        ],
+    },
+    {"id": 4, "name": "Decoration & Styling", "slug": "decoration-styling", "children": []},
+]
+
+
+def test_resolve_name_forms():
+    index = CategoryIndex()
+    index.build(CATEGORIES)
+
+    assert index.resolve("sound-music") == "sound-music"
+    assert index.resolve("Sound & Music") == "sound-music"
+    assert index.resolve("decoration") == "decoration-styling"
+    assert index.resolve("wedding dj") == "wedding-dj"
+    assert index.resolve("unknown") is None
+
+
+def test_parent_child_lookups():
+    index = CategoryIndex()
+    index.build(CATEGORIES)
+
+    assert index.parent("dj-services") == "sound-music"
+    assert index.children("sound-music") == ["dj-services"]
+    assert sorted(index.descendants("sound-music")) == ["dj-services", "wedding-dj"]
+
+
+def test_mapping_matches_legacy_shape():
+    index = CategoryIndex()
+    index.build(CATEGORIES)
+    mapping = index.as_mapping()
+
+    assert mapping["sound & music"] == "sound-music"
+    assert mapping["sound"] == "sound-music"
+    assert mapping["decoration-styling"] == "decoration-styling"
+
+
+def test_misses_are_negatively_cached():
+    """An unknown name triggers one refresh, then is served from the negative cache."""
+    index = CategoryIndex()
+    refreshes = []
+
+    async def fake_refresh():
+        refreshes.append(1)
+        index.build(CATEGORIES)
+        return True
+
+    index.refresh = fake_refresh
+
+    async def run():
+        return [await index.resolve_or_refresh("karaoke") for _ in range(3)]
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert len(refreshes) == 1
@@ -0,0 +1,90 @@
+"""
+Tests for the compiled single-pass planner context extractor.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.context import ContextExtractor, build_extractor, load_rule_vocabulary, load_vocabulary
+
+
+def make_extractor(**kwargs):
+    vocab = {
+        "event_types": ["wedding", "birthday", "party"],
+        "services": ["dj", "catering", "live band"],
+        "cities": ["mumbai", "pune"],
+    }
+    vocab.update(kwargs)
+    return ContextExtractor(**vocab)
+
+
+def test_guest_count_is_not_taken_as_budget():
+    """Numbers attached to guest words are guests; the unit-bearing number is the budget."""
+    context = make_extractor().extract("Wedding for 100 guests, 5 lakh budget")
+    assert context["guests"] == 100
+    assert context["budget_val"] == 500000
+    assert context["budget"] == "under_5_lakhs"
+
+
+def test_budget_units_and_formats():
+    extractor = make_extractor()
+    assert extractor.extract("party under 50k")["budget_val"] == 50000
+    assert extractor.extract("wedding 1.5 lakhs")["budget_val"] == 150000
+    assert extractor.extract("budget ₹2,50,000")["budget_val"] == 250000
+    assert extractor.extract("birthday in 2 days")["budget_val"] is None, "Small bare numbers are not budgets"
+
+
+def test_bare_numbers_need_a_budget_word_or_a_large_amount():
+    extractor = make_extractor()
+    context = extractor.extract("wedding for 150 guests in 2027")
+    assert context["guests"] == 150
+    assert context["budget_val"] is None and context["budget"] is None, "A year is not a budget"
+
+    assert extractor.extract("party on 12th, 2026 for 40 people")["budget_val"] is None
+    assert extractor.extract("birthday for 5000 in pune")["budget_val"] is None
+    assert extractor.extract("birthday, budget 5000")["budget_val"] == 5000
+    assert extractor.extract("birthday under rs. 8000")["budget_val"] == 8000
+    assert extractor.extract("party for ₹2025")["budget_val"] == 2025
+    assert extractor.extract("party, 6000 budget")["budget_val"] == 6000
+    assert extractor.extract("wedding in 2027, 250000")["budget_val"] == 250000
+
+
+def test_first_term_in_question_wins_and_plurals_match():
+    context = make_extractor().extract("Birthday party with live bands in Pune")
+    assert context["event_type"] == "birthday"
+    assert context["service"] == "live band"
+    assert context["city"] == "Pune"
+
+
+def test_category_names_extend_service_vocabulary():
+    extractor = make_extractor(category_names=["Mehendi & Henna"])
+    assert extractor.extract("need mehendi & henna for a wedding")["service"] == "mehendi"
+
+
+def test_rule_files_feed_the_vocabulary(tmp_path):
+    (tmp_path / "gala.yaml").write_text(
+        "event_type: gala\nrules:\n  - id: G1\n    priority: 1\n    conditions: {service: fireworks}\n"
+        "    decision: {recommended: true, reason: ok}\n"
+    )
+    event_types, services = load_rule_vocabulary(tmp_path)
+    assert event_types == ["gala"]
+    assert services == ["fireworks"]
+
+
+def test_default_extractor_uses_repo_rules():
+    context = build_extractor().extract("I want a DJ in Bangalore under 3 lakhs")
+    assert context["service"] == "dj"
+    assert context["city"] == "Bangalore"
+    assert context["budget"] == "under_3_lakhs"
+
+
+def test_terms_match_whole_words_only():
+    extractor = make_extractor(category_names=["Sound & Music"])
+    assert extractor.extract("adjust the schedule")["service"] is None, "'dj' inside a word is not a service"
+    assert extractor.extract("sound&music for the party")["service"] == "sound"
+
+
+def test_vocabulary_file_feeds_cities_and_event_types(tmp_path):
+    path = tmp_path / "vocabulary.yaml"
+    path.write_text("event_types: [gala]\ncities: [jaipur]\n")
+    assert load_vocabulary(path) == {"event_types": ["gala"], "services": [], "cities": ["jaipur"]}
@@ -0,0 +1,69 @@
+"""
+Tests for the content-addressed embedding cache.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.embeddings import Embeddings
+
+from app.rag.embedding_cache import CachedEmbeddings, EmbeddingCache, text_key
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append([text])
+        return [float(len(text)), 1.5]
+
+
+def test_documents_embedded_once(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingCache(tmp_path / "cache.sqlite3"), "nomic-embed-text")
+
+    first = embeddings.embed_documents(["catering", "dj", "catering"])
+    second = embeddings.embed_documents(["dj", "venue"])
+
+    assert first == [[8.0, 0.5], [2.0, 0.5], [8.0, 0.5]]
+    assert second == [[2.0, 0.5], [5.0, 0.5]]
+    assert model.calls == [["catering", "dj"], ["venue"]]
+
+
+def test_repeated_query_skips_model(tmp_path):
+    model = CountingEmbeddings()
+    embeddings = CachedEmbeddings(model, EmbeddingCache(tmp_path / "cache.sqlite3"), "nomic-embed-text")
+
+    assert embeddings.embed_query("DJ under 50000") == embeddings.embed_query("DJ under 50000")
+    assert model.calls == [["DJ under 50000"]]
+
+
+def test_model_namespace_isolates_vectors(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    CachedEmbeddings(CountingEmbeddings(), cache, "nomic-embed-text").embed_query("wedding")
+
+    other = CountingEmbeddings()
+    CachedEmbeddings(other, cache, "mxbai-embed-large").embed_query("wedding")
+    assert other.calls == [["wedding"]]
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=2)
+    cache.put_many("m", {"a": [1.0]})
+    cache.put_many("m", {"b": [2.0]})
+    cache.get_many("m", ["a"])
+    cache.put_many("m", {"c": [3.0]})
+
+    assert len(cache) == 2
+    assert set(cache.get_many("m", ["a", "b", "c"])) == {"a", "c"}
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    EmbeddingCache(path).put_many("m", {text_key("doc", "x"): [0.25, 0.75]})
+    assert EmbeddingCache(path).get_many("m", [text_key("doc", "x")]) == {text_key("doc", "x"): [0.25, 0.75]}
@@ -1,26 +1,30 @@
 import sys
 import os
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-sys.modules["fastapi"] = MagicMock()
-sys.modules["pydantic"] = MagicMock()
-sys.modules["app.rag.retriever"] = MagicMock()
-sys.modules["app.rules.loader"] = MagicMock()
-sys.modules["app.rules.engine"] = MagicMock()
-sys.modules["app.catalog.client"] = MagicMock()
-sys.modules["app.rules.budget_policy"] = MagicMock()
-sys.modules["app.catalog.filter"] = MagicMock()
-sys.modules["app.rules.services"] = MagicMock()
-sys.modules["app.rules.budget_amounts"] = MagicMock()
-sys.modules["app.rules.budget_distribution"] = MagicMock()
-sys.modules["app.rules.budget_calculator"] = MagicMock()
-sys.modules["app.llm.explainer"] = MagicMock()
-sys.modules["app.catalog.ranker"] = MagicMock()
-sys.modules["app.explanations.templates"] = MagicMock()
+MOCKED_MODULES = [
+    "fastapi",
+    "pydantic",
+    "app.rag.retriever",
+    "app.rules.loader",
+    "app.rules.engine",
+    "app.catalog.client",
+    "app.rules.budget_policy",
+    "app.catalog.filter",
+    "app.rules.services",
+    "app.rules.budget_amounts",
+    "app.rules.budget_distribution",
+    "app.rules.budget_calculator",
+    "app.llm.explainer",
+    "app.catalog.ranker",
+    "app.explanations.templates",
+]
 
-from app.api.planner import extract_plan_context, extract_context
+# Keep the stubs scoped to this import so other test modules see the real packages
+with patch.dict(sys.modules, {name: MagicMock() for name in MOCKED_MODULES}):
+    from app.api.planner import extract_plan_context, extract_context
 
 def test_city_detection():
     print("Testing city detection...")
@@ -0,0 +1,82 @@
+"""
+Tests for the BM25 index and hybrid (lexical + vector) retrieval.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+
+from app.rag import retriever
+from app.rag.index_store import load_index, sync_index
+from app.rag.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+from test_rag_index import CountingEmbeddings
+
+
+class QueryCountingEmbeddings(CountingEmbeddings):
+    def __init__(self):
+        super().__init__()
+        self.queries = []
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return super().embed_query(text)
+
+
+def make_docs():
+    return [
+        Document(page_content="SERVICE CATEGORY: Catering buffet menus", metadata={"doc_id": "category:catering"}),
+        Document(page_content="SERVICE CATEGORY: DJ sound and music", metadata={"doc_id": "category:dj"}),
+        Document(page_content="EVENT_TYPE: Wedding under 3 lakhs, DJ not recommended"),
+    ]
+
+
+def test_bm25_ranks_exact_terms_first():
+    index = BM25Index({doc.metadata.get("doc_id", "kb"): doc for doc in make_docs()})
+
+    hits = index.search("DJ under 50000", k=3)
+    assert [doc_id for doc_id, _ in hits][:2] == ["kb", "category:dj"]
+    assert index.search("karaoke") == []
+    assert tokenize("Find a DJ for the party") == ["dj", "party"]
+
+
+def test_keyword_query_detection():
+    index = BM25Index({doc.metadata.get("doc_id", "kb"): doc for doc in make_docs()})
+
+    assert index.is_keyword_query("DJ under 50000")
+    assert not index.is_keyword_query("somebody to play songs at my wedding")
+    assert not index.is_keyword_query("50000")
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]])
+    assert fused[0] == "b"
+    assert set(fused) == {"a", "b", "c", "d"}
+
+
+def use_index(monkeypatch, tmp_path, embeddings):
+    sync_index(make_docs(), embeddings, path=tmp_path)
+    monkeypatch.setattr(retriever, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(retriever, "load_index", lambda emb: load_index(emb, path=tmp_path))
+    monkeypatch.setattr(retriever, "_vectorstore", None)
+    monkeypatch.setattr(retriever, "_lexical", None)
+
+
+def test_keyword_query_skips_the_embedding_call(tmp_path, monkeypatch):
+    embeddings = QueryCountingEmbeddings()
+    use_index(monkeypatch, tmp_path, embeddings)
+
+    docs = retriever.hybrid_search("catering buffet")
+    assert docs[0].metadata["doc_id"] == "category:catering"
+    assert embeddings.queries == []
+
+
+def test_free_text_query_fuses_vector_results(tmp_path, monkeypatch):
+    embeddings = QueryCountingEmbeddings()
+    use_index(monkeypatch, tmp_path, embeddings)
+
+    docs = retriever.hybrid_search("who can handle sound for a big night", k=3)
+    assert embeddings.queries == ["who can handle sound for a big night"]
+    assert docs[0].metadata["doc_id"] == "category:dj"
+    assert len(docs) == 3
+    assert len({doc.page_content for doc in docs}) == 3
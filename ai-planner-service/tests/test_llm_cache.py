@@ -0,0 +1,109 @@
+"""
+Tests for the planner LLM response cache.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.llm import planner_llm
+from app.llm.cache import ResponseCache, normalize_prompt
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeLLM:
+    model = "qwen:0.5b"
+    temperature = 0.1
+
+    def __init__(self, content):
+        self.content = content
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return FakeResponse(self.content)
+
+
+def test_prompt_normalization_and_model_in_key():
+    cache = ResponseCache()
+    cache.set("Plan   a\n wedding ", "qwen:0.5b", 0.1, "answer")
+
+    assert normalize_prompt("Plan   a\n wedding ") == "Plan a wedding"
+    assert cache.get("Plan a wedding", "qwen:0.5b", 0.1) == "answer"
+    assert cache.get("Plan a wedding", "llama3", 0.1) is None
+    assert cache.get("Plan a wedding", "qwen:0.5b", 0.7) is None
+
+
+def test_ttl_and_size_bound():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, max_entries=2, clock=clock)
+    cache.set("a", "m", 0.1, 1)
+    cache.set("b", "m", 0.1, 2)
+    cache.set("c", "m", 0.1, 3)
+
+    assert cache.get("a", "m", 0.1) is None
+    assert cache.get("c", "m", 0.1) == 3
+    clock.now = 11
+    assert cache.get("c", "m", 0.1) is None
+
+
+def test_similarity_reuses_nearby_budget():
+    cache = ResponseCache(similarity=True, budget_tolerance=0.1)
+    cache.set_distribution("m", "Wedding", 300000, {"catering": 45})
+
+    assert cache.get_similar_distribution("m", "wedding", 310000) == {"catering": 45}
+    assert cache.get_similar_distribution("m", "wedding", 400000) is None
+    assert cache.get_similar_distribution("m", "birthday", 300000) is None
+
+
+def test_budget_distribution_served_from_cache(monkeypatch):
+    fake = FakeLLM('{"catering": 50, "venue": 50}')
+    monkeypatch.setattr(planner_llm, "llm", fake)
+    monkeypatch.setattr(planner_llm, "response_cache", ResponseCache())
+
+    first = planner_llm.get_budget_distribution("Wedding", 300000)
+    second = planner_llm.get_budget_distribution("Wedding", 300000)
+
+    assert first == second
+    assert first["catering"] == 50 and first["dj"] == 0
+    assert len(fake.prompts) == 1
+
+
+def test_unparseable_response_is_not_cached(monkeypatch):
+    fake = FakeLLM("I cannot help with that")
+    monkeypatch.setattr(planner_llm, "llm", fake)
+    monkeypatch.setattr(planner_llm, "response_cache", ResponseCache())
+
+    planner_llm.get_budget_distribution("Wedding", 300000)
+    planner_llm.get_budget_distribution("Wedding", 300000)
+    assert len(fake.prompts) == 2
+
+
+def test_batched_selection_validates_each_category(monkeypatch):
+    """Picks with unknown product ids or a bad shape are dropped so callers can fall back."""
+    fake = FakeLLM('{"catering": {"product_id": 2, "reason": "Great value"}, "dj": {"product_id": 99}, "venue": "hall"}')
+    monkeypatch.setattr(planner_llm, "llm", fake)
+    monkeypatch.setattr(planner_llm, "response_cache", ResponseCache())
+
+    categories = {
+        "catering": {"category_budget": 50000, "products": [{"id": 1, "name": "A", "price": 1}, {"id": 2, "name": "B", "price": 2}]},
+        "dj": {"category_budget": 20000, "products": [{"id": 3, "name": "C", "price": 3}]},
+        "venue": {"category_budget": 90000, "products": [{"id": 4, "name": "D", "price": 4}]},
+    }
+    picks = planner_llm.select_best_products("Wedding", 300000, 100, categories)
+
+    assert list(picks) == ["catering"]
+    assert picks["catering"]["product"]["id"] == 2
+    assert picks["catering"]["reason"] == "Great value"
+    assert len(fake.prompts) == 1
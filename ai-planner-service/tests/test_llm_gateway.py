@@ -0,0 +1,91 @@
+"""
+Tests for the shared LLM gateway: limits, lanes and fallbacks.
+"""
+import threading
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.llm.gateway import LLMGateway, LLMBusyError, LLMQueueTimeoutError
+
+
+class BlockingLLM:
+    """Holds every call until released, recording the order prompts ran in."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.order = []
+
+    def invoke(self, prompt):
+        self.order.append(prompt)
+        self.release.wait(5)
+        return prompt
+
+
+def start(gateway, prompt, lane):
+    thread = threading.Thread(target=gateway.invoke, args=(prompt,), kwargs={"lane": lane}, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_full_queue_is_rejected_fast():
+    llm = BlockingLLM()
+    gateway = LLMGateway(llm, max_concurrency=1, max_queue=1, queue_timeout=5)
+    threads = [start(gateway, "running", "planning")]
+    wait_for(lambda: gateway.stats()["active"] == 1)
+    threads.append(start(gateway, "queued", "planning"))
+    wait_for(lambda: gateway.stats()["queued"] == 1)
+
+    started = time.monotonic()
+    with pytest.raises(LLMBusyError):
+        gateway.invoke("overflow")
+    assert time.monotonic() - started < 0.5
+
+    llm.release.set()
+    for thread in threads:
+        thread.join(2)
+    assert gateway.stats()["lanes"]["planning"]["rejected"] == 1
+
+
+def test_planning_lane_runs_before_background():
+    """When a slot frees up, the planning caller goes ahead of earlier background ones."""
+    llm = BlockingLLM()
+    gateway = LLMGateway(llm, max_concurrency=1, max_queue=10, queue_timeout=5)
+    threads = [start(gateway, "first", "planning")]
+    wait_for(lambda: gateway.stats()["active"] == 1)
+    threads.append(start(gateway, "explain", "background"))
+    wait_for(lambda: gateway.stats()["queued"] == 1)
+    threads.append(start(gateway, "plan", "planning"))
+    wait_for(lambda: gateway.stats()["queued"] == 2)
+
+    llm.release.set()
+    for thread in threads:
+        thread.join(2)
+    assert llm.order == ["first", "plan", "explain"]
+
+
+def test_queue_wait_times_out():
+    llm = BlockingLLM()
+    gateway = LLMGateway(llm, max_concurrency=1, max_queue=10, queue_timeout=0.1)
+    thread = start(gateway, "running", "planning")
+    wait_for(lambda: gateway.stats()["active"] == 1)
+
+    with pytest.raises(LLMQueueTimeoutError):
+        gateway.invoke("late", lane="background")
+
+    llm.release.set()
+    thread.join(2)
+    stats = gateway.stats()
+    assert stats["queued"] == 0 and stats["active"] == 0
+    assert stats["lanes"]["background"]["queue_timeouts"] == 1
+    assert stats["lanes"]["planning"]["calls"] == 1
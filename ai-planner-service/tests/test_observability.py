@@ -0,0 +1,84 @@
+"""
+Tests for stage histograms, the Prometheus exposition and sampled debug logging.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app import observability
+from app.api import planner
+from app.observability import Histogram, span, stage_duration
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="fetch")
+    histogram.observe(0.5, stage="fetch")
+    histogram.observe(5, stage="fetch")
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="fetch",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{stage="fetch",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{stage="fetch",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="fetch"} 3' in lines
+    assert histogram.samples(stage="fetch")[0] == 3
+
+
+def test_span_records_failures_separately():
+    before = stage_duration.samples(stage="unit_test_stage", outcome="error")[0]
+    with pytest.raises(ValueError):
+        with span("unit_test_stage"):
+            raise ValueError("boom")
+
+    assert stage_duration.samples(stage="unit_test_stage", outcome="error")[0] == before + 1
+    assert 'stage="unit_test_stage",outcome="error"' in observability.render_metrics()
+
+
+def test_debug_logging_is_sampled(monkeypatch):
+    assert observability.DEBUG_SAMPLE_RATE == 0
+    assert not observability.sample_debug()
+
+    monkeypatch.setattr(observability, "DEBUG_SAMPLE_RATE", 1.0)
+    assert observability.sample_debug()
+    assert observability.debug_enabled()
+
+
+def test_plan_records_each_stage(monkeypatch, capsys, fake_fetch, fail_llm):
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "get_budget_distribution", fail_llm)
+    stages = ("context", "distribution_rules", "fetch", "filter", "selection_rules", "response_build")
+    before = {stage: stage_duration.samples(stage=stage, outcome="ok")[0] for stage in stages}
+
+    payload = planner.PlanRequest(
+        question="wedding under 3 lakh",
+        preferences=planner.UserPreferences(categories=["catering", "dj"]),
+    )
+    result = asyncio.run(planner.plan(payload, mode="fast"))
+
+    assert len(result["plan"]) == 2
+    after = {stage: stage_duration.samples(stage=stage, outcome="ok")[0] for stage in stages}
+    assert after["fetch"] - before["fetch"] == 2
+    assert all(after[stage] > before[stage] for stage in stages)
+    assert observability.request_duration.samples(endpoint="plan", mode="fast", outcome="ok")[0] >= 1
+    assert "Extracted context" not in capsys.readouterr().out, "Payload dumps are off by default"
+
+
+def test_plan_stream_is_timed_as_a_request(monkeypatch, fake_fetch, fail_llm):
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "get_budget_distribution", fail_llm)
+    before = observability.request_duration.samples(endpoint="plan_stream", mode="fast", outcome="ok")[0]
+
+    async def consume():
+        payload = planner.PlanRequest(
+            question="wedding under 3 lakh",
+            preferences=planner.UserPreferences(categories=["catering", "dj"]),
+        )
+        return [chunk async for chunk in planner.stream_plan_events(payload, "fast")]
+
+    chunks = asyncio.run(consume())
+
+    assert chunks[-1].startswith("event: summary")
+    assert observability.request_duration.samples(endpoint="plan_stream", mode="fast", outcome="ok")[0] == before + 1
@@ -0,0 +1,218 @@
+"""
+Tests for the concurrent per-category plan pipeline.
+"""
+import asyncio
+import json
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import planner
+from app.llm import planner_llm
+from app.llm.cache import ResponseCache
+from app.llm.gateway import LLMBusyError
+
+
+def fake_select(event_type, total_budget, guests, category, category_budget, products):
+    if category == "dj":
+        time.sleep(0.5)
+    return {"product": products[-1], "reason": f"LLM pick for {category}"}
+
+
+def test_slow_category_falls_back_to_ranker(monkeypatch, fake_fetch):
+    """A category that misses its timeout gets a deterministic pick, others keep the LLM pick."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "select_best_product", fake_select)
+    monkeypatch.setattr(planner, "CATEGORY_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(planner, "BATCH_SELECTION", False)
+
+    jobs = [
+        {"service": "catering", "category_budget": 40000},
+        {"service": "dj", "category_budget": 20000},
+    ]
+    items = asyncio.run(planner.run_category_pipelines(jobs, "wedding", 300000, 100, "balanced"))
+
+    assert [i["service"] for i in items] == ["catering", "dj"], "Results should keep category order"
+    assert items[0]["ai_pick"] is True
+    assert items[0]["recommended_product"]["id"] == 2
+
+    assert items[1]["ai_pick"] is False
+    assert items[1]["recommended_product"]["id"] == 4, "Ranker should prefer the cheaper DJ"
+
+
+def test_plan_deadline_bounds_total_time(monkeypatch, fake_fetch):
+    """The plan deadline caps the whole fan-out even when per-category timeouts are longer."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "select_best_product", fake_select)
+    monkeypatch.setattr(planner, "CATEGORY_TIMEOUT_SECONDS", 5)
+    monkeypatch.setattr(planner, "PLAN_DEADLINE_SECONDS", 0.2)
+
+    jobs = [{"service": "dj", "category_budget": 20000}]
+
+    async def timed():
+        start = time.perf_counter()
+        items = await planner.run_category_pipelines(jobs, "wedding", 300000, 100, "balanced")
+        return items, time.perf_counter() - start
+
+    items, elapsed = asyncio.run(timed())
+    assert elapsed < 0.45
+    assert items[0]["ai_pick"] is False
+
+
+def test_batched_selection_with_per_category_fallback(monkeypatch, fake_fetch):
+    """One batched call covers most categories; an invalid pick retries the single-call path."""
+    batch_calls, single_calls = [], []
+
+    def fake_batch(event_type, total_budget, guests, categories):
+        batch_calls.append(sorted(categories))
+        products = categories["catering"]["products"]
+        return {"catering": {"product": products[0], "reason": "Batched pick"}}
+
+    def fake_single(event_type, total_budget, guests, category, category_budget, products):
+        single_calls.append(category)
+        return {"product": products[0], "reason": "Single pick"}
+
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "select_best_products", fake_batch)
+    monkeypatch.setattr(planner, "select_best_product", fake_single)
+    monkeypatch.setattr(planner, "BATCH_SELECTION", True)
+
+    jobs = [
+        {"service": "catering", "category_budget": 40000},
+        {"service": "dj", "category_budget": 20000},
+    ]
+    items = asyncio.run(planner.run_category_pipelines(jobs, "wedding", 300000, 100, "balanced"))
+
+    assert batch_calls == [["catering", "dj"]]
+    assert single_calls == ["dj"]
+    assert [(i["service"], i["reason"]) for i in items] == [("catering", "Batched pick"), ("dj", "Single pick")]
+
+
+def test_failed_batch_falls_back_to_single_calls(monkeypatch, fake_fetch):
+    def broken_batch(*args):
+        raise ValueError("Could not parse JSON from LLM response")
+
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "select_best_products", broken_batch)
+    monkeypatch.setattr(planner, "select_best_product", lambda **kw: {"product": kw["products"][0], "reason": "Single pick"})
+    monkeypatch.setattr(planner, "BATCH_SELECTION", True)
+
+    jobs = [
+        {"service": "catering", "category_budget": 40000},
+        {"service": "dj", "category_budget": 20000},
+    ]
+    items = asyncio.run(planner.run_category_pipelines(jobs, "wedding", 300000, 100, "balanced"))
+    assert [i["reason"] for i in items] == ["Single pick", "Single pick"]
+
+
+def test_fast_mode_plans_without_llm(monkeypatch, fake_fetch, fail_llm):
+    """mode=fast builds the plan from rule tables and the ranker alone."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "get_budget_distribution", fail_llm)
+    monkeypatch.setattr(planner, "select_best_product", fail_llm)
+    monkeypatch.setattr(planner, "select_best_products", fail_llm)
+
+    payload = planner.PlanRequest(
+        question="wedding under 3 lakh",
+        preferences=planner.UserPreferences(categories=["catering", "dj"]),
+    )
+    result = asyncio.run(planner.plan(payload, mode="fast"))
+
+    assert result["budget_breakdown"]["catering"]["percent"] == 45
+    assert [i["service"] for i in result["plan"]] == ["catering", "dj"]
+    assert result["plan"][0]["reason"] == "Essential service", "Rule reason should be used"
+    assert all(i["ai_pick"] is False for i in result["plan"])
+
+
+def test_fast_mode_skips_rule_excluded_service(monkeypatch, fake_fetch):
+    """A category the YAML rules mark as not recommended is left out of the plan."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    rules = planner.CompiledRuleSet("wedding", [{
+        "id": "X", "priority": 1,
+        "conditions": {"service": "dj"},
+        "decision": {"recommended": False, "reason": "No DJ"},
+    }])
+    monkeypatch.setattr(planner.rule_registry, "get", lambda event_type: rules)
+
+    jobs = [
+        {"service": "catering", "category_budget": 40000},
+        {"service": "dj", "category_budget": 20000},
+    ]
+    items = asyncio.run(planner.run_fast_pipelines(jobs, "wedding", "under_3_lakhs", "balanced"))
+
+    assert [i["service"] for i in items] == ["catering"]
+
+
+def test_hybrid_mode_keeps_rule_reason_on_timeout(monkeypatch, fake_fetch):
+    """Hybrid reasons come from the LLM when it answers in time, rules otherwise."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "HYBRID_REASON_DEADLINE_SECONDS", 0.2)
+
+    def fake_explain(service, recommended, reason, budget):
+        if service == "dj":
+            time.sleep(0.5)
+        return f"LLM says {service}"
+
+    monkeypatch.setattr(planner, "explain_service", fake_explain)
+
+    payload = planner.PlanRequest(
+        question="wedding under 3 lakh",
+        preferences=planner.UserPreferences(categories=["catering", "dj"]),
+    )
+    result = asyncio.run(planner.plan(payload, mode="hybrid"))
+
+    reasons = {i["service"]: i["reason"] for i in result["plan"]}
+    assert reasons["catering"] == "LLM says catering"
+    assert reasons["dj"] == "Budget DJ included"
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_plan_stream_sends_budget_items_then_summary(monkeypatch, fake_fetch):
+    """The stream opens with the budget, emits fast categories first and ends with a summary."""
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "select_best_product", fake_select)
+    monkeypatch.setattr(planner, "get_budget_distribution", lambda event_type, total_budget: {"catering": 60, "dj": 40})
+
+    app = FastAPI()
+    app.include_router(planner.router)
+    response = TestClient(app).post("/plan/stream", json={"question": "wedding 3 lakh", "preferences": {"categories": ["dj", "catering"]}})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [name for name, _ in events] == ["budget", "item", "item", "summary"]
+    assert events[0][1]["budget_breakdown"]["catering"]["amount"] == 180000
+    assert events[1][1]["service"] == "catering", "The slow DJ pick should arrive last"
+    assert events[2][1]["index"] == 0
+    assert events[3][1]["services"] == ["dj", "catering"], "Summary keeps the requested order"
+
+
+def test_gateway_rejection_uses_fallbacks_not_ai_picks(monkeypatch, fake_fetch):
+    """A shed LLM call goes to the rule split and the ranker, never to an ai_pick."""
+    def busy(*args, **kwargs):
+        raise LLMBusyError("LLM queue full (16 waiting)")
+
+    monkeypatch.setattr(planner_llm, "response_cache", ResponseCache())
+    monkeypatch.setattr(planner_llm.gateway, "invoke", busy)
+    monkeypatch.setattr(planner, "afetch_products", fake_fetch)
+    monkeypatch.setattr(planner, "BATCH_SELECTION", False)
+
+    payload = planner.PlanRequest(
+        question="wedding under 3 lakh",
+        preferences=planner.UserPreferences(categories=["catering", "dj"]),
+    )
+    result = asyncio.run(planner.plan(payload, mode="llm"))
+
+    assert result["budget_breakdown"]["catering"]["percent"] == 45, "Rule table split expected"
+    assert [i["service"] for i in result["plan"]] == ["catering", "dj"]
+    assert all(i["ai_pick"] is False for i in result["plan"])
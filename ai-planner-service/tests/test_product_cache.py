@@ -0,0 +1,107 @@
+"""
+Tests for the category product cache and its event-driven invalidation.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.catalog import client, events
+from app.catalog.cache import ProductCache, FRESH, STALE, MISS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_then_stale_then_miss():
+    clock = FakeClock()
+    cache = ProductCache(ttl=10, stale=20, max_entries=4, clock=clock)
+    cache.set("sound-music", [{"id": 1}])
+
+    assert cache.get("sound-music") == ([{"id": 1}], FRESH)
+    clock.now = 15
+    assert cache.get("sound-music") == ([{"id": 1}], STALE)
+    clock.now = 31
+    assert cache.get("sound-music") == (None, MISS)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_lru_bound_evicts_least_recently_used():
+    cache = ProductCache(ttl=10, stale=0, max_entries=2)
+    cache.set("a", [{"id": 1}])
+    cache.set("b", [{"id": 2}])
+    cache.get("a")
+    cache.set("c", [{"id": 3}])
+
+    assert cache.get("b")[1] == MISS
+    assert cache.get("a")[1] == FRESH
+    assert cache.stats()["evictions"] == 1
+
+
+def test_returned_products_are_copies():
+    cache = ProductCache()
+    cache.set("a", [{"id": 1, "image": "x.jpg"}])
+    products, _ = cache.get("a")
+    products[0]["image"] = "/media/x.jpg"
+    assert cache.get("a")[0][0]["image"] == "x.jpg"
+
+
+def test_approval_event_evicts_affected_categories(monkeypatch):
+    cache = ProductCache()
+    monkeypatch.setattr(events, "product_cache", cache)
+    cache.set("sound-music", [{"id": 1}])
+    cache.set("catering-food", [{"id": 2}])
+
+    events.handle_event({
+        "event_type": "PRODUCT_APPROVED",
+        "payload": {"product_id": 9, "category_slugs": ["sound-music"]},
+    })
+
+    assert cache.get("sound-music")[1] == MISS
+    assert cache.get("catering-food")[1] == FRESH
+
+
+def test_rejection_event_without_slugs_uses_product_index(monkeypatch):
+    cache = ProductCache()
+    monkeypatch.setattr(events, "product_cache", cache)
+    cache.set("sound-music", [{"id": 1}])
+    cache.set("catering-food", [{"id": 2}])
+
+    events.handle_event({"event_type": "PRODUCT_REJECTED", "payload": {"product_id": 2}})
+
+    assert cache.get("catering-food")[1] == MISS
+    assert cache.get("sound-music")[1] == FRESH
+
+
+def test_stale_entry_is_served_and_refreshed(monkeypatch):
+    clock = FakeClock()
+    cache = ProductCache(ttl=10, stale=60, clock=clock)
+    monkeypatch.setattr(client, "product_cache", cache)
+    downloads = []
+
+    async def fake_download(slug):
+        downloads.append(slug)
+        return [{"id": len(downloads)}]
+
+    monkeypatch.setattr(client, "download_products", fake_download)
+
+    async def run():
+        first = await client.afetch_products("dj")
+        clock.now = 20
+        stale = await client.afetch_products("dj")
+        await asyncio.gather(*client._refreshing.values())
+        refreshed = await client.afetch_products("dj")
+        return first, stale, refreshed
+
+    first, stale, refreshed = asyncio.run(run())
+    assert first == [{"id": 1}]
+    assert stale == [{"id": 1}], "Stale entries are served while revalidating"
+    assert refreshed == [{"id": 2}]
+    assert downloads == ["sound-music", "sound-music"]
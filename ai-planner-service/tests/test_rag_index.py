@@ -0,0 +1,183 @@
+"""
+Tests for the persisted FAISS index and its content-hash manifest.
+"""
+import hashlib
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from app.rag import index_store
+from app.rag import retriever
+from app.rag.index_store import load_index, read_manifest, sync_index, update_index
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic 8-dim vectors derived from the text hash."""
+
+    def __init__(self):
+        self.embedded = []
+
+    def _vector(self, text):
+        digest = hashlib.sha256(text.encode()).digest()
+        return [b / 255 for b in digest[:8]]
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def make_docs(dj_text="DJ services for parties"):
+    return [
+        Document(page_content="Wedding catering under 3 lakhs"),
+        Document(page_content=dj_text, metadata={"doc_id": "category:dj"}),
+    ]
+
+
+def test_build_persists_index_and_manifest(tmp_path):
+    embeddings = CountingEmbeddings()
+    _, changed = sync_index(make_docs(), embeddings, path=tmp_path)
+
+    assert changed
+    manifest = read_manifest(tmp_path)
+    assert set(manifest["documents"]) >= {"category:dj"}
+    assert len(manifest["documents"]) == 2
+
+    vectorstore, _ = load_index(embeddings, path=tmp_path)
+    assert vectorstore.index.ntotal == 2
+    assert vectorstore.similarity_search("DJ services for parties", k=1)[0].page_content == "DJ services for parties"
+
+
+def test_sync_only_reembeds_changed_documents(tmp_path):
+    sync_index(make_docs(), CountingEmbeddings(), path=tmp_path)
+
+    embeddings = CountingEmbeddings()
+    _, changed = sync_index(make_docs(), embeddings, path=tmp_path)
+    assert not changed
+    assert embeddings.embedded == []
+
+    _, changed = sync_index(make_docs("DJ and karaoke services"), embeddings, path=tmp_path)
+    assert changed
+    assert embeddings.embedded == ["DJ and karaoke services"]
+
+    vectorstore, _ = load_index(embeddings, path=tmp_path)
+    assert vectorstore.index.ntotal == 2
+
+
+def test_model_change_triggers_full_rebuild(tmp_path, monkeypatch):
+    sync_index(make_docs(), CountingEmbeddings(), path=tmp_path)
+
+    monkeypatch.setattr(index_store, "EMBEDDING_MODEL", "mxbai-embed-large")
+    embeddings = CountingEmbeddings()
+    sync_index(make_docs(), embeddings, path=tmp_path)
+
+    assert len(embeddings.embedded) == 2
+    assert read_manifest(tmp_path)["embedding_model"] == "mxbai-embed-large"
+
+
+def category_event(event_type, slug, name, is_active=True, previous_slug=None):
+    return {
+        "event_type": event_type,
+        "vendor_id": None,
+        "payload": {"slug": slug, "name": name, "is_active": is_active, "previous_slug": previous_slug},
+    }
+
+
+def test_update_index_embeds_only_the_changed_document(tmp_path):
+    sync_index(make_docs(), CountingEmbeddings(), path=tmp_path)
+
+    embeddings = CountingEmbeddings()
+    doc = Document(page_content="Florists and stage flowers", metadata={"doc_id": "category:flowers"})
+    _, changed = update_index([doc], [], embeddings, path=tmp_path)
+
+    assert changed
+    assert embeddings.embedded == ["Florists and stage flowers"]
+    vectorstore, manifest = load_index(embeddings, path=tmp_path)
+    assert vectorstore.index.ntotal == 3
+    assert "category:flowers" in manifest["documents"]
+
+    _, changed = update_index([doc], [], embeddings, path=tmp_path)
+    assert not changed
+
+
+def test_update_index_without_an_index_is_a_noop(tmp_path):
+    vectorstore, changed = update_index([], ["category:dj"], CountingEmbeddings(), path=tmp_path)
+    assert vectorstore is None and not changed
+
+
+def test_category_events_update_the_live_retriever(tmp_path, monkeypatch):
+    """Create, rename and deactivate a category without a full re-sync."""
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(index_store, "RAG_INDEX_DIR", tmp_path)
+    monkeypatch.setattr(retriever, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(retriever, "load_index", lambda emb: load_index(emb, path=tmp_path))
+    monkeypatch.setattr(retriever, "update_index", lambda up, rm, emb: update_index(up, rm, emb, path=tmp_path))
+    monkeypatch.setattr(retriever, "_vectorstore", None)
+    sync_index(make_docs(), embeddings, path=tmp_path)
+
+    assert retriever.apply_category_event(category_event("CATEGORY_CREATED", "florists", "Florists"))
+    assert "category:florists" in read_manifest(tmp_path)["documents"]
+    assert retriever._vectorstore.index.ntotal == 3
+
+    retriever.apply_category_event(category_event("CATEGORY_UPDATED", "flowers", "Flowers", previous_slug="florists"))
+    documents = read_manifest(tmp_path)["documents"]
+    assert "category:flowers" in documents and "category:florists" not in documents
+
+    retriever.apply_category_event(category_event("CATEGORY_UPDATED", "flowers", "Flowers", is_active=False))
+    assert "category:flowers" not in read_manifest(tmp_path)["documents"]
+    assert retriever._vectorstore.index.ntotal == 2
+
+    assert not retriever.apply_category_event({"event_type": "PRODUCT_APPROVED", "payload": {}})
+
+
+def test_category_events_follow_the_full_sync_eligibility(tmp_path, monkeypatch):
+    """Child categories are never indexed; moving a root under a parent drops its document."""
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(retriever, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(retriever, "load_index", lambda emb: load_index(emb, path=tmp_path))
+    monkeypatch.setattr(retriever, "update_index", lambda up, rm, emb: update_index(up, rm, emb, path=tmp_path))
+    monkeypatch.setattr(retriever, "_vectorstore", None)
+    sync_index(make_docs(), embeddings, path=tmp_path)
+
+    child = category_event("CATEGORY_CREATED", "mehendi", "Mehendi")
+    child["payload"]["parent_slug"] = "decor"
+    assert not retriever.apply_category_event(child)
+    assert "category:mehendi" not in read_manifest(tmp_path)["documents"]
+
+    moved = category_event("CATEGORY_UPDATED", "dj", "DJ")
+    moved["payload"]["parent_slug"] = "entertainment"
+    assert retriever.apply_category_event(moved)
+    assert "category:dj" not in read_manifest(tmp_path)["documents"]
+
+
+def test_save_index_replaces_in_place_without_leftovers(tmp_path):
+    path = tmp_path / "rag_index"
+    sync_index(make_docs(), CountingEmbeddings(), path=path)
+    first = index_store.index_version(path)
+
+    sync_index(make_docs("DJ and live band services"), CountingEmbeddings(), path=path)
+
+    assert index_store.index_version(path) != first
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["rag_index", "rag_index.lock"]
+
+
+def test_only_one_process_claims_the_writer_role(tmp_path, monkeypatch):
+    import subprocess
+
+    monkeypatch.setattr(index_store, "_writer_lock_file", None)
+    assert index_store.claim_writer(tmp_path / "rag_index")
+
+    other = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys; from pathlib import Path; from app.rag import index_store; "
+            "sys.exit(0 if index_store.claim_writer(Path(sys.argv[1])) else 3)"
+        ), str(tmp_path / "rag_index")],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert other.returncode == 3
+    index_store._writer_lock_file.close()
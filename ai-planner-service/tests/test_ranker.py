@@ -1,11 +1,13 @@
 """
 Tests for value-based product ranking.
 """
+import random
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.catalog.ranker import rank_products, calculate_value_score
+from app.catalog import ranker
+from app.catalog.ranker import rank_products, rank_products_batch, calculate_value_score
 from app.catalog import vendor_scores
 
 
@@ -77,6 +79,42 @@ def test_tags_assigned_correctly():
     assert tags[3] == "Premium"
 
 
+def make_products(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        # Coarse prices and few vendors so plenty of scores tie
+        products.append({"id": i, "price": rng.choice([100, 250, 500, 700, 1000, 1500, "bad", None]), "vendor_id": rng.randint(1, 20)})
+    return products
+
+
+def test_batch_ranking_matches_scalar(monkeypatch):
+    """The NumPy path returns exactly what the per-product loop returns, ties included."""
+    monkeypatch.setattr(ranker, "BATCH_RANK_THRESHOLD", 10**9)
+    monkeypatch.setattr(vendor_scores, "VENDOR_SCORES", {v: v / 20 for v in range(1, 21, 3)})
+    products = make_products(2000)
+
+    for priority in ("price", "balanced", "quality"):
+        for budget in (0, 800, 1200):
+            expected = rank_products(products, budget_limit=budget, priority=priority)
+            assert rank_products_batch(products, budget_limit=budget, priority=priority) == expected
+            for k in (1, 5, 137):
+                assert rank_products_batch(products, budget_limit=budget, priority=priority, top_k=k) == expected[:k]
+
+
+def test_large_inputs_use_batch_path(monkeypatch):
+    """rank_products hands big candidate lists to the vectorized ranker."""
+    monkeypatch.setattr(ranker, "BATCH_RANK_THRESHOLD", 10)
+    calls = []
+    original = ranker.rank_products_batch
+    monkeypatch.setattr(ranker, "rank_products_batch", lambda *args: calls.append(args) or original(*args))
+
+    ranked = rank_products(make_products(50), budget_limit=1000)
+
+    assert len(calls) == 1
+    assert [p["rank"] for p in ranked] == list(range(1, 51))
+
+
 if __name__ == "__main__":
     test_value_score_calculation()
     test_reputation_affects_ranking()
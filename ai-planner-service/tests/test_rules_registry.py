@@ -0,0 +1,72 @@
+"""
+Tests for the compiled, hot-reloadable rules registry.
+"""
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.rules.engine import evaluate_rules
+from app.rules.loader import load_rules
+from app.rules.registry import CompiledRuleSet, RuleRegistry
+
+
+RULE_FILE = """event_type: gala
+rules:
+  - id: G1
+    priority: 10
+    conditions: {{service: dj}}
+    decision: {{recommended: {dj}, reason: "DJ rule"}}
+"""
+
+
+def write_rules(path, dj="true"):
+    path.write_text(RULE_FILE.format(dj=dj))
+    # Make sure the change is visible to an mtime-based check on coarse filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_compiled_rules_match_evaluate_rules():
+    """Compiled lookups give the same decision as the linear engine for every context."""
+    rules = load_rules("wedding")
+    rng = random.Random(3)
+    for i in range(20):
+        rules.append({
+            "id": f"R{i}",
+            "priority": rng.choice([50, 90, 100]),
+            "conditions": rng.choice([{}, {"service": "dj"}, {"budget": "under_5_lakhs"}, {"budget": "under_3_lakhs", "service": "venue"}]),
+            "decision": {"recommended": rng.random() > 0.5, "reason": f"rule {i}"},
+        })
+    compiled = CompiledRuleSet("wedding", rules)
+
+    for budget in ["under_3_lakhs", "under_5_lakhs", None]:
+        for service in ["dj", "catering", "venue", "lighting", None]:
+            context = {"budget": budget, "service": service}
+            assert compiled.evaluate(context) == evaluate_rules(rules, context), context
+
+
+def test_registry_reloads_changed_files(tmp_path):
+    rule_file = tmp_path / "gala.yaml"
+    write_rules(rule_file, dj="true")
+    registry = RuleRegistry(tmp_path)
+
+    assert registry.evaluate("Gala", {"service": "dj"})["recommended"] is True
+    assert registry.reload_if_changed() is False, "Nothing changed, nothing reloaded"
+
+    write_rules(rule_file, dj="false")
+    assert registry.reload_if_changed() is True
+    assert registry.evaluate("gala", {"service": "dj"})["recommended"] is False
+
+
+def test_invalid_edit_keeps_previous_rules(tmp_path):
+    rule_file = tmp_path / "gala.yaml"
+    write_rules(rule_file)
+    registry = RuleRegistry(tmp_path)
+    assert registry.get("gala") is not None
+
+    rule_file.write_text("event_type: gala\nrules:\n  - id: broken\n")
+    registry.load_all()
+
+    assert registry.evaluate("gala", {"service": "dj"})["reason"] == "DJ rule"
+    assert registry.get("unknown") is None
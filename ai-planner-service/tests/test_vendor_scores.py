@@ -0,0 +1,95 @@
+"""
+Tests for the vendor reputation store behind get_vendor_score.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.catalog import async_client, vendor_scores
+from app.catalog.async_client import AsyncCatalogClient
+from app.catalog.vendor_scores import VendorReputationStore, CORE_SIGNALS, CATALOG_SIGNALS
+
+
+def test_unknown_vendor_is_neutral():
+    store = VendorReputationStore()
+    assert store.score(42) == 0.5
+    assert store.score("not-a-number") == 0.5
+
+
+def test_snapshot_ranks_reliable_vendor_above_unreliable():
+    store = VendorReputationStore()
+    store.load([
+        {"vendor_id": "1", "bookings_approved": 20, "bookings_rejected": 0, "bookings_confirmed": 15, "orders_paid": 15},
+        {"vendor_id": "2", "bookings_approved": 2, "bookings_rejected": 10, "bookings_confirmed": 1, "orders_paid": 1},
+    ], CORE_SIGNALS, "core-service")
+
+    assert store.score(1) > 0.9
+    assert store.score(2) < 0.5
+    assert store.score("1") == store.score(1), "String and int vendor ids share a slot"
+
+
+def test_events_update_scores_incrementally():
+    store = VendorReputationStore()
+    store.apply_event({"event_type": "BOOKING_REJECTED", "vendor_id": "7", "payload": {}})
+    lowered = store.score(7)
+    assert lowered < 0.5
+
+    store.apply_event({"event_type": "SUBORDER_PAID", "vendor_id": "7", "payload": {}})
+    assert store.score(7) > lowered
+    store.apply_event({"event_type": "PRODUCT_CREATED", "vendor_id": 7, "payload": {}})
+    assert store.stats()["vendors"] == 1
+
+
+def test_snapshot_replaces_only_its_own_source():
+    """A catalog re-sync must not wipe counts that came from core-service."""
+    store = VendorReputationStore()
+    store.load([{"vendor_id": 3, "bookings_approved": 10}], CORE_SIGNALS, "core-service")
+    before = store.score(3)
+
+    store.load([{"vendor_id": 3, "products_approved": 4}], CATALOG_SIGNALS, "catalog-service")
+    store.load([{"vendor_id": 3, "products_approved": 4}], CATALOG_SIGNALS, "catalog-service")
+
+    assert store.score(3) > before
+    assert store.vendor_counts(3)["products_approved"] == 4
+
+
+def test_refresh_keeps_working_source_when_other_fails(monkeypatch):
+    def handler(request):
+        if request.url.path.endswith("/internal/vendors/reputation/"):
+            return httpx.Response(500)
+        return httpx.Response(200, json={"results": [{"vendor_id": 5, "products_approved": 0, "products_rejected": 6}]})
+
+    client = AsyncCatalogClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(async_client, "MAX_RETRIES", 0)
+    monkeypatch.setattr(vendor_scores, "get_async_client", lambda: client)
+
+    store = VendorReputationStore()
+    ok = asyncio.run(store.refresh())
+
+    assert ok is False
+    assert store.loaded_sources == {"catalog-service"}
+    assert store.score(5) < 0.5
+
+
+def test_overrides_win_over_store(monkeypatch):
+    monkeypatch.setattr(vendor_scores, "VENDOR_SCORES", {9: 0.95})
+    monkeypatch.setattr(vendor_scores, "reputation_store", VendorReputationStore())
+    vendor_scores.reputation_store.apply_event({"event_type": "BOOKING_REJECTED", "vendor_id": 9})
+    vendor_scores.reputation_store.apply_event({"event_type": "BOOKING_REJECTED", "vendor_id": 10})
+
+    assert vendor_scores.get_vendor_score(9) == 0.95
+    assert vendor_scores.get_vendor_score(10) < 0.5
+
+
+def test_large_vendor_ids_do_not_size_the_arrays():
+    """Storage follows the number of vendors, not the largest id."""
+    store = VendorReputationStore()
+    store.apply_event({"event_type": "BOOKING_APPROVED", "vendor_id": "987654321", "payload": {}})
+    store.load([{"vendor_id": 2**40, "products_approved": 3}], CATALOG_SIGNALS, "catalog-service")
+
+    assert store.stats()["capacity"] <= 64
+    assert store.score(987654321) > 0.5
+    assert store.vendor_counts(2**40)["products_approved"] == 3
@@ -0,0 +1,88 @@
+"""
+Tests for startup warm-up and the /ready probe.
+"""
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app import main, warmup
+from app.warmup import Readiness
+
+
+def stub_steps(monkeypatch, fail_llm=False):
+    async def ok():
+        return True
+
+    def llm():
+        if fail_llm:
+            raise ConnectionError("ollama down")
+
+    monkeypatch.setattr(warmup.category_index, "refresh", ok)
+    monkeypatch.setattr(warmup.reputation_store, "refresh", ok)
+    monkeypatch.setattr(warmup, "load_vectorstore", lambda: None)
+    monkeypatch.setattr(warmup, "warm_llm", llm)
+
+
+def test_ready_only_after_warm_up(monkeypatch):
+    """/ready is 503 while warming up and 200 once every step has run."""
+    state = Readiness()
+    monkeypatch.setattr(warmup, "readiness", state)
+    monkeypatch.setattr(main, "readiness", state)
+    stub_steps(monkeypatch)
+    client = TestClient(main.app)
+
+    assert client.get("/ready").status_code == 503
+    assert client.get("/health").status_code == 200, "Liveness doesn't wait for warm-up"
+
+    asyncio.run(warmup.warm_up())
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert set(response.json()["checks"]) == {"categories", "vendor_reputation", "vector_store", "llm"}
+
+
+def test_failed_step_is_reported_but_does_not_block(monkeypatch):
+    state = Readiness()
+    monkeypatch.setattr(warmup, "readiness", state)
+    stub_steps(monkeypatch, fail_llm=True)
+
+    asyncio.run(warmup.warm_up())
+
+    assert state.ready is True
+    assert state.checks["llm"]["ok"] is False
+    assert "ollama down" in state.checks["llm"]["error"]
+
+
+def test_draining_worker_is_not_ready():
+    state = Readiness()
+    state.ready = True
+    state.draining = True
+    assert state.snapshot()["status"] == "draining"
+
+
+def test_sigterm_reports_draining_before_shutdown(monkeypatch):
+    """SIGTERM flips /ready to draining at once and reaches the server's handler only after the drain delay."""
+    import signal
+
+    state = Readiness()
+    state.ready = True
+    monkeypatch.setattr(warmup, "readiness", state)
+    received = []
+
+    async def scenario():
+        previous = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+        try:
+            assert warmup.install_drain_handler(delay=0.1)
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.sleep(0.02)
+            assert state.draining and not state.ready
+            assert received == []
+            await asyncio.sleep(0.2)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+
+    asyncio.run(scenario())
+    assert received == [signal.SIGTERM]
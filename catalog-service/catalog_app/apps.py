@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CatalogAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'catalog_app'
+
+    def ready(self):
+        from catalog_app import signals  # noqa: F401
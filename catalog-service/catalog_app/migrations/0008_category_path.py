@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+def backfill_category_paths(apps, schema_editor):
+    Category = apps.get_model("catalog_app", "Category")
+
+    parent_of = dict(Category.objects.values_list("id", "parent_id"))
+    paths = {}
+
+    def path_for(category_id):
+        if category_id not in paths:
+            # Walk up iteratively; the tree is shallow but may be wide
+            chain = []
+            current = category_id
+            while current is not None and current not in paths and current not in chain:
+                chain.append(current)
+                current = parent_of.get(current)
+            prefix = paths.get(current, "/")
+            for node in reversed(chain):
+                prefix = f"{prefix}{node}/"
+                paths[node] = prefix
+        return paths[category_id]
+
+    categories = list(Category.objects.only("id", "parent_id"))
+    for category in categories:
+        category.path = path_for(category.id)
+    Category.objects.bulk_update(categories, ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog_app', '0007_alter_delivery_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_category_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['path'], name='category_path_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
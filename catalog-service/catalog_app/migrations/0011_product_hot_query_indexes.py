@@ -0,0 +1,38 @@
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+LIVE_PRODUCT = models.Q(('is_available', True), ('status', 'approved'))
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; building the
+    # indexes this way keeps product writes flowing on a large table
+    atomic = False
+
+    dependencies = [
+        ('catalog_app', '0010_product_search'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=LIVE_PRODUCT, fields=['category', 'created_at', 'id'], name='product_live_category_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=LIVE_PRODUCT, fields=['city', 'created_at', 'id'], name='product_live_city_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=LIVE_PRODUCT, fields=['price', 'id'], name='product_live_price_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['vendor_id'], name='product_vendor_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['status', 'created_at'], name='product_status_created_idx'),
+        ),
+    ]
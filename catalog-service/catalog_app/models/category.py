@@ -1,4 +1,8 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -12,8 +16,62 @@ class Category(models.Model):
     )
     is_active = models.BooleanField(default=True)
 
+    # Materialized path of ids from the root, e.g. "/3/17/42/"; a category and
+    # all its descendants are the rows whose path starts with its own path.
+    # Maintained by save(); queryset.update(parent=...) bypasses it.
+    path = models.CharField(max_length=255, default="", editable=False)
+
     class Meta:
         verbose_name_plural = "Categories"
+        indexes = [
+            # Prefix LIKE needs the pattern opclass under a non-C collation
+            models.Index(fields=["path"], name="category_path_prefix_idx", opclasses=["varchar_pattern_ops"]),
+        ]
 
     def __str__(self):
         return self.name
+
+    def build_path(self):
+        parent_path = "/"
+        if self.parent_id:
+            parent_path = Category.objects.filter(pk=self.parent_id).values_list("path", flat=True).first() or "/"
+        return f"{parent_path}{self.pk}/"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Category.objects.filter(pk=self.pk).values("path", "slug").first()
+            old_path = previous["path"] if previous else None
+            # Read by the post_save signal to report slug renames
+            self._previous_slug = previous["slug"] if previous else None
+
+            if self.pk is None:
+                super().save(*args, **kwargs)
+                self.path = self.build_path()
+                Category.objects.filter(pk=self.pk).update(path=self.path)
+                return
+
+            new_path = self.build_path()
+            if old_path and new_path.startswith(old_path) and new_path != old_path:
+                raise ValidationError("A category cannot be moved under one of its own descendants.")
+
+            self.path = new_path
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and old_path != new_path:
+                kwargs["update_fields"] = {*update_fields, "path"}
+            super().save(*args, **kwargs)
+
+            if old_path and old_path != new_path:
+                # Re-root the whole subtree in one statement
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+                )
+
+    def descendants_and_self(self):
+        return Category.objects.filter(path__startswith=self.path)
+
+    @property
+    def ancestor_ids(self):
+        """Ids from the root down to this category (inclusive)."""
+        return [int(part) for part in self.path.strip("/").split("/") if part]
@@ -1,4 +1,19 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Cast
+
+
+# Every public listing filters on this; the partial indexes below only cover these rows
+LIVE_PRODUCT = models.Q(status="approved", is_available=True)
+
+# Weighted so a hit in the name outranks one in the description or features
+PRODUCT_SEARCH_VECTOR = (
+    SearchVector("name", weight="A", config="english")
+    + SearchVector("description", weight="B", config="english")
+    + SearchVector(Cast("features", models.TextField()), weight="C", config="english")
+)
+
 
 class Product(models.Model):
     name = models.CharField(max_length=255)
@@ -48,6 +63,31 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by Postgres on every write; see catalog_app.services.search
+    search_vector = models.GeneratedField(
+        expression=PRODUCT_SEARCH_VECTOR,
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="product_search_vector_idx"),
+            # Typo-tolerant name matching (pg_trgm `%` operator)
+            GinIndex(fields=["name"], name="product_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+            # Keyset pagination over the public listing (newest first by default)
+            models.Index(fields=["created_at", "id"], name="product_live_created_idx", condition=LIVE_PRODUCT),
+            # Category listings and the category filter, in listing order
+            models.Index(fields=["category", "created_at", "id"], name="product_live_category_idx", condition=LIVE_PRODUCT),
+            models.Index(fields=["city", "created_at", "id"], name="product_live_city_idx", condition=LIVE_PRODUCT),
+            # Price ranges and ?ordering=price
+            models.Index(fields=["price", "id"], name="product_live_price_idx", condition=LIVE_PRODUCT),
+            # Vendor dashboards and the reputation stats aggregate
+            models.Index(fields=["vendor_id"], name="product_vendor_idx"),
+            # Admin moderation queue, newest first per status
+            models.Index(fields=["status", "created_at"], name="product_status_created_idx"),
+        ]
+
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='products/')
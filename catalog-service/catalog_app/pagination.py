@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from catalog_app.permissions import IsInternalService
+
+
+def reverse_ordering(ordering):
+    return tuple(o[1:] if o.startswith("-") else "-" + o for o in ordering)
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    Keyset pagination for product listings.
+
+    Each page is a `WHERE (price, id) > (cursor) ORDER BY price, id LIMIT n`
+    query, so page 1000 costs the same as page 1 and rows inserted while a
+    client walks the listing never shift it. DRF's cursor only remembers the
+    first ordering field and skips ties with an OFFSET; here the position
+    carries the row id too, so runs of equal prices page by index as well.
+
+    `?ordering=` picks one of the whitelisted keys. `?page_size=` can shrink
+    pages for everyone, but only internal services (X-Internal-Token) may
+    ask for up to PRODUCT_MAX_PAGE_SIZE rows.
+    """
+    ORDERINGS = {
+        "-created_at": ("-created_at", "-id"),
+        "created_at": ("created_at", "id"),
+        "price": ("price", "id"),
+        "-price": ("-price", "-id"),
+    }
+
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    page_size_query_param = "page_size"
+    # Public callers never got more than one default page per request
+    max_page_size = page_size
+    service_max_page_size = settings.PRODUCT_MAX_PAGE_SIZE
+    ordering_query_param = "ordering"
+    ordering = ORDERINGS["-created_at"]
+
+    def get_ordering(self, request, queryset, view):
+        return self.ORDERINGS.get(request.query_params.get(self.ordering_query_param), self.ordering)
+
+    def get_page_size(self, request):
+        if IsInternalService().has_permission(request, None):
+            self.max_page_size = self.service_max_page_size
+        return super().get_page_size(request)
+
+    def _get_position_from_instance(self, instance, ordering):
+        value = super()._get_position_from_instance(instance, ordering)
+        pk = instance["id"] if isinstance(instance, dict) else instance.id
+        return f"{value}|{pk}"
+
+    def keyset_filter(self, ordering, position):
+        """Rows strictly after `position` in `ordering`, comparing (field, id) as a pair."""
+        try:
+            value, pk = position.rsplit("|", 1)
+            pk = int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        field, tie_breaker = ordering[0], ordering[1]
+        lookup = "lt" if field.startswith("-") else "gt"
+        field = field.lstrip("-")
+        tie_lookup = "lt" if tie_breaker.startswith("-") else "gt"
+        return Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"id__{tie_lookup}": pk})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Same flow as CursorPagination.paginate_queryset, with a (field, id) filter
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, current_position))
+
+        # Positions are unique, so the offset is always 0 for cursors we issue
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class ProductSearchPagination(PageNumberPagination):
+    """Ranked search results; relevance falls off fast, so pages stay shallow."""
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
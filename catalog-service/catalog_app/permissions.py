@@ -1,3 +1,6 @@
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
 class IsVendor(BasePermission):
@@ -14,4 +17,11 @@ class IsPlatformAdmin(BasePermission):
         return (
             request.user.is_authenticated
             and getattr(request.user, "role", None) == "admin"
-        )
\ No newline at end of file
+        )
+
+class IsInternalService(BasePermission):
+    """Service-to-service calls that present the shared X-Internal-Token."""
+    def has_permission(self, request, view):
+        token = settings.CATALOG_INTERNAL_TOKEN
+        supplied = request.headers.get("X-Internal-Token")
+        return bool(token and supplied) and hmac.compare_digest(supplied, token)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from catalog_app.models import Product, ProductImage
+from catalog_app.serializers.sparse import SparseFieldsMixin
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     image = serializers.ImageField(required=False)
     
     class Meta:
@@ -0,0 +1,19 @@
+def requested_fields(request):
+    """Field names from `?fields=a,b,c` on a GET, or None when the full representation is wanted."""
+    if request is None or request.method != "GET":
+        return None
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Drop every field not listed in `?fields=`; unknown names are ignored."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = requested_fields(self.context.get("request"))
+        if keep:
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
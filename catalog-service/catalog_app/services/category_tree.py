@@ -0,0 +1,60 @@
+"""
+The public category tree, built from one flat query and cached as rendered JSON.
+
+Every planner process and frontend page load reads /categories/, so the tree
+is serialized once and stored as bytes with its ETag. Category writes drop the
+cached copy (see catalog_app.signals); the timeout bounds staleness for
+workers that use a per-process cache.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from catalog_app.models import Category
+
+
+CACHE_KEY = "catalog:category-tree:v1"
+
+
+def build_category_tree():
+    """Active categories nested under their parents; a subtree under an inactive category is hidden."""
+    rows = Category.objects.filter(is_active=True).order_by("id").values("id", "name", "slug", "parent_id")
+
+    nodes = {}
+    for row in rows:
+        nodes[row["id"]] = {
+            "id": row["id"],
+            "name": row["name"],
+            "slug": row["slug"],
+            "parent": row["parent_id"],
+            "children": [],
+        }
+
+    roots = []
+    for node in nodes.values():
+        if node["parent"] is None:
+            roots.append(node)
+        elif node["parent"] in nodes:
+            nodes[node["parent"]]["children"].append(node)
+    return roots
+
+
+def render_category_tree():
+    content = json.dumps(build_category_tree(), separators=(",", ":")).encode("utf-8")
+    etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+    return content, etag
+
+
+def get_category_tree():
+    """(JSON bytes, ETag) from the cache, rebuilding on a miss."""
+    cached = cache.get(CACHE_KEY)
+    if cached is None:
+        cached = render_category_tree()
+        cache.set(CACHE_KEY, cached, settings.CATEGORY_TREE_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_category_tree():
+    cache.delete(CACHE_KEY)
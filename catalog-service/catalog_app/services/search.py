@@ -0,0 +1,47 @@
+"""
+Ranked product search over the generated `search_vector` column.
+
+Full-text matches (GIN on search_vector) and fuzzy name matches (GIN trigram
+on name) are both index lookups, so the cost follows the number of hits, not
+the size of the catalog.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
+
+
+WORD = re.compile(r"\w+")
+
+
+def prefix_query(text):
+    """Every word as a prefix ("cat" -> 'cat':*), so partial words still hit the index; None without words."""
+    words = WORD.findall(text)
+    if not words:
+        return None
+    # \w never matches tsquery operators, so the raw query can't be malformed
+    return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config="english")
+
+
+def search_query(text):
+    # websearch syntax: quoted phrases, OR, -exclusions; never raises on user input
+    query = SearchQuery(text, search_type="websearch", config="english")
+    prefix = prefix_query(text)
+    return query | prefix if prefix is not None else query
+
+
+def filter_search(queryset, text):
+    """
+    Keep products matching `text` by full-text (whole or prefix words) or fuzzy name match (unordered).
+    trigram_similar is pg_trgm's `%` operator, cut off at pg_trgm.similarity_threshold (0.3 by default).
+    """
+    return queryset.filter(Q(search_vector=search_query(text)) | Q(name__trigram_similar=text))
+
+
+def search_products(queryset, text):
+    """Matching products, best first: text rank, then name similarity, then newest."""
+    query = search_query(text)
+    return filter_search(queryset, text).annotate(
+        rank=SearchRank(F("search_vector"), query),
+        similarity=TrigramSimilarity("name", text),
+    ).order_by("-rank", "-similarity", "-id")
@@ -0,0 +1,84 @@
+"""
+Category write hooks: drop the cached category tree and publish CATEGORY_*
+events so downstream indexes (the planner's RAG store) can update a single
+category instead of rebuilding. They go to settings.CATEGORY_EVENT_EXCHANGE,
+not catalog.events, whose consumers expect a vendor on every event.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from catalog_app.models.category import Category
+from catalog_app.services.category_tree import invalidate_category_tree
+from catalog_app.services.events import publish_catalog_event
+
+
+logger = logging.getLogger(__name__)
+
+
+def category_payload(category, previous_slug=None, parent_slug=None):
+    return {
+        "category_id": category.id,
+        "name": category.name,
+        "slug": category.slug,
+        "previous_slug": previous_slug,
+        "is_active": category.is_active,
+        "parent_slug": parent_slug,
+    }
+
+
+def publish_category_event(event_type, payload):
+    def publish():
+        try:
+            publish_catalog_event(
+                event_type=event_type,
+                vendor_id=None,
+                payload=payload,
+                exchange=settings.CATEGORY_EVENT_EXCHANGE,
+            )
+        except Exception:
+            # The category is already saved; the planner's periodic sync picks it up
+            logger.exception("Failed to publish %s for category %s", event_type, payload.get("slug"))
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
+
+    # Category.save() stashes the stored slug while it reads the old path
+    previous_slug = getattr(instance, "_previous_slug", None)
+    if previous_slug == instance.slug:
+        previous_slug = None
+
+    publish_category_event(
+        "CATEGORY_CREATED" if created else "CATEGORY_UPDATED",
+        category_payload(
+            instance,
+            previous_slug,
+            parent_slug=instance.parent.slug if instance.parent_id else None,
+        ),
+    )
+
+
+@receiver(pre_delete, sender=Category)
+def remember_parent_slug(sender, instance, **kwargs):
+    # A cascading delete removes the parent row before post_delete runs for its children
+    instance._parent_slug = None
+    if instance.parent_id:
+        instance._parent_slug = (
+            Category.objects.filter(pk=instance.parent_id).values_list("slug", flat=True).first()
+        )
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
+    publish_category_event(
+        "CATEGORY_DELETED",
+        category_payload(instance, parent_slug=getattr(instance, "_parent_slug", None)),
+    )
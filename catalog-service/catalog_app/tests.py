@@ -1,7 +1,14 @@
 import pytest
+from base64 import b64decode
+from urllib.parse import parse_qs, urlparse
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
+from django.core.exceptions import ValidationError
 from .models.category import Category
+from .models.product import Product
+from .services.category_tree import invalidate_category_tree
+from .utils.categories import get_category_and_descendants, get_category_and_ancestor_slugs
 
 @pytest.mark.django_db
 class TestCategoryListView:
@@ -13,5 +20,287 @@ class TestCategoryListView:
         url = reverse("category-list")
         response = api_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) >= 2
-        assert any(c["name"] == "Electronics" for c in response.data)
+        assert len(response.json()) >= 2
+        assert any(c["name"] == "Electronics" for c in response.json())
+
+    def test_tree_is_built_in_one_query_and_cached(self, api_client, django_assert_num_queries):
+        root = Category.objects.create(name="Music", slug="music")
+        Category.objects.create(name="DJ", slug="dj", parent=root)
+        Category.objects.create(name="Hidden", slug="hidden", parent=root, is_active=False)
+        invalidate_category_tree()
+
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("category-list"))
+        music = next(c for c in response.json() if c["slug"] == "music")
+        assert [c["slug"] for c in music["children"]] == ["dj"]
+
+        with django_assert_num_queries(0):
+            cached = api_client.get(reverse("category-list"))
+        assert cached.content == response.content
+
+    def test_etag_and_invalidation(self, api_client, django_capture_on_commit_callbacks):
+        invalidate_category_tree()
+        url = reverse("category-list")
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Category.objects.create(name="Lighting", slug="lighting")
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert any(c["slug"] == "lighting" for c in response.json())
+
+
+@pytest.mark.django_db
+class TestCategoryEvents:
+    def test_deleting_a_parent_deletes_children_and_publishes_each(
+        self, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        published = []
+        monkeypatch.setattr(
+            "catalog_app.signals.publish_catalog_event",
+            lambda event_type, vendor_id, payload, exchange: published.append((event_type, payload)),
+        )
+        music = Category.objects.create(name="Music", slug="music")
+        Category.objects.create(name="DJ", slug="dj", parent=music)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            music.delete()
+
+        assert not Category.objects.filter(slug__in=["music", "dj"]).exists()
+        deleted = {p["slug"]: p for event, p in published if event == "CATEGORY_DELETED"}
+        assert set(deleted) == {"music", "dj"}
+        assert deleted["dj"]["parent_slug"] == "music"
+
+
+@pytest.mark.django_db
+class TestCategoryPath:
+    def test_paths_follow_the_tree(self):
+        root = Category.objects.create(name="Music", slug="music")
+        child = Category.objects.create(name="DJ", slug="dj", parent=root)
+        grandchild = Category.objects.create(name="Wedding DJ", slug="wedding-dj", parent=child)
+
+        assert root.path == f"/{root.id}/"
+        assert grandchild.path == f"/{root.id}/{child.id}/{grandchild.id}/"
+        assert get_category_and_ancestor_slugs(grandchild) == ["wedding-dj", "dj", "music"]
+
+    def test_descendants_in_one_query(self, django_assert_num_queries):
+        root = Category.objects.create(name="Music", slug="music")
+        child = Category.objects.create(name="DJ", slug="dj", parent=root)
+        grandchild = Category.objects.create(name="Wedding DJ", slug="wedding-dj", parent=child)
+        Category.objects.create(name="Venue", slug="venue")
+
+        with django_assert_num_queries(1):
+            ids = get_category_and_descendants(root)
+        assert sorted(ids) == sorted([root.id, child.id, grandchild.id])
+
+    def test_move_reroots_the_subtree(self):
+        music = Category.objects.create(name="Music", slug="music")
+        venue = Category.objects.create(name="Venue", slug="venue")
+        child = Category.objects.create(name="DJ", slug="dj", parent=music)
+        grandchild = Category.objects.create(name="Wedding DJ", slug="wedding-dj", parent=child)
+
+        child.parent = venue
+        child.save()
+
+        grandchild.refresh_from_db()
+        assert grandchild.path == f"/{venue.id}/{child.id}/{grandchild.id}/"
+        assert get_category_and_descendants(music) == [music.id]
+
+    def test_move_with_update_fields_saves_own_path(self):
+        music = Category.objects.create(name="Music", slug="music")
+        venue = Category.objects.create(name="Venue", slug="venue")
+        child = Category.objects.create(name="DJ", slug="dj", parent=music)
+        grandchild = Category.objects.create(name="Wedding DJ", slug="wedding-dj", parent=child)
+
+        child.parent = venue
+        child.save(update_fields=["parent"])
+
+        child.refresh_from_db()
+        grandchild.refresh_from_db()
+        assert child.path == f"/{venue.id}/{child.id}/"
+        assert grandchild.path == f"/{venue.id}/{child.id}/{grandchild.id}/"
+
+    def test_cannot_move_under_own_descendant(self):
+        root = Category.objects.create(name="Music", slug="music")
+        child = Category.objects.create(name="DJ", slug="dj", parent=root)
+
+        root.parent = child
+        with pytest.raises(ValidationError):
+            root.save()
+
+
+@pytest.mark.django_db
+class TestProductListingPagination:
+    def make_products(self, count, price=None):
+        category = Category.objects.create(name="Music", slug="music")
+        for i in range(count):
+            Product.objects.create(
+                name=f"DJ {i}", description="Long description", price=price or 1000 + i,
+                category=category, vendor_id=1, status=Product.STATUS_APPROVED,
+            )
+        return category
+
+    def test_cursor_walks_every_product_once(self, api_client):
+        self.make_products(25)
+
+        seen, url = [], "/api/catalog/products/?page_size=10"
+        while url:
+            data = api_client.get(url).json()
+            seen.extend(p["id"] for p in data["results"])
+            url = data["next"]
+
+        assert len(seen) == 25 and len(set(seen)) == 25
+
+    def walk(self, api_client, url):
+        pages = []
+        while url:
+            data = api_client.get(url).json()
+            pages.append(data)
+            url = data["next"]
+        return pages
+
+    def test_page_size_is_bounded_and_ordering_whitelisted(self, api_client):
+        self.make_products(15)
+        data = api_client.get("/api/catalog/products/?page_size=100000&ordering=price").json()
+
+        prices = [float(p["price"]) for p in data["results"]]
+        assert prices == sorted(prices)
+        assert len(data["results"]) == 10
+
+    def test_internal_callers_get_large_pages(self, api_client, settings):
+        settings.CATALOG_INTERNAL_TOKEN = "secret"
+        self.make_products(15)
+        url = "/api/catalog/products/?page_size=100000"
+
+        wrong = api_client.get(url, HTTP_X_INTERNAL_TOKEN="guess").json()
+        assert len(wrong["results"]) == 10
+
+        data = api_client.get(url, HTTP_X_INTERNAL_TOKEN="secret").json()
+        assert len(data["results"]) == 15
+
+    def test_cursor_breaks_price_ties_by_id(self, api_client):
+        self.make_products(25, price=5000)
+
+        pages = self.walk(api_client, "/api/catalog/products/?page_size=10&ordering=price")
+        seen = [p["id"] for page in pages for p in page["results"]]
+        assert seen == sorted(seen) and len(set(seen)) == 25
+        # Every cursor is a (price, id) position, never an offset into the tie
+        for page in pages[:-1]:
+            cursor = parse_qs(urlparse(page["next"]).query)["cursor"][0]
+            assert "o=" not in b64decode(cursor).decode()
+
+        back = api_client.get(pages[-1]["previous"]).json()
+        assert [p["id"] for p in back["results"]] == seen[10:20]
+
+    def test_fields_projection(self, api_client):
+        category = self.make_products(3)
+        response = api_client.get(f"/api/catalog/categories/{category.slug}/products/?fields=id,name,price")
+
+        for product in response.json()["results"]:
+            assert set(product) == {"id", "name", "price"}
+
+
+@pytest.mark.django_db
+class TestProductSearch:
+    def make_product(self, name, category, **kwargs):
+        defaults = {"description": "", "price": 10000, "vendor_id": 1, "status": Product.STATUS_APPROVED}
+        defaults.update(kwargs)
+        return Product.objects.create(name=name, category=category, **defaults)
+
+    def test_ranks_name_hits_above_description_hits(self, api_client):
+        music = Category.objects.create(name="Music", slug="music")
+        described = self.make_product("Party package", music, description="Includes a DJ console and speakers")
+        named = self.make_product("Wedding DJ console", music)
+
+        response = api_client.get(reverse("product-search"), {"q": "dj console"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["id"] for p in response.json()["results"]] == [named.id, described.id]
+
+    def test_typos_match_by_trigram(self, api_client):
+        music = Category.objects.create(name="Music", slug="music")
+        photographer = self.make_product("Photographer", music)
+
+        response = api_client.get(reverse("product-search"), {"q": "photografer"})
+        assert [p["id"] for p in response.json()["results"]] == [photographer.id]
+
+    def test_filters_by_price_city_and_category_subtree(self, api_client):
+        music = Category.objects.create(name="Music", slug="music")
+        dj = Category.objects.create(name="DJ", slug="dj", parent=music)
+        venue = Category.objects.create(name="Venue", slug="venue")
+        match = self.make_product("Sound system", dj, price=20000, city="Pune")
+        self.make_product("Sound system deluxe", dj, price=90000, city="Pune")
+        self.make_product("Sound system", dj, price=20000, city="Mumbai")
+        self.make_product("Sound system", venue, price=20000, city="Pune")
+
+        response = api_client.get(reverse("product-search"), {
+            "q": "sound system", "max_price": "50000", "city": "Pune", "category": "music",
+        })
+        assert [p["id"] for p in response.json()["results"]] == [match.id]
+
+    def test_partial_words_match_by_prefix(self, api_client):
+        food = Category.objects.create(name="Food", slug="food")
+        catering = self.make_product("Royal Catering", food)
+        self.make_product("Photo booth", food)
+
+        listed = api_client.get("/api/catalog/products/", {"search": "cat"}).json()["results"]
+        assert [p["id"] for p in listed] == [catering.id]
+
+        ranked = api_client.get(reverse("product-search"), {"q": "roy cat"}).json()["results"]
+        assert [p["id"] for p in ranked] == [catering.id]
+
+    def test_query_is_required_and_prices_validated(self, api_client):
+        assert api_client.get(reverse("product-search")).status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.get(reverse("product-search"), {"q": "dj", "min_price": "cheap"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestHotQueryPlans:
+    """
+    The public listings must stay index scans. Sequential scans are disabled
+    so the planner's choice on a tiny test table reflects what is usable, not
+    what is cheapest for three rows.
+    """
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        assert "Seq Scan on catalog_app_product" not in plan, plan
+        return plan
+
+    def live_products(self):
+        return Product.objects.filter(status=Product.STATUS_APPROVED, is_available=True)
+
+    @pytest.fixture(autouse=True)
+    def products(self):
+        music = Category.objects.create(name="Music", slug="music")
+        dj = Category.objects.create(name="DJ", slug="dj", parent=music)
+        for i in range(3):
+            Product.objects.create(
+                name=f"DJ {i}", price=1000 * i, category=dj, vendor_id=i,
+                city="Pune", status=Product.STATUS_APPROVED,
+            )
+        return music
+
+    def test_category_listing(self, products):
+        self.explain(
+            self.live_products()
+            .filter(category__path__startswith=products.path)
+            .order_by("-created_at", "-id")[:11]
+        )
+
+    def test_city_listing_uses_partial_index(self):
+        plan = self.explain(self.live_products().filter(city="Pune").order_by("-created_at", "-id")[:11])
+        assert "product_live_city_idx" in plan
+
+    def test_price_range_uses_partial_index(self):
+        plan = self.explain(self.live_products().filter(price__lte=5000).order_by("price", "id")[:11])
+        assert "product_live_price_idx" in plan
+
+    def test_vendor_products_use_vendor_index(self):
+        plan = self.explain(Product.objects.filter(vendor_id=1))
+        assert "product_vendor_idx" in plan
@@ -4,11 +4,15 @@ from catalog_app.views.public import (
     ProductByCategoryView,
     ProductDetailView,
     ProductListView,
+    ProductSearchView,
+    VendorProductStatsView,
 )
 
 urlpatterns = [
     path("categories/", CategoryListView.as_view(), name="category-list"),
     path("categories/<slug:slug>/products/", ProductByCategoryView.as_view()),
     path("products/", ProductListView.as_view()),
+    path("products/search/", ProductSearchView.as_view(), name="product-search"),
     path("products/<int:pk>/", ProductDetailView.as_view()),
+    path("vendors/stats/", VendorProductStatsView.as_view(), name="vendor-product-stats"),
 ]
\ No newline at end of file
@@ -1,5 +1,13 @@
+from catalog_app.models import Category
+
+
 def get_category_and_descendants(category):
-    ids = [category.id]
-    for child in category.children.all():
-        ids.extend(get_category_and_descendants(child))
-    return ids
\ No newline at end of file
+    """Ids of the category and its whole subtree, in one indexed prefix query."""
+    return list(category.descendants_and_self().values_list("id", flat=True))
+
+
+def get_category_and_ancestor_slugs(category):
+    """Slugs from the category up to its root, in that order, in one query."""
+    ids = category.ancestor_ids or [category.id]
+    slugs = dict(Category.objects.filter(id__in=ids).values_list("id", "slug"))
+    return [slugs[i] for i in reversed(ids) if i in slugs]
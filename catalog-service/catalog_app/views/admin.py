@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from catalog_app.models import Product
 from django.utils.timezone import now
 from catalog_app.services.events import publish_catalog_event
+from catalog_app.utils.categories import get_category_and_ancestor_slugs
 
 
 class AdminApproveProductView(UpdateAPIView):
@@ -24,6 +25,7 @@ class AdminApproveProductView(UpdateAPIView):
                 payload={
                     "product_id": product.id,
                     "name": product.name,
+                    "category_slugs": get_category_and_ancestor_slugs(product.category),
                 }
             )
 
@@ -37,6 +39,7 @@ class AdminApproveProductView(UpdateAPIView):
                 payload={
                     "product_id": product.id,
                     "name": product.name,
+                    "category_slugs": get_category_and_ancestor_slugs(product.category),
                 }
             )
 
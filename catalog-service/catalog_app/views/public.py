@@ -3,10 +3,20 @@ from catalog_app.models import Category, Product
 from catalog_app.serializers.category import CategorySerializer
 from catalog_app.serializers.product import ProductSerializer
 from rest_framework.generics import ListCreateAPIView
-from catalog_app.utils.categories import get_category_and_descendants
 from rest_framework.permissions import AllowAny
+from catalog_app.services.category_tree import get_category_tree
+from catalog_app.pagination import ProductCursorPagination, ProductSearchPagination
+from catalog_app.services.search import filter_search, search_products
+from catalog_app.serializers.sparse import requested_fields
 
 from django.shortcuts import get_object_or_404
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.db.models import Count, Q
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from decimal import Decimal, InvalidOperation
 
 class CategoryListView(ListCreateAPIView):
     authentication_classes = []   # 🔥 disable JWT
@@ -16,6 +26,31 @@ class CategoryListView(ListCreateAPIView):
     queryset = Category.objects.filter(is_active=True, parent__isnull=True)
     serializer_class = CategorySerializer
 
+    def list(self, request, *args, **kwargs):
+        # Pre-rendered tree from the cache; unchanged trees cost the client a 304
+        content, etag = get_category_tree()
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in client_etags or "*" in client_etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+
+# Columns the cursor needs even when `?fields=` leaves them out
+KEYSET_COLUMNS = {"id", "created_at", "price"}
+
+
+def project_product_columns(queryset, request):
+    """Load only the requested columns (plus the cursor keys) for sparse listings."""
+    fields = requested_fields(request)
+    if not fields:
+        return queryset
+    columns = {f.name for f in Product._meta.concrete_fields} & fields
+    return queryset.only(*(columns | KEYSET_COLUMNS))
 
 
 class ProductByCategoryView(ListAPIView):
@@ -23,19 +58,20 @@ class ProductByCategoryView(ListAPIView):
     permission_classes = [AllowAny]
 
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
 
     def get_queryset(self):
         slug = self.kwargs["slug"]
 
         category = get_object_or_404(Category, slug=slug)
 
-        category_ids = get_category_and_descendants(category)
-
-        return Product.objects.filter(
-            category_id__in=category_ids,
+        # Subtree match on the materialized path; one join instead of a query per node
+        queryset = Product.objects.filter(
+            category__path__startswith=category.path,
             status=Product.STATUS_APPROVED,
             is_available=True
         )
+        return project_product_columns(queryset, self.request)
 
 
 
@@ -52,6 +88,7 @@ class ProductListView(ListAPIView):
     permission_classes = [AllowAny]
 
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
 
     def get_queryset(self):
         queryset = Product.objects.filter(
@@ -64,9 +101,75 @@ class ProductListView(ListAPIView):
         if category_id:
             queryset = queryset.filter(category_id=category_id)
         
-        # Search filter if provided
+        # Search filter if provided (indexed full-text / fuzzy match; ranked results live at products/search/)
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset = filter_search(queryset, search)
         
-        return queryset
+        return project_product_columns(queryset, self.request)
+
+
+def price_param(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: "A valid number is required."})
+
+
+class ProductSearchView(ListAPIView):
+    """
+    Ranked full-text search over approved, available products.
+    ?q= (required), optional ?min_price=, ?max_price=, ?city= and ?category=<slug>
+    (matches the whole subtree).
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    serializer_class = ProductSerializer
+    pagination_class = ProductSearchPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        text = (params.get("q") or "").strip()
+        if not text:
+            raise ValidationError({"q": "This query parameter is required."})
+
+        queryset = Product.objects.filter(status=Product.STATUS_APPROVED, is_available=True)
+
+        min_price = price_param(params, "min_price")
+        if min_price is not None:
+            queryset = queryset.filter(price__gte=min_price)
+        max_price = price_param(params, "max_price")
+        if max_price is not None:
+            queryset = queryset.filter(price__lte=max_price)
+
+        city = params.get("city")
+        if city:
+            queryset = queryset.filter(city=city)
+
+        slug = params.get("category")
+        if slug:
+            category = get_object_or_404(Category, slug=slug)
+            queryset = queryset.filter(category__path__startswith=category.path)
+
+        return project_product_columns(search_products(queryset, text), self.request)
+
+
+class VendorProductStatsView(APIView):
+    """
+    Approved / rejected product counts per vendor.
+    Seeds the AI planner's vendor reputation store; PRODUCT_APPROVED and
+    PRODUCT_REJECTED events keep it current afterwards.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        rows = Product.objects.values("vendor_id").annotate(
+            products_approved=Count("id", filter=Q(status=Product.STATUS_APPROVED)),
+            products_rejected=Count("id", filter=Q(status=Product.STATUS_REJECTED)),
+        )
+        return Response({"results": list(rows)})
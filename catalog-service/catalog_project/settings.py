@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     "rest_framework",
     "corsheaders",
@@ -74,6 +75,21 @@ DATABASES = {
 }
 
 
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared cache
+# (memcached, redis) so category tree invalidation reaches every worker at once
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+CATEGORY_TREE_CACHE_TIMEOUT = int(os.getenv("CATEGORY_TREE_CACHE_TIMEOUT", "300"))
+
+# CATEGORY_* events (RAG index updates); separate from catalog.events so
+# vendor-service doesn't turn them into notifications
+CATEGORY_EVENT_EXCHANGE = os.getenv("CATEGORY_EVENT_EXCHANGE", "category.events")
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -118,6 +134,13 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10
 }
 
+# Upper bound for `?page_size=` on product listings for internal callers such as the AI planner;
+# public callers stay at PAGE_SIZE
+PRODUCT_MAX_PAGE_SIZE = int(os.getenv("PRODUCT_MAX_PAGE_SIZE", "500"))
+
+# Shared secret that internal services send as X-Internal-Token
+CATALOG_INTERNAL_TOKEN = os.getenv("CATALOG_INTERNAL_TOKEN")
+
 
 SIMPLE_JWT = {
     "ALGORITHM": "RS256",
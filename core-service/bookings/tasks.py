@@ -1,6 +1,7 @@
 from celery import shared_task
 import logging
-from core.rabbit import publish_event
+from core.rabbit import publish_event, build_vendor_event
+from django.db import transaction
 from django.utils import timezone
 from bookings.models import Booking
 
@@ -15,6 +16,21 @@ def publish_event_task(self, routing_key, payload):
         raise self.retry(exc=exc, countdown=10)
 
 
+def publish_vendor_event(event_type, vendor_id, payload):
+    """Queue a vendor event once the surrounding transaction has committed."""
+    event = build_vendor_event(event_type, vendor_id, payload)
+
+    def enqueue():
+        try:
+            publish_event_task.delay(event_type, event)
+        except Exception:
+            # The write is already committed; a missed signal is corrected by the
+            # planner's periodic reputation re-sync
+            logger.exception("Failed to queue %s for vendor %s", event_type, vendor_id)
+
+    transaction.on_commit(enqueue)
+
+
 @shared_task
 def cleanup_expired_bookings():
     expired = Booking.objects.filter(
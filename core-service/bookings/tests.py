@@ -1,5 +1,6 @@
 import pytest
 from django.utils import timezone
+from . import tasks
 from .models import Booking
 
 @pytest.mark.django_db
@@ -22,3 +23,34 @@ class TestBookingModel:
         )
         booking.confirm()
         assert booking.status == "CONFIRMED"
+
+
+@pytest.mark.django_db
+class TestVendorReputationStats:
+    def test_counts_booking_outcomes_per_vendor(self, api_client):
+        today = timezone.now().date()
+        for status in ["APPROVED", "CONFIRMED", "REJECTED"]:
+            Booking.objects.create(user_id=1, vendor_id="7", event_date=today, status=status)
+        Booking.objects.create(user_id=1, vendor_id="8", event_date=today, status="REJECTED")
+
+        response = api_client.get("/internal/vendors/reputation/")
+
+        assert response.status_code == 200
+        stats = {row["vendor_id"]: row for row in response.data["results"]}
+        assert stats["7"]["bookings_approved"] == 2
+        assert stats["7"]["bookings_rejected"] == 1
+        assert stats["8"]["bookings_approved"] == 0
+
+
+@pytest.mark.django_db
+class TestPublishVendorEvent:
+    def test_broker_outage_is_logged_not_raised(self, monkeypatch, django_capture_on_commit_callbacks, caplog):
+        def broker_down(*args, **kwargs):
+            raise ConnectionError("broker unreachable")
+
+        monkeypatch.setattr(tasks.publish_event_task, "delay", broker_down)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            tasks.publish_vendor_event("BOOKING_CONFIRMED", "7", {"booking_id": "1"})
+
+        assert "Failed to queue BOOKING_CONFIRMED for vendor 7" in caplog.text
@@ -5,7 +5,7 @@ from django.conf import settings
 from core.authentication import StatelessJWTAuthentication
 from core.permissions import HasValidJWT
 from .serializers import BookingCreateSerializer
-from bookings.tasks import publish_event_task
+from bookings.tasks import publish_event_task, publish_vendor_event
 import uuid
 from django.utils.timezone import now
 from django.db import transaction, IntegrityError
@@ -113,7 +113,9 @@ class BookingConfirmAPIView(APIView):
         )
 
         try:
-            booking.confirm()
+            with transaction.atomic():
+                booking.confirm()
+                publish_vendor_event("BOOKING_CONFIRMED", booking.vendor_id, {"booking_id": str(booking.id)})
         except ValidationError as e:
             return Response(
                 {"detail": str(e)},
@@ -146,6 +148,8 @@ class VendorBookingApprovalAPIView(APIView):
             # Check Master Order status
             update_master_order_status(booking.sub_order.master_order)
 
+            publish_vendor_event("BOOKING_APPROVED", booking.vendor_id, {"booking_id": str(booking.id)})
+
         return Response({"status": "APPROVED"})
 
 
@@ -179,4 +183,40 @@ class VendorBookingRejectionAPIView(APIView):
             # Check Master Order status
             update_master_order_status(master_order)
 
-        return Response({"status": "REJECTED"})
\ No newline at end of file
+            publish_vendor_event("BOOKING_REJECTED", booking.vendor_id, {"booking_id": str(booking.id)})
+
+        return Response({"status": "REJECTED"})
+
+
+from django.db.models import Count, Q
+from orders.models import SubOrder
+
+class VendorReputationStatsAPIView(APIView):
+    """
+    Internal: per-vendor booking and order outcome counts.
+    The AI planner loads this once to seed its vendor reputation store and
+    then keeps it current from BOOKING_* / SUBORDER_PAID events.
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        stats = {}
+
+        bookings = Booking.objects.values("vendor_id").annotate(
+            bookings_approved=Count("id", filter=Q(status__in=["APPROVED", "CONFIRMED"])),
+            bookings_rejected=Count("id", filter=Q(status="REJECTED")),
+            bookings_confirmed=Count("id", filter=Q(status="CONFIRMED")),
+        )
+        for row in bookings:
+            stats.setdefault(row.pop("vendor_id"), {}).update(row)
+
+        orders = SubOrder.objects.values("vendor_id").annotate(
+            orders_paid=Count("id", filter=Q(status__in=["PAID", "COMPLETED"])),
+        )
+        for row in orders:
+            stats.setdefault(row.pop("vendor_id"), {}).update(row)
+
+        return Response({
+            "results": [{"vendor_id": vendor_id, **counts} for vendor_id, counts in stats.items()]
+        })
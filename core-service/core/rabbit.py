@@ -1,4 +1,5 @@
 import json
+import uuid
 import pika
 from django.conf import settings
 
@@ -8,12 +9,26 @@ def publish_event(routing_key, payload):
         pika.ConnectionParameters(host=settings.RABBITMQ_HOST)
     )
     channel = connection.channel()
-    channel.exchange_declare(exchange="catalog.events", exchange_type="topic", durable=True)
+    channel.exchange_declare(exchange=settings.CORE_EVENT_EXCHANGE, exchange_type="fanout", durable=True)
 
     channel.basic_publish(
-        exchange="catalog.events",
+        exchange=settings.CORE_EVENT_EXCHANGE,
         routing_key=routing_key,
         body=json.dumps(payload),
+        properties=pika.BasicProperties(
+            content_type="application/json",
+            delivery_mode=2,
+        ),
     )
 
     connection.close()
+
+
+def build_vendor_event(event_type, vendor_id, payload):
+    """Same envelope as catalog.events so consumers can share one handler."""
+    return {
+        "event_id": str(uuid.uuid4()),
+        "event_type": event_type,
+        "vendor_id": vendor_id,
+        "payload": payload,
+    }
@@ -144,6 +144,9 @@ ENABLE_ASYNC_EVENTS = False
 
 # RabbitMQ Settings
 RABBITMQ_HOST = "rabbitmq"
+# Booking and order events (vendor reputation signals); separate from catalog.events
+# so vendor-service doesn't turn them into notifications
+CORE_EVENT_EXCHANGE = os.getenv("CORE_EVENT_EXCHANGE", "core.events")
 
 # Celery Settings
 CELERY_BROKER_URL = "redis://redis:6379/0"
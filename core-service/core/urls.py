@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from orders.views import PaymentSuccessAPIView
+from bookings.views import VendorReputationStatsAPIView
 from .views import health_check
 
 
@@ -11,4 +12,5 @@ urlpatterns = [
     path("api/orders/", include("orders.urls")),
 
     path("internal/payments/success/", PaymentSuccessAPIView.as_view()),
+    path("internal/vendors/reputation/", VendorReputationStatsAPIView.as_view()),
 ]
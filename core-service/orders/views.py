@@ -8,6 +8,7 @@ from core.authentication import StatelessJWTAuthentication
 from core.permissions import HasValidJWT
 from orders.models import MasterOrder, SubOrder
 from bookings.models import Booking
+from bookings.tasks import publish_vendor_event
 from orders.serializers import MasterOrderSerializer, SubOrderSerializer
 from django.shortcuts import get_object_or_404
 
@@ -42,12 +43,14 @@ class PaymentSuccessAPIView(APIView):
                 for sub in master_order.sub_orders.all():
                     sub.status = "PAID"
                     sub.save(update_fields=["status"])
+                    publish_vendor_event("SUBORDER_PAID", sub.vendor_id, {"sub_order_id": str(sub.id)})
 
                     # 3. Confirm booking linked to sub-order
                     try:
                         # Accessing reverse OneToOne can raise ObjectDoesNotExist
                         booking = sub.booking
                         booking.confirm()
+                        publish_vendor_event("BOOKING_CONFIRMED", booking.vendor_id, {"booking_id": str(booking.id)})
                     except ObjectDoesNotExist:
                         logger.warning(f"SubOrder {sub.id} has no linked booking to confirm.")
                     except ValidationError as e: